@@ -0,0 +1,98 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# embed_bench.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+"""Throughput and accuracy drift of the embedding model's CPU variants.
+
+Loads the configured model as fp32 and as every optimized variant whose
+runtime is installed, embeds the same texts with each, and reports
+sentences per second, speedup over fp32 and the row cosine between each
+variant's vectors and the fp32 ones. Variants that cannot load are listed
+with the reason.
+
+Usage:
+    python -m benchmarks.embed_bench [--texts 1024] [--batch 64] [--variants onnx int8] [--out results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from utils.const import EMBEDDING_CACHE_DIR, EMBEDDING_MIN_AGREEMENT, EMBEDDING_MODEL_PATH, EMBED_BATCH_SIZE
+from utils.embedders import CALIBRATION_SENTENCES, OPTIMIZED_VARIANTS, load_sentence_transformer
+from utils.linear_map import row_cosines
+
+def benchmark_texts(number: int) -> List[str]:
+    """Calibration sentences cycled with a numeric suffix, so lengths vary and no two texts are equal."""
+    return [f'{CALIBRATION_SENTENCES[i % len(CALIBRATION_SENTENCES)]} ({i})' for i in range(number)]
+
+def _timed_encode(model, texts: List[str], batch: int) -> Dict[str, object]:
+    model.encode(texts[:batch], batch_size=batch, convert_to_numpy=True)  # warm up kernels and caches
+    started = time.perf_counter()
+    vectors = model.encode(texts, batch_size=batch, convert_to_numpy=True)
+    return {'seconds': time.perf_counter() - started, 'vectors': np.asarray(vectors, dtype=np.float32)}
+
+def run(texts: int = 1024, batch: int = EMBED_BATCH_SIZE, variants: Sequence[str] = OPTIMIZED_VARIANTS,
+        path: Optional[str] = EMBEDDING_MODEL_PATH) -> dict:
+    """Benchmarks fp32 against each requested variant.
+
+    Returns:
+        dict: JSON-serializable report, one entry per variant under 'variants'
+    """
+    sample = benchmark_texts(texts)
+    report = {
+        'meta': {
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'model': path,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'texts': texts,
+            'batch': batch,
+            'min_agreement': EMBEDDING_MIN_AGREEMENT,
+        },
+        'variants': [],
+    }
+    baseline = _timed_encode(load_sentence_transformer(path), sample, batch)
+    report['variants'].append({'variant': 'fp32', 'sentences_per_s': texts / baseline['seconds'], 'speedup': 1.0})
+    for variant in variants:
+        try:
+            model = load_sentence_transformer(path, variant, EMBEDDING_CACHE_DIR)
+        except Exception as e:
+            report['variants'].append({'variant': variant, 'error': f'{type(e).__name__}: {e}'})
+            continue
+        result = _timed_encode(model, sample, batch)
+        cosines = row_cosines(baseline['vectors'], result['vectors'])
+        report['variants'].append({
+            'variant': variant,
+            'sentences_per_s': texts / result['seconds'],
+            'speedup': baseline['seconds'] / result['seconds'],
+            'cosine_mean': float(cosines.mean()),
+            'cosine_p01': float(np.quantile(cosines, 0.01)),
+            'cosine_min': float(cosines.min()),
+            'agrees': bool(cosines.min() >= EMBEDDING_MIN_AGREEMENT),
+        })
+    return report
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--texts', type=int, default=1024)
+    parser.add_argument('--batch', type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument('--variants', nargs='+', default=list(OPTIMIZED_VARIANTS), choices=OPTIMIZED_VARIANTS)
+    parser.add_argument('--out', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+    report = json.dumps(run(args.texts, args.batch, args.variants), indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(report)
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
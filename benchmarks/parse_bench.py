@@ -0,0 +1,61 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# parse_bench.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+"""Micro-benchmark for Command.parse.
+
+Usage:
+    python -m benchmarks.parse_bench [--number 20000]
+"""
+
+import argparse
+import os
+import timeit
+from models.command_model import Command
+from models.config_model import ShellLexicalConfig
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
+
+STATEMENTS = [
+    'fetch --limit 10 --desc --max-length 80',
+    "fetch -l 25 -o -q 'quantum computing'",
+    "ls --query 'main'",
+    "set -k 'verbose' -v True",
+]
+
+def run(number: int = 20000) -> dict:
+    """Times the flag-list, compiled and cached parse paths.
+
+    Returns:
+        dict: Microseconds per statement for each path
+    """
+    commands = ShellLexicalConfig.load(CONFIG_FILE).commands
+    jobs = [(s, commands[s.split()[0]]) for s in STATEMENTS]
+
+    def flag_list():
+        for statement, config in jobs:
+            Command.parse(statement, config.flags.values())
+
+    def compiled():
+        for statement, config in jobs:
+            Command._parse(statement, config)
+
+    def cached():
+        for statement, config in jobs:
+            Command.parse(statement, config)
+
+    results = {}
+    for label, func in (('flag_list', flag_list), ('compiled', compiled), ('cached', cached)):
+        seconds = min(timeit.repeat(func, number=number // len(jobs), repeat=3))
+        results[label] = seconds / number * 1e6
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+    for label, micros in run(args.number).items():
+        print(f'{label:>10}: {micros:8.2f} us/statement')
@@ -0,0 +1,113 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# sqlite_bench.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+"""Insert/fetch throughput of each SQLite connection profile.
+
+Usage:
+    python -m benchmarks.sqlite_bench [--rows 20000] [--dim 384] [--batch 1000]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import numpy as np
+from utils.sqlite_profile import SQLITE_PROFILES, connect
+
+SCHEMA = '''
+    CREATE TABLE main (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        prompt TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        veci TEXT NOT NULL,
+        veco TEXT NOT NULL
+    )
+'''
+
+def _rows(count: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    fmt = ' '.join(['%.9g'] * dim)
+    for i in range(count):
+        vectors = rng.standard_normal((2, dim), dtype=np.float32).tolist()
+        yield (f'prompt {i}', f'answer {i} ' * 20, fmt % tuple(vectors[0]), fmt % tuple(vectors[1]))
+
+def run_profile(profile: str, rows: int, dim: int, batch: int) -> dict:
+    """Measures one profile on a fresh database file.
+
+    A second connection polls the table while the bulk insert runs, to show
+    whether readers block on the writer.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        conn = connect(path, profile=profile)
+        conn.execute(SCHEMA)
+        conn.commit()
+
+        stop = threading.Event()
+        reads = {'ok': 0, 'locked': 0}
+
+        def reader():
+            other = connect(path, profile=profile, timeout=0)
+            while not stop.is_set():
+                try:
+                    other.execute('SELECT COUNT(*) FROM main').fetchone()
+                    reads['ok'] += 1
+                except sqlite3.OperationalError:
+                    reads['locked'] += 1
+            other.close()
+
+        data = list(_rows(rows, dim))
+        thread = threading.Thread(target=reader)
+        thread.start()
+        started = time.perf_counter()
+        for i in range(0, rows, batch):
+            conn.executemany('INSERT INTO main (prompt, answer, veci, veco) VALUES (?, ?, ?, ?)', data[i:i + batch])
+            conn.commit()
+        insert_seconds = time.perf_counter() - started
+        stop.set()
+        thread.join()
+
+        started = time.perf_counter()
+        fetched = 0
+        for (text,) in conn.execute('SELECT veci FROM main ORDER BY id'):
+            fetched += 1
+        scan_seconds = time.perf_counter() - started
+
+        ids = np.random.default_rng(1).integers(1, rows + 1, size=min(rows, 5000)).tolist()
+        started = time.perf_counter()
+        for row_id in ids:
+            conn.execute('SELECT prompt, answer, veci, veco FROM main WHERE id = ?', (row_id,)).fetchone()
+        point_seconds = time.perf_counter() - started
+        conn.close()
+
+    return {
+        'profile': profile,
+        'insert_rows_per_s': rows / insert_seconds,
+        'scan_rows_per_s': fetched / scan_seconds,
+        'point_lookups_per_s': len(ids) / point_seconds,
+        'reads_during_insert': reads['ok'],
+        'reads_locked': reads['locked'],
+    }
+
+def run(rows: int = 20000, dim: int = 384, batch: int = 1000) -> list:
+    return [run_profile(profile, rows, dim, batch) for profile in SQLITE_PROFILES]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args()
+    print(f'{"profile":>12} {"insert/s":>10} {"scan/s":>10} {"lookup/s":>10} {"reads":>7} {"locked":>7}')
+    for result in run(args.rows, args.dim, args.batch):
+        print(
+            f'{result["profile"]:>12} {result["insert_rows_per_s"]:>10,.0f} {result["scan_rows_per_s"]:>10,.0f} '
+            f'{result["point_lookups_per_s"]:>10,.0f} {result["reads_during_insert"]:>7} {result["reads_locked"]:>7}'
+        )
@@ -0,0 +1,256 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# suite.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+"""Reproducible end-to-end benchmark over synthetic tables.
+
+Builds tables of each requested size in a temporary database and times the
+storage, retrieval and parsing paths. Runs offline on CPU: vectors are
+random, or with --hashing come from the deterministic hashing embedder over
+the synthetic texts, so no embedding model is loaded unless --embed is given
+with a model backend configured.
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000 100000 1000000] [--dim 384] [--seed 0] [--hashing] [--out results.json]
+"""
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import tempfile
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence
+import dotenv
+import numpy as np
+
+def _scratch_environment():
+    """Points DB_PATH and SIDECAR_DIR at a directory removed on exit.
+
+    Run as a script, the suite must work without a configured database and
+    never touch the real one. Both are read once when utils.const is first
+    imported, so this runs before it. `.env` is loaded first, as utils.const
+    does, so a configured embedding cache keeps its location.
+    """
+    dotenv.load_dotenv('../.env')
+    directory = tempfile.mkdtemp(prefix='emb2emb-bench-', dir=os.getenv('SCRATCH_DIR'))
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    os.environ.setdefault('EMBEDDING_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(os.getenv('DB_PATH') or '.')), 'models'))
+    os.environ['DB_PATH'] = os.path.join(directory, 'client.db')
+    os.environ['SIDECAR_DIR'] = os.path.join(directory, 'sidecars')
+
+if __name__ == '__main__':
+    _scratch_environment()
+
+from models.command_model import Command
+from models.converse_model import Converse
+from models.memglobalstore_model import MemGlobalStore
+from utils.const import IMPORT_BATCH_SIZE, SCRATCH_DIR
+from utils.embedders import Embedder, HashingEmbedder
+from utils.search import lexical_search, vector_search
+from utils.vectors import blocked_top_k, unit_rows
+
+if TYPE_CHECKING:
+    from models.dbmanip import DatabaseManager
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+VOCABULARY = 2000
+PARSE_STATEMENTS = (
+    'fetch --limit 10 --desc --max-length 80',
+    "search -q 'quantum computing' -l 5 --hybrid",
+    "ls --query 'main'",
+)
+
+def synthetic_converses(rows: int, dim: int, seed: int = 0, batch: int = IMPORT_BATCH_SIZE,
+                        embedder: Optional[Embedder] = None) -> Iterator[List[Converse]]:
+    """Generates a deterministic synthetic dataset in batches.
+
+    Texts are drawn from a Zipf-distributed vocabulary so full-text search
+    sees realistic term frequencies; vectors are standard normal float32, or
+    the embedder's vectors of the texts when one is given.
+    Rows are unique, so the content hash guard never skips any.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, batch):
+        size = min(batch, rows - start)
+        vecis = rng.standard_normal((size, dim), dtype=np.float32)
+        vecos = rng.standard_normal((size, dim), dtype=np.float32)
+        prompt_lens = rng.integers(8, 24, size)
+        answer_lens = rng.integers(30, 120, size)
+        words = (rng.zipf(1.3, int(prompt_lens.sum() + answer_lens.sum())) % VOCABULARY).tolist()
+        prompts, answers, offset = [], [], 0
+        for i in range(size):
+            prompts.append(f'#{start + i} ' + ' '.join(f'w{w}' for w in words[offset:offset + prompt_lens[i]]))
+            offset += prompt_lens[i]
+            answers.append(' '.join(f'w{w}' for w in words[offset:offset + answer_lens[i]]))
+            offset += answer_lens[i]
+        if embedder is not None:
+            vecis, vecos = embedder.encode(prompts), embedder.encode(answers)
+        yield [Converse(prompts[i], answers[i], vecis[i], vecos[i]) for i in range(size)]
+
+def _best_ms(func: Callable, repeat: int = 5) -> float:
+    """Best wall time of several runs in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def bench_table(db: 'DatabaseManager', rows: int, dim: int, seed: int, embedder: Optional[Embedder] = None) -> Dict[str, float]:
+    """Builds one synthetic table and times every storage path against it."""
+    table = f'bench_{rows}'
+    db.create(table, dim=dim, model=embedder.model_id if embedder else 'synthetic', select=False)
+    size_before = _database_bytes(db)
+    generate_seconds = insert_seconds = 0.0
+    batches = synthetic_converses(rows, dim, seed, embedder=embedder)
+    while True:
+        started = time.perf_counter()
+        batch = next(batches, None)
+        generate_seconds += time.perf_counter() - started
+        if batch is None:
+            break
+        started = time.perf_counter()
+        db.insert_many(table, batch)
+        insert_seconds += time.perf_counter() - started
+
+    rng = np.random.default_rng(seed + 1)
+    query = rng.standard_normal(dim, dtype=np.float32)
+    terms = 'w1 w2'
+    repeat = 5 if rows <= 100_000 else 2
+    result = {
+        'rows': rows,
+        'dim': dim,
+        'generate_s': generate_seconds,
+        'insert_rows_per_s': rows / insert_seconds,
+        'fetch_100_ms': _best_ms(lambda: db.fetch(table, limit=100), repeat),
+        'fetch_desc_100_ms': _best_ms(lambda: db.fetch(table, limit=100, old=False), repeat),
+        'fetch_text_100_ms': _best_ms(lambda: db.fetch_text(table, limit=100, max_length=80), repeat),
+        'ls_ms': _best_ms(lambda: [db.table_stats(name) for name in db.table_names()], repeat),
+        'vector_search_ms': _best_ms(lambda: vector_search(db, table, query, 'veci', 10), repeat),
+        'text_search_ms': _best_ms(lambda: lexical_search(db, table, terms, 10), repeat),
+        'scan_rows_per_s': rows / (_best_ms(lambda: sum(1 for _ in db.iter_vectors(table)), 1) / 1000),
+        'db_bytes_per_row': (_database_bytes(db) - size_before) / rows,
+    }
+    # The cache lives in SIDECAR_DIR, not in the throwaway directory
+    db.drop_vector_cache(table)
+    return result
+
+def _database_bytes(db: 'DatabaseManager') -> int:
+    # Fold the WAL back in first so the main file size is the whole database
+    db.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return os.path.getsize(db.path)
+
+def bench_parse(number: int = 20000) -> Dict[str, float]:
+    """Microseconds per statement through Command.parse with the shipped config."""
+    from utils.load_config import COMMANDS
+    jobs = [(s, COMMANDS[s.split()[0]]) for s in PARSE_STATEMENTS]
+    started = time.perf_counter()
+    for _ in range(number // len(jobs)):
+        for statement, config in jobs:
+            Command.parse(statement, config)
+    return {'parse_us': (time.perf_counter() - started) / number * 1e6}
+
+def bench_store(directory: str, number: int = 2000) -> Dict[str, float]:
+    """Operations per second of MemGlobalStore get/set on a scratch file."""
+    store = MemGlobalStore(os.path.join(directory, 'store.db'))
+    started = time.perf_counter()
+    for i in range(number):
+        store.set('tablename', f'table_{i % 10}')
+    set_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(number):
+        store.get('tablename')
+    get_seconds = time.perf_counter() - started
+    return {'store_set_per_s': number / set_seconds, 'store_get_per_s': number / get_seconds}
+
+def bench_topk(rows: int = 200_000, dim: int = 384, seed: int = 0, queries: Sequence[int] = (1, 64)) -> Dict[str, object]:
+    """Milliseconds of exact blocked top-10 per thread count, for one and many queries."""
+    rng = np.random.default_rng(seed)
+    matrix = unit_rows(rng.standard_normal((rows, dim), dtype=np.float32))
+    threads = sorted({1, 2, 4, os.cpu_count() or 1})
+    result = {'topk_rows': rows}
+    for count in queries:
+        batch = unit_rows(rng.standard_normal((count, dim), dtype=np.float32))
+        result[f'topk_{count}q_ms'] = {
+            str(workers): _best_ms(lambda: blocked_top_k(matrix, batch, 10, workers=workers), 3) for workers in threads
+        }
+    return result
+
+def bench_embed(texts: int = 512) -> Dict[str, float]:
+    """Sentences per second of the configured embedding backend."""
+    from utils.embed import embed_batch, get_embedder
+    get_embedder().load()
+    sentences = [converse.prompt for converse in next(synthetic_converses(texts, 8, batch=texts))]
+    started = time.perf_counter()
+    embed_batch(sentences)
+    elapsed = time.perf_counter() - started
+    embedder = get_embedder()
+    return {
+        'embed_model': embedder.model_id,
+        'embed_variant': getattr(embedder, 'variant', None),
+        'embed_sentences_per_s': texts / elapsed,
+    }
+
+def run(sizes: Sequence[int] = DEFAULT_SIZES, dim: int = 384, seed: int = 0, embed: bool = False,
+        hashing: bool = False, progress: Optional[Callable[[str], None]] = None) -> dict:
+    """Runs the whole suite in a throwaway database.
+
+    Returns:
+        dict: JSON-serializable report with environment metadata and results
+    """
+    # Imported here: models.dbmanip opens the configured DB_PATH on import
+    from models.dbmanip import DatabaseManager
+    report = {
+        'meta': {
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'dim': dim,
+            'seed': seed,
+            'vectors': 'hashing' if hashing else 'random',
+        },
+        'tables': [],
+    }
+    embedder = HashingEmbedder(dim) if hashing else None
+    with tempfile.TemporaryDirectory(dir=SCRATCH_DIR) as directory:
+        db = DatabaseManager(os.path.join(directory, 'bench.db'))
+        for rows in sizes:
+            if progress:
+                progress(f'Benchmarking {rows} rows...')
+            report['tables'].append(bench_table(db, rows, dim, seed, embedder))
+        db.conn.close()
+        report.update(bench_store(directory))
+    report.update(bench_parse())
+    report.update(bench_topk(dim=dim, seed=seed))
+    if embed:
+        report.update(bench_embed())
+    return report
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--embed', action='store_true', help='also time the configured embedding backend')
+    parser.add_argument('--hashing', action='store_true', help='embed the synthetic texts with the hashing backend')
+    parser.add_argument('--out', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+    report = json.dumps(run(args.sizes, args.dim, args.seed, args.embed, args.hashing), indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(report)
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
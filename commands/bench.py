@@ -0,0 +1,66 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# bench.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import json
+from typing import Dict, List
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.config_model import *
+from utils.exceptions import *
+from utils.performance import PerformanceMetrics
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('bench')
+def bench(flags: Dict[FlagNameConfig, List[str]]):
+    """Runs the synthetic benchmark suite in a temporary database.
+
+    Same suite as `python -m benchmarks.suite`; the JSON report can be
+    written to a file for comparison across releases.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('bench')
+        return
+    # Imported on use, the suite is not needed to start the REPL
+    from benchmarks.suite import DEFAULT_SIZES, run
+
+    sizes = flags.get('sizes') or list(DEFAULT_SIZES)
+    if not all(isinstance(size, int) and not isinstance(size, bool) and size > 0 for size in sizes):
+        raise ArgumentValueError(f'--sizes requires positive ints, got {" ".join(map(str, sizes))}')
+    dim = single_arg(flags, 'dim', int, 384)
+    seed = single_arg(flags, 'seed', int, 0)
+    out = single_arg(flags, 'out')
+
+    with ClientConsole.loading(message='Benchmarking...') as status:
+        report = run(sizes, dim, seed, embed='embed' in flags, hashing='hashing' in flags, progress=status.update)
+
+    ClientConsole.table(
+        ['Rows', 'Insert rows/s', 'Fetch 100 ms', 'ls ms', 'Vector search ms', 'Text search ms', 'Scan rows/s', 'Bytes/row'],
+        [
+            [
+                f'{t["rows"]:,}', f'{t["insert_rows_per_s"]:,.0f}', f'{t["fetch_100_ms"]:.2f}', f'{t["ls_ms"]:.2f}',
+                f'{t["vector_search_ms"]:.1f}', f'{t["text_search_ms"]:.2f}', f'{t["scan_rows_per_s"]:,.0f}',
+                f'{t["db_bytes_per_row"]:,.0f}'
+            ]
+            for t in report['tables']
+        ],
+        title=f'Synthetic tables, dim {dim}, {report["meta"]["vectors"]} vectors'
+    )
+    ClientConsole.log(
+        f'parse {report["parse_us"]:.2f} us/statement | store set {report["store_set_per_s"]:,.0f}/s, '
+        f'get {report["store_get_per_s"]:,.0f}/s'
+        + (f' | embed {report["embed_sentences_per_s"]:,.0f} sentences/s' if 'embed_sentences_per_s' in report else '')
+    )
+    if out is not None:
+        with open(out, 'w') as f:
+            json.dump(report, f, indent=2)
+        ClientConsole.done(f'Report written to {out}.')
@@ -0,0 +1,108 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# cluster.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import time
+from typing import Dict, List
+import numpy as np
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, TEXT_FIELDS
+from models.config_model import *
+from models.filter_model import RowFilter
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.kmeans import MiniBatchKMeans, assign, kmeans_plus_plus
+
+# Rows drawn per centroid to seed k-means++
+SEED_ROWS_PER_CLUSTER = 50
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('cluster')
+def cluster(flags: Dict[FlagNameConfig, List[str]]):
+    """Clusters a table's embeddings with mini-batch k-means.
+
+    Centroids are seeded with k-means++ on a sample, then refined over
+    `--iter` streamed passes where every chunk is one mini-batch. They are
+    saved as a sidecar file, every row gets its cluster id written to the
+    indexed `cluster` column, and rows inserted later are labelled against
+    the same centroids.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('cluster')
+        return
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    if 'drop' in flags:
+        fetch_manager.set_cluster_model(table, None)
+        ClientConsole.done(f'Removed the centroids of {table}, new rows are no longer labelled.')
+        return
+
+    k = single_arg(flags, 'k', int)
+    if k is None:
+        raise MissingFlagError('cluster command requires flag --k.')
+    if k < 2:
+        raise ArgumentValueError(f'--k requires an int of at least 2, got {k}')
+    field = single_arg(flags, 'field', default='prompt')
+    if field not in TEXT_FIELDS:
+        raise ArgumentValueError(f'--field expects one of {", ".join(TEXT_FIELDS)}, got {field}')
+    column = TEXT_FIELDS[field]
+    iterations = single_arg(flags, 'iter', int, 5)
+    batch = single_arg(flags, 'batch', int, 1024)
+    seed = single_arg(flags, 'seed', int, 0)
+
+    max_id = fetch_manager.max_id(table)
+    if max_id is None:
+        ClientConsole.warn(f'Table {table} is empty.')
+        return
+    snapshot = RowFilter(to_id=max_id)
+    rows = fetch_manager.count(table, snapshot)
+    if rows < k:
+        raise ArgumentValueError(f'--k {k} exceeds the {rows} rows of {table}')
+
+    rng = np.random.default_rng(seed)
+    with ClientConsole.loading(message='Seeding centroids...'):
+        _, seeds = fetch_manager.sample_vectors(table, column, SEED_ROWS_PER_CLUSTER * k, snapshot, seed, minimum=k, unit=True)
+        model = MiniBatchKMeans(kmeans_plus_plus(seeds, k, rng))
+
+    timings = []
+    for iteration in range(1, iterations + 1):
+        started = time.perf_counter()
+        previous = model.centroids.copy()
+        inertia = 0.0
+        with ClientConsole.loading(message=f'Pass {iteration}/{iterations}...'):
+            for _, vectors in fetch_manager.iter_vectors(table, column, snapshot, batch, unit=True):
+                inertia += model.partial_fit(vectors)
+        shift = float(np.linalg.norm(model.centroids - previous, axis=1).max())
+        timings.append([iteration, f'{time.perf_counter() - started:.2f}s', f'{inertia / rows:.5f}', f'{shift:.5f}'])
+    ClientConsole.table(['Pass', 'Time', 'Mean sq. distance', 'Max centroid shift'], timings, title=f'Mini-batch k-means, k={k}')
+
+    path = fetch_manager.set_cluster_model(table, column, model.centroids)
+    sizes = np.zeros(k, dtype=np.int64)
+    with ClientConsole.loading(message='Writing cluster ids...'):
+        for ids, vectors in fetch_manager.iter_vectors(table, column, snapshot, batch, unit=True):
+            labels, _ = assign(vectors, model.centroids)
+            sizes += np.bincount(labels, minlength=k)
+            with fetch_manager.transaction() as cursor:
+                cursor.executemany(
+                    f'UPDATE {table} SET cluster = ? WHERE id = ?',
+                    zip(labels.tolist(), ids.tolist())
+                )
+
+    order = np.argsort(-sizes, kind='stable')
+    ClientConsole.table(
+        ['Cluster', 'Rows', 'Share'],
+        [[int(c), int(sizes[c]), f'{sizes[c] / rows:.1%}'] for c in order[:20]],
+        title=f'Cluster sizes{" (largest 20)" if k > 20 else ""}'
+    )
+    ClientConsole.done(f'Clustered {rows} rows of {table} into {k} clusters, centroids saved to {path}.')
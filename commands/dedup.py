@@ -0,0 +1,144 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# dedup.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import os
+import tempfile
+import time
+from typing import Dict, List
+import numpy as np
+from rich.markup import escape
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager
+from models.config_model import *
+from models.filter_model import RowFilter
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.vectors import materialize, similar_pairs
+from utils.const import SCAN_BLOCK_SIZE, SCRATCH_DIR
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('dedup')
+def dedup(flags: Dict[FlagNameConfig, List[str]]):
+    """Finds clusters of near-duplicate rows by embedding cosine similarity.
+
+    Vectors are materialized once into unit-normalized float32 memmaps, then
+    the upper triangle of the similarity matrix is scanned tile by tile.
+    Pairs above the threshold are joined into clusters (connected
+    components) whose oldest row is kept as the representative. Without
+    --delete or --tag this is a dry run.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('dedup')
+        return
+    if 'delete' in flags and 'tag' in flags:
+        raise ExcessiveFlagsError('--delete and --tag cannot be used together')
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    threshold = single_arg(flags, 'threshold', float, 0.98)
+    answer_threshold = single_arg(flags, 'answer-threshold', float)
+    block_size = single_arg(flags, 'block', int, SCAN_BLOCK_SIZE)
+
+    max_id = fetch_manager.max_id(table)
+    if max_id is None:
+        ClientConsole.warn(f'Table {table} is empty.')
+        return
+    row_filter = RowFilter(to_id=max_id)
+    rows = fetch_manager.count(table, row_filter)
+    dim = fetch_manager.vector_dim(table)
+    normalize = not fetch_manager.is_normalized(table)
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=SCRATCH_DIR) as scratch:
+        with ClientConsole.loading(message=f'Materializing {rows} vectors...'):
+            ids, prompts = materialize(
+                fetch_manager.iter_vectors(table, 'veci', row_filter, block_size),
+                os.path.join(scratch, 'veci.npy'), rows, dim, normalize
+            )
+            answers = None
+            if answer_threshold is not None:
+                _, answers = materialize(
+                    fetch_manager.iter_vectors(table, 'veco', row_filter, block_size),
+                    os.path.join(scratch, 'veco.npy'), rows, dim, normalize
+                )
+
+        blocks = -(-len(ids) // block_size)
+        tiles = blocks * (blocks + 1) // 2
+        left, right = [], []
+        with ClientConsole.loading(message='Scanning similarity tiles...') as status:
+            for tile, (i, j, _) in enumerate(similar_pairs(prompts, threshold, block_size), start=1):
+                if answers is not None and len(i):
+                    keep = np.einsum('ij,ij->i', answers[i], answers[j]) >= answer_threshold
+                    i, j = i[keep], j[keep]
+                left.append(i)
+                right.append(j)
+                status.update(ClientConsole.progress(tile, tiles, tile / (time.perf_counter() - started), unit='tiles'))
+
+    left, right = np.concatenate(left), np.concatenate(right)
+    clusters = _clusters(ids, left, right)
+    duplicates = {row_id: rep for rep, members in clusters.items() for row_id in members if row_id != rep}
+    ClientConsole.log(
+        f'Scanned {len(ids)} rows, {len(left)} similar pairs, {len(clusters)} clusters, '
+        f'{len(duplicates)} duplicate rows in {time.perf_counter() - started:.2f}s.'
+    )
+    if not clusters:
+        ClientConsole.done('No near-duplicates found.')
+        return
+    _report(table, clusters)
+
+    if 'delete' in flags:
+        deleted = fetch_manager.delete(table, sorted(duplicates))
+        ClientConsole.done(f'Deleted {deleted} duplicate rows, kept the oldest row of each cluster.')
+    elif 'tag' in flags:
+        fetch_manager.ensure_column(table, 'dup_of', 'INTEGER', index='dup_of')
+        items = sorted(duplicates.items())
+        with fetch_manager.transaction() as cursor:
+            cursor.execute(f'UPDATE {table} SET dup_of = NULL WHERE dup_of IS NOT NULL')
+        for i in range(0, len(items), block_size):
+            with fetch_manager.transaction() as cursor:
+                cursor.executemany(
+                    f'UPDATE {table} SET dup_of = ? WHERE id = ?',
+                    [(rep, row_id) for row_id, rep in items[i:i + block_size]]
+                )
+        ClientConsole.done(f'Tagged {len(items)} duplicate rows with dup_of = representative id.')
+    else:
+        ClientConsole.warn('Dry run, use --delete or --tag to act on duplicates.')
+
+# MARK: Helpers
+def _clusters(ids: np.ndarray, left: np.ndarray, right: np.ndarray) -> Dict[int, List[int]]:
+    """Groups paired rows into connected components keyed by their smallest id."""
+    if len(left) == 0:
+        return {}
+    graph = coo_matrix((np.ones(len(left), dtype=np.int8), (left, right)), shape=(len(ids), len(ids)))
+    _, labels = connected_components(graph, directed=False)
+    by_label: Dict[int, List[int]] = {}
+    # `ids` is ascending, so the first member of each label is the oldest row
+    for index in np.unique(np.concatenate([left, right])):
+        by_label.setdefault(int(labels[index]), []).append(int(ids[index]))
+    return {members[0]: members for members in by_label.values()}
+
+def _report(table: str, clusters: Dict[int, List[int]], top: int = 10):
+    largest = sorted(clusters.items(), key=lambda item: -len(item[1]))[:top]
+    samples = fetch_manager.rows_by_id(table, [rep for rep, _ in largest], ('prompt',))
+    ClientConsole.table(
+        ['Keep', 'Size', 'Duplicates', 'Prompt'],
+        [
+            [rep, len(members), ', '.join(map(str, members[1:6])) + (' …' if len(members) > 6 else ''),
+             escape(samples[rep][0][:60])]
+            for rep, members in largest
+        ],
+        title=f'Largest near-duplicate clusters in {table}'
+    )
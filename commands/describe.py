@@ -0,0 +1,85 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# describe.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import math
+import time
+from typing import Dict, List
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, STATS_METRICS
+from models.config_model import *
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.running_stats import variance
+
+METRIC_LABELS = {
+    'veci_norm': 'Prompt vector norm',
+    'veco_norm': 'Answer vector norm',
+    'prompt_len': 'Prompt length (chars)',
+    'answer_len': 'Answer length (chars)',
+}
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('describe')
+def describe(flags: Dict[FlagNameConfig, List[str]]):
+    """Shows a table's statistics from the record maintained on insert and delete.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('describe')
+        return
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    if not fetch_manager.table_exists(table):
+        raise ArgumentValueError(f'Table {table} does not exist.')
+
+    stored = fetch_manager.table_stats(table)
+    fresh = None
+    if stored is None or 'recompute' in flags:
+        started = time.perf_counter()
+        with ClientConsole.loading(message=f'Scanning {table}...'):
+            fresh = fetch_manager.recompute_stats(table)
+        ClientConsole.log(f'Recomputed statistics in {time.perf_counter() - started:.2f}s.')
+    stats = fresh or stored
+
+    ClientConsole.table(
+        ['Field', 'Value'] + (['Stored'] if stored and fresh else []),
+        [
+            [label, value] + ([stored_value] if stored and fresh else [])
+            for label, value, stored_value in _rows(stats, stored)
+        ],
+        title=table
+    )
+    if stored and fresh:
+        drift = [metric for metric in STATS_METRICS if not _close(stored[metric], fresh[metric])]
+        if stored['rows'] != fresh['rows'] or drift:
+            ClientConsole.warn(f'Stored statistics had drifted ({", ".join(drift) or "rows"}) and were replaced.')
+        else:
+            ClientConsole.done('Stored statistics match a full scan.')
+
+# MARK: Helpers
+def _rows(stats: dict, stored: dict):
+    stored = stored or stats
+    yield 'Rows', stats['rows'], stored['rows']
+    yield 'First insert', stats['first_ts'] or 'Never', stored['first_ts'] or 'Never'
+    yield 'Last update', stats['last_ts'] or 'Never', stored['last_ts'] or 'Never'
+    yield 'Embedding dim', stats['dim'] or '-', stored['dim'] or '-'
+    for metric in STATS_METRICS:
+        yield f'{METRIC_LABELS[metric]} mean ± std', _mean_std(stats[metric]), _mean_std(stored[metric])
+
+def _mean_std(m) -> str:
+    return f'{m[1]:.4f} ± {math.sqrt(variance(m)):.4f}' if m[0] else '-'
+
+def _close(a, b) -> bool:
+    return a[0] == b[0] and math.isclose(a[1], b[1], rel_tol=1e-6, abs_tol=1e-9) \
+        and math.isclose(a[2], b[2], rel_tol=1e-4, abs_tol=1e-6)
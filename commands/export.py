@@ -0,0 +1,121 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# export.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import os
+import time
+from typing import Dict, List
+import numpy as np
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, decode_vectors, NORM_COLUMNS, REDUCED_COLUMNS
+from models.config_model import *
+from models.filter_model import RowFilter
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.dataset_io import open_export_writer, EXPORT_FORMATS, PARQUET_AVAILABLE
+from utils.const import EXPORT_CHUNK_SIZE
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('export')
+def export(flags: Dict[FlagNameConfig, List[str]]):
+    """Streams (veci, veco) pairs of a table to NPZ, NPY memmaps or Parquet.
+
+    Rows are read in id-ordered chunks with filters pushed down to SQL and
+    written as contiguous float32 blocks, so memory use is bounded by the
+    chunk size rather than the table size. Normalized tables are exported
+    with their original magnitudes restored from the stored norms. With
+    --reduced, the PCA coordinates written by `reduce` are exported instead.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('export')
+        return
+
+    out = single_arg(flags, 'out')
+    if out is None:
+        raise MissingFlagError('export command requires flag --out.')
+    fmt = single_arg(flags, 'format', default=os.path.splitext(out)[1].lstrip('.').lower())
+    if fmt not in EXPORT_FORMATS:
+        raise ArgumentValueError(f'--format expects one of {", ".join(EXPORT_FORMATS)}, got {fmt}')
+    if fmt == 'parquet' and not PARQUET_AVAILABLE:
+        raise ArgumentValueError('--format parquet requires pyarrow, install it with `pip install pyarrow`')
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    chunk_size = single_arg(flags, 'chunk', int, EXPORT_CHUNK_SIZE)
+    row_filter = RowFilter(
+        from_id=single_arg(flags, 'from-id', int),
+        to_id=single_arg(flags, 'to-id', int),
+        since=single_arg(flags, 'since'),
+        until=single_arg(flags, 'until'),
+        sample=single_arg(flags, 'sample', float),
+        seed=single_arg(flags, 'seed', int, 0),
+        split=single_arg(flags, 'split'),
+    )
+
+    # Pin the snapshot so rows inserted mid-export don't break the preallocated row count
+    max_id = fetch_manager.max_id(table)
+    if max_id is None:
+        ClientConsole.warn(f'Table {table} is empty, nothing to export.')
+        return
+    row_filter.to_id = max_id if row_filter.to_id is None else min(row_filter.to_id, max_id)
+
+    total = fetch_manager.count(table, row_filter)
+    if total == 0:
+        ClientConsole.warn('No rows match the export filters.')
+        return
+    vector_columns = ['veci', 'veco']
+    normalized = fetch_manager.is_normalized(table)
+    if 'reduced' in flags:
+        reduction = fetch_manager.reduction(table)
+        if reduction is None:
+            raise ArgumentValueError(f'Table {table} has no PCA projection, run reduce --dim first')
+        if fetch_manager.unreduced_count(table):
+            raise ArgumentValueError(f'Some rows of {table} have no reduced vectors, run reduce --sync first')
+        vector_columns, normalized, dim = list(REDUCED_COLUMNS.values()), False, reduction['dim']
+    else:
+        dim = fetch_manager.vector_dim(table)
+
+    writer = open_export_writer(fmt, out, total, dim)
+    columns = ['timestamp', 'prompt', 'answer', *vector_columns] if writer.needs_text else vector_columns
+    if normalized:
+        columns += list(NORM_COLUMNS.values())
+    written = 0
+    started = time.perf_counter()
+    with ClientConsole.loading(message=f'Exporting {table} to {out}...') as status:
+        try:
+            for rows in fetch_manager.iter_rows(table, columns, row_filter, chunk_size):
+                chunk = list(zip(*rows))
+                vecis, vecos = (chunk[-4], chunk[-3]) if normalized else (chunk[-2], chunk[-1])
+                data = {
+                    'ids': np.fromiter(chunk[0], dtype=np.int64, count=len(rows)),
+                    'veci': decode_vectors(vecis),
+                    'veco': decode_vectors(vecos),
+                }
+                if normalized:
+                    data['veci'] *= np.asarray(chunk[-2], dtype=np.float32)[:, None]
+                    data['veco'] *= np.asarray(chunk[-1], dtype=np.float32)[:, None]
+                if writer.needs_text:
+                    data.update(timestamps=chunk[1], prompts=chunk[2], answers=chunk[3])
+                writer.write(data)
+                written += len(rows)
+                status.update(ClientConsole.progress(written, total, written / (time.perf_counter() - started)))
+        except BaseException:
+            # A partial export would look complete, with zero rows at the end
+            writer.abort()
+            raise
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    ClientConsole.done(
+        f'Exported {written} rows ({dim}-dim) from {table} to {out} in {elapsed:.2f}s '
+        f'({written / elapsed if elapsed else 0:,.0f} rows/s).'
+    )
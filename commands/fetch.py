@@ -7,8 +7,9 @@
 
 from models.command_model import Command
 from typing import Dict, List
+from rich.markup import escape
 from utils.output import ClientConsole
-from models.dbmanip import fetch_manager
+from models.dbmanip import fetch_manager, SNIPPET_OPEN, SNIPPET_CLOSE
 from models.config_model import *
 from utils.exceptions import *
 from models.memglobalstore_model import global_manager
@@ -20,6 +21,10 @@ from utils.performance import PerformanceMetrics
 @Command.register('fetch')
 def fetch(flags: Dict[FlagNameConfig, List[str]]):
     """Fetches current embedded converses.
+
+    Only the text columns are read, and --max-length truncates them in SQL;
+    truncated texts end with a marker giving their full length.
+
     Arguments:
         flags (Dict[FlagNameConfig, List[str]]): Arguments
     """
@@ -28,7 +33,7 @@ def fetch(flags: Dict[FlagNameConfig, List[str]]):
         raise MissingFlagError(f"ls command requires flags.")
 
     if 'help' in flags.keys():
-        ClientConsole.help('ls')
+        ClientConsole.help('fetch')
         return
 
     if 'all' in flags.keys():
@@ -54,35 +59,69 @@ def fetch(flags: Dict[FlagNameConfig, List[str]]):
             try:
                 maxl = int(flags['max-length'][0])
             except ValueError as e:
-                raise ArgumentValueError(f'--max-length required arg of type int, got str ({maxl})')
-            
+                raise ArgumentValueError(f'--max-length required arg of type int, got str ({flags["max-length"][0]})')
+            if maxl <= 0:
+                raise ArgumentValueError(f'--max-length requires a positive int, got {maxl}')
+
     desc = 'desc' in flags.keys()
     old = 'old' in flags.keys()
+    query = single_arg(flags, 'query')
 
     if 'all' in flags:
         limit = None
     elif 'limit' in flags:
-        limit = flags['limit'][0]
+        try:
+            limit = int(flags['limit'][0])
+        except ValueError:
+            raise ArgumentValueError(f'--limit required arg of type int, got str ({flags["limit"][0]})')
+    elif query is not None:
+        limit = 10
     else:
         raise MissingFlagError("fetch requires either a flag --all or --limit")
     
-    # Get stored conversations
     table = global_manager.get('tablename')
-    table = fetch_manager.fetch(
-        table,
-        None if 'all' in flags else flags['limit'][0],
-        old,
-        not desc
-    )
+    if query is not None:
+        _print_matches(fetch_manager.text_search(table, query, limit))
+        return
+
+    # Get stored conversations
+    rows = fetch_manager.fetch_text(table, limit, old, not desc, maxl)
 
-    ClientConsole.log(f'Total of {len(table.conversations)} entries fetched.')
-    if len(table.conversations) == 0:
+    ClientConsole.log(f'Total of {len(rows)} entries fetched.')
+    if len(rows) == 0:
         ClientConsole.warn('No conversations found.')
         return
-    for converse in table.conversations:
+    for id, timestamp, prompt, answer, prompt_len, answer_len in rows:
         ClientConsole.print(
 f"""
-[#004499]({converse.id}) [{converse.timestamp}][/#004499] 
-[bold]PROMPT[/bold] {converse.prompt}
-[bold]PROMPT[/bold] {converse.answer}""")
+[#004499]({id}) [{timestamp}][/#004499] 
+[bold]PROMPT[/bold] {_truncated(prompt, prompt_len)}
+[bold]ANSWER[/bold] {_truncated(answer, answer_len)}""")
     return
+
+# MARK: Helpers
+def _truncated(text: str, length: int) -> str:
+    """Escapes stored text for Rich, marking text cut short by --max-length with its full length."""
+    if len(text) >= length:
+        return escape(text)
+    return f'{escape(text)}[grey50]… ({length:,} chars)[/grey50]'
+
+def _highlight(snippet: str) -> str:
+    """Escapes stored text for Rich and turns FTS match markers into highlights."""
+    return (
+        escape(snippet)
+        .replace(SNIPPET_OPEN, '[bold yellow]')
+        .replace(SNIPPET_CLOSE, '[/bold yellow]')
+    )
+
+def _print_matches(matches: List[tuple]):
+    ClientConsole.log(f'Total of {len(matches)} matches fetched.')
+    if len(matches) == 0:
+        ClientConsole.warn('No conversations match the query.')
+        return
+    for id, timestamp, prompt, answer, score in matches:
+        ClientConsole.print(
+f"""
+[#004499]({id}) [{timestamp}][/#004499] [grey50]score {-score:.2f}[/grey50]
+[bold]PROMPT[/bold] {_highlight(prompt)}
+[bold]ANSWER[/bold] {_highlight(answer)}""")
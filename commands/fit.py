@@ -0,0 +1,102 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# fit.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import time
+from typing import Dict, List
+import numpy as np
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, decode_vectors
+from models.config_model import *
+from models.filter_model import RowFilter, sample_mask
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.linear_map import RidgeAccumulator, row_cosines
+from utils.sidecar import save_sidecar
+from utils.const import SCAN_BLOCK_SIZE
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('fit')
+def fit(flags: Dict[FlagNameConfig, List[str]]):
+    """Fits a ridge-regularized linear map from prompt to answer embeddings.
+
+    The training rows are streamed once to accumulate XᵀX and XᵀY, so memory
+    is O(dim²) whatever the row count, and the map is solved in closed form.
+    A deterministic hash sample of ids is held out and scored by the cosine
+    between predicted and stored answer vectors, next to two baselines: the
+    prompt vector itself and the mean answer vector.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('fit')
+        return
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    ridge = single_arg(flags, 'ridge', float, 1.0)
+    if ridge <= 0:
+        raise ArgumentValueError(f'--ridge requires a positive float, got {ridge}')
+    holdout = single_arg(flags, 'holdout', float, 0.1)
+    if not 0 < holdout < 1:
+        raise ArgumentValueError(f'--holdout must be within (0, 1), got {holdout}')
+    seed = single_arg(flags, 'seed', int, 0)
+
+    max_id = fetch_manager.max_id(table)
+    if max_id is None:
+        ClientConsole.warn(f'Table {table} is empty.')
+        return
+    dim = fetch_manager.vector_dim(table)
+    snapshot = RowFilter(to_id=max_id)
+
+    started = time.perf_counter()
+    accumulator = RidgeAccumulator(dim, dim)
+    with ClientConsole.loading(message='Accumulating XᵀX and XᵀY...'):
+        for ids, x, y in _pairs(table, snapshot):
+            train = ~sample_mask(ids, holdout, seed)
+            accumulator.add(x[train], y[train])
+    if accumulator.rows == 0:
+        raise ArgumentValueError(f'--holdout {holdout} leaves no training rows')
+    weights, bias = accumulator.solve(ridge)
+    fitted = time.perf_counter() - started
+
+    y_mean = (accumulator.y_sum / accumulator.rows).astype(np.float32)
+    scores = {'map': [], 'identity': [], 'mean': []}
+    with ClientConsole.loading(message='Scoring held-out rows...'):
+        for _, x, y in _pairs(table, RowFilter(to_id=max_id, sample=holdout, seed=seed)):
+            scores['map'].append(row_cosines(x @ weights + bias, y))
+            scores['identity'].append(row_cosines(x, y))
+            scores['mean'].append(row_cosines(np.broadcast_to(y_mean, y.shape), y))
+    scores = {name: np.concatenate(values) if values else np.empty(0) for name, values in scores.items()}
+    held_out = len(scores['map'])
+
+    path = save_sidecar(
+        table, 'linear_map', weights=weights, bias=bias, ridge=np.float64(ridge),
+        rows=np.int64(accumulator.rows), holdout_cosine=np.float64(scores['map'].mean() if held_out else np.nan)
+    )
+    ClientConsole.table(
+        ['Predictor', 'Mean cosine', 'Median cosine', 'Cosine error (1 - mean)'],
+        [
+            [name, f'{values.mean():.4f}', f'{np.median(values):.4f}', f'{1 - values.mean():.4f}']
+            for name, values in (('ridge map', scores['map']), ('prompt vector', scores['identity']), ('mean answer', scores['mean']))
+        ] if held_out else [],
+        title=f'Held-out rows: {held_out}'
+    )
+    ClientConsole.done(
+        f'Fitted a {dim}x{dim} map on {accumulator.rows} rows in {fitted:.2f}s (ridge {ridge:g}), saved to {path}.'
+    )
+
+# MARK: Helpers
+def _pairs(table: str, row_filter: RowFilter):
+    """Streams (ids, veci, veco) chunks in id order."""
+    for rows in fetch_manager.iter_rows(table, ['veci', 'veco'], row_filter, SCAN_BLOCK_SIZE):
+        ids, vecis, vecos = zip(*rows)
+        yield np.fromiter(ids, dtype=np.int64, count=len(ids)), decode_vectors(vecis), decode_vectors(vecos)
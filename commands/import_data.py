@@ -0,0 +1,173 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# import_data.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import os
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from models.command_model import Command
+from models.converse_model import Converse
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, CONFLICT_POLICIES
+from models.config_model import *
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.dataset_io import RecordReader, parse_vector, IMPORT_FORMATS
+from utils.embed import embed_batch, embedding_model_id
+from utils.hashing import content_hash
+from utils.const import IMPORT_BATCH_SIZE
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('import')
+def import_data(flags: Dict[FlagNameConfig, List[str]]):
+    """Bulk imports prompt/answer records from a JSONL or CSV file.
+
+    Records are streamed, embedded a batch at a time (precomputed `veci` and
+    `veco` fields are used as-is) and written one transaction per batch
+    together with a checkpoint, so an interrupted import resumes where the
+    last committed batch ended. Records whose (prompt, answer) pair is
+    already stored are dropped before embedding unless --on-conflict replace
+    is given, so rerunning an import costs no model time.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('import')
+        return
+
+    path = single_arg(flags, 'file')
+    if path is None:
+        raise MissingFlagError('import command requires flag --file.')
+    if not os.path.isfile(path):
+        raise ArgumentValueError(f'--file {path} does not exist')
+    fmt = single_arg(flags, 'format', default=os.path.splitext(path)[1].lstrip('.').lower())
+    if fmt not in IMPORT_FORMATS:
+        raise ArgumentValueError(f'--format expects one of {", ".join(IMPORT_FORMATS)}, got {fmt}')
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    batch = single_arg(flags, 'batch', int, IMPORT_BATCH_SIZE)
+    if batch <= 0:
+        raise ArgumentValueError(f'--batch requires a positive int, got {batch}')
+    on_conflict = single_arg(flags, 'on-conflict', default='skip')
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ArgumentValueError(f'--on-conflict expects one of {", ".join(CONFLICT_POLICIES)}, got {on_conflict}')
+
+    if not fetch_manager.table_exists(table):
+        ClientConsole.log(f'Creating table {table}...')
+        fetch_manager.create(table)
+    model = fetch_manager.table_meta(table)['model']
+    chunking = fetch_manager.table_meta(table)['options'].get('chunking')
+    if model is not None and model != embedding_model_id():
+        raise ArgumentValueError(
+            f'Table {table} was embedded with {model} but the current model is {embedding_model_id()}, '
+            'run reembed before importing into it.'
+        )
+
+    job = f'import:{table}:{os.path.abspath(path)}'
+    reader = RecordReader(path, fmt)
+    signature = reader.signature()
+    done = 0
+
+    checkpoint = fetch_manager.get_checkpoint(job)
+    if checkpoint is not None and 'restart' not in flags:
+        position, rows, stored_signature = checkpoint
+        if stored_signature == signature:
+            reader = RecordReader(path, fmt, start=position)
+            done = rows
+            ClientConsole.log(f'Resuming import after {done} rows.')
+        else:
+            ClientConsole.warn('Source file changed since the last checkpoint, importing from the start.')
+
+    start_position = reader.position
+    imported = 0
+    skipped = 0
+    started = time.perf_counter()
+    with ClientConsole.loading(message=f'Importing {path} into {table}...') as status:
+        try:
+            for records in _batched(reader, batch):
+                offset = done + imported + skipped
+                converses = _to_converses(_drop_duplicates(table, records, on_conflict, offset), offset, chunking)
+                with fetch_manager.transaction():
+                    written = fetch_manager.insert_many(table, converses, on_conflict)
+                    fetch_manager.set_checkpoint(job, reader.position, offset + len(records), signature)
+                imported += written
+                skipped += len(records) - written
+                status.update(ClientConsole.progress(
+                    reader.position - start_position,
+                    reader.size - start_position,
+                    imported / (time.perf_counter() - started)
+                ))
+        except KeyboardInterrupt:
+            ClientConsole.warn(f'Import interrupted after {done + imported + skipped} rows, rerun the same command to resume.')
+            return
+
+    fetch_manager.clear_checkpoint(job)
+    elapsed = time.perf_counter() - started
+    ClientConsole.done(
+        f'Imported {imported} rows into {table} in {elapsed:.2f}s '
+        f'({imported / elapsed if elapsed else 0:,.0f} rows/s), skipped {skipped} duplicates.'
+    )
+
+# MARK: Helpers
+def _batched(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def _drop_duplicates(table: str, records: List[Dict[str, Any]], on_conflict: str, offset: int) -> List[Dict[str, Any]]:
+    """Removes records that would not be stored, before anything is embedded.
+
+    Duplicates within the batch collapse to the first record ('skip') or the
+    last ('replace'). With 'skip', pairs already in the table are dropped too.
+    """
+    by_hash: Dict[str, Dict[str, Any]] = {}
+    for index, record in enumerate(records):
+        try:
+            key = content_hash(str(record['prompt']), str(record['answer']))
+        except KeyError as e:
+            raise ArgumentValueError(f'record {offset + index + 1} is missing field {e}')
+        if on_conflict == 'replace' or key not in by_hash:
+            by_hash[key] = record
+    if on_conflict == 'skip':
+        for key in fetch_manager.existing_hashes(table, by_hash):
+            del by_hash[key]
+    return list(by_hash.values())
+
+def _to_converses(records: List[Dict[str, Any]], offset: int, chunking: Optional[dict] = None) -> List[Converse]:
+    """Builds converses for a batch, embedding every missing vector in one call.
+
+    Args:
+        records (List[Dict[str, Any]]): Parsed records with prompt, answer and optional veci/veco
+        offset (int): Rows imported before this batch, used in error messages
+        chunking (Optional[dict]): The table's long-text chunking policy
+    """
+    prompts, answers, vecis, vecos = [], [], [], []
+    pending = []  # (target list, index, text) for vectors that need the model
+
+    for index, record in enumerate(records):
+        try:
+            prompt, answer = str(record['prompt']), str(record['answer'])
+        except KeyError as e:
+            raise ArgumentValueError(f'record {offset + index + 1} is missing field {e}')
+        prompts.append(prompt)
+        answers.append(answer)
+        for target, key, text in ((vecis, 'veci', prompt), (vecos, 'veco', answer)):
+            vector = parse_vector(record.get(key))
+            target.append(vector)
+            if vector is None:
+                pending.append((target, index, text))
+
+    if pending:
+        vectors = embed_batch([text for _, _, text in pending], chunking=chunking)
+        for (target, index, _), vector in zip(pending, vectors):
+            target[index] = vector
+
+    return [Converse(*row) for row in zip(prompts, answers, vecis, vecos)]
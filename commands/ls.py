@@ -32,11 +32,12 @@ def ls(flags: Dict[FlagNameConfig, List[str]]):
         if 'query' in flags.keys():
             query = flags['query'][0]
         if len(flags['ROOT']) == 0:
-            tables = list(filter(lambda x: not match(query, x.name) is None, fetch_manager.tables()))
+            names = fetch_manager.table_names()
+            tables = [name for name in names if match(query, name) is not None]
             if len(tables) == 0:
                 ClientConsole.warn('No tables found.')
                 if useQ:
-                    if len(fetch_manager.tables()) != 0:
+                    if len(names) != 0:
                         ClientConsole.warn(f'No tables matches regex query ({query}).')
                     else:
                         ClientConsole.warn('No tables exist')
@@ -44,12 +45,12 @@ def ls(flags: Dict[FlagNameConfig, List[str]]):
                     ClientConsole.warn('No tables exist')
             tables_count = 0 # Counter for counting how many tables found.
             for table in tables:
+                # O(1) from the maintained record, built by one scan the first time
+                stats = fetch_manager.table_stats(table) or fetch_manager.recompute_stats(table)
                 ClientConsole.print(
 f"""
- {'*' if global_manager.get('tablename') == table.name else ' '} [#004499]({table.name})[/#004499] - {len(table.conversations)} Entries, last updated @ {
-    max(conv.timestamp for conv in table.conversations if conv.timestamp is not None).strftime('%Y-%m-%d %H:%M') 
-    if any(conv.timestamp is not None for conv in table.conversations) 
-    else 'Never'
+ {'*' if global_manager.get('tablename') == table else ' '} [#004499]({table})[/#004499] - {stats['rows']} Entries, last updated @ {
+    stats['last_ts'][:16] if stats['last_ts'] is not None else 'Never'
 }
 """)
         else:
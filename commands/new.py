@@ -13,12 +13,20 @@ from models.config_model import *
 from utils.exceptions import *
 from models.memglobalstore_model import global_manager
 from utils.performance import PerformanceMetrics
+from utils.embed import chunking_policy
 
 # MARK: COMMANDS:
 @PerformanceMetrics.runtime_monitor
 @Command.register('new')
 def new(flags: Dict[FlagNameConfig, List[str]]):
     """Create a datatable.
+
+    With --chunk, texts longer than the model's input are split into token
+    windows whose vectors are pooled, instead of being cut off. The resolved
+    policy is stored with the table and used by every later embedding of it.
+    With --normalize, unit vectors are stored along with their original norms
+    so similarity scans skip renormalizing every row.
+
     Arguments:
         flags (Dict[FlagNameConfig, List[str]]): Arguments
     """
@@ -32,9 +40,26 @@ def new(flags: Dict[FlagNameConfig, List[str]]):
         ClientConsole.help('new')
         return
 
+    name = single_arg(flags, 'name')
+    if name is None:
+        raise MissingFlagError('new command requires flag --name.')
+    options = {}
+    if 'chunk' in flags:
+        overlap = single_arg(flags, 'overlap', int, 0)
+        pooling = single_arg(flags, 'pooling', default='mean')
+        try:
+            options['chunking'] = chunking_policy(single_arg(flags, 'window', int), overlap, pooling)
+        except ValueError as e:
+            raise ArgumentValueError(str(e))
+    elif any(flag in flags for flag in ('window', 'overlap', 'pooling')):
+        raise MissingFlagError('--window, --overlap and --pooling must be with --chunk')
     ClientConsole.log('Creating table...')
     try:
-        fetch_manager.create(flags['name'])
+        fetch_manager.create(name, options=options, normalize='normalize' in flags)
     except TableExistsError:
-        ClientConsole.error(f'Table {flags['name']} already exists.')
-        ClientConsole.warn(f'Use the command `cd {flags['name']}` to point datatable.')
\ No newline at end of file
+        ClientConsole.error(f'Table {name} already exists.')
+        ClientConsole.warn(f'Use the command `cd {name}` to point datatable.')
+    else:
+        if options:
+            policy = options['chunking']
+            ClientConsole.log(f'Long texts are embedded in {policy["window"]}-token windows ({policy["overlap"]} overlap, {policy["pooling"]} pooling).')
\ No newline at end of file
@@ -0,0 +1,64 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# predict.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+from typing import Dict, List
+from rich.markup import escape
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager
+from models.config_model import *
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.embed import embed
+from utils.search import StageTimer, vector_search
+from utils.sidecar import load_sidecar
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('predict')
+def predict(flags: Dict[FlagNameConfig, List[str]]):
+    """Maps an embedded prompt through the fitted linear map and retrieves the nearest stored answers.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('predict')
+        return
+
+    text = single_arg(flags, 'text')
+    if text is None:
+        raise MissingFlagError('predict command requires flag --text.')
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    limit = single_arg(flags, 'limit', int, 5)
+
+    model = load_sidecar(table, 'linear_map')
+    if model is None:
+        raise ArgumentValueError(f'Table {table} has no fitted map, run fit first.')
+
+    timer = StageTimer()
+    with timer.stage('embed'):
+        query = embed(text, fetch_manager.table_meta(table)['options'].get('chunking'))
+    with timer.stage('map'):
+        predicted = query @ model['weights'] + model['bias']
+    with timer.stage('vector'):
+        hits = vector_search(fetch_manager, table, predicted, 'veco', limit)
+    with timer.stage('load'):
+        rows = fetch_manager.rows_by_id(table, [row_id for row_id, _ in hits])
+
+    ClientConsole.log(f'Nearest stored answers to the predicted answer vector (held-out cosine {float(model["holdout_cosine"]):.4f}).')
+    for row_id, score in hits:
+        timestamp, prompt, answer = rows[row_id]
+        ClientConsole.print(
+f"""
+[#004499]({row_id}) [{timestamp}][/#004499] [grey50]score {score:.4f}[/grey50]
+[bold]PROMPT[/bold] {escape(prompt)}
+[bold]ANSWER[/bold] {escape(answer)}""")
+    ClientConsole.log(' | '.join(f'{stage} {ms:.1f} ms' for stage, ms in timer.timings.items()))
@@ -0,0 +1,130 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# quantize.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import time
+from typing import Callable, Dict, List
+import numpy as np
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, TEXT_FIELDS
+from models.config_model import *
+from models.filter_model import RowFilter
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.pq import ProductQuantizer
+from utils.search import pq_search_many, vector_search_many
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('quantize')
+def quantize(flags: Dict[FlagNameConfig, List[str]]):
+    """Trains a product quantization codec for one vector column.
+
+    Codebooks are fitted on a sample of the column, then every row is
+    encoded into `--bytes` one-byte codes saved as a sidecar next to the
+    codec, which `search --pq` scans with asymmetric distance tables. Stored
+    vectors of a second sample serve as queries to compare exact search,
+    PQ search and PQ search re-ranked exactly, by bytes per vector,
+    recall@k and queries per second. Each query's own row is left out of
+    its results.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('quantize')
+        return
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    if 'drop' in flags:
+        if fetch_manager.drop_pq_index(table):
+            ClientConsole.done(f'Removed the PQ codecs of {table}.')
+        else:
+            ClientConsole.warn(f'Table {table} has no PQ codec.')
+        return
+
+    field = single_arg(flags, 'field', default='prompt')
+    if field not in TEXT_FIELDS:
+        raise ArgumentValueError(f'--field expects one of {", ".join(TEXT_FIELDS)}, got {field}')
+    column = TEXT_FIELDS[field]
+    m = single_arg(flags, 'bytes', int, 32)
+    dim = fetch_manager.table_meta(table)['dim']
+    if m < 1 or dim % m:
+        raise ArgumentValueError(f'--bytes must divide the dimension {dim} of {table}, got {m}')
+    sample_rows = single_arg(flags, 'sample', int, 25600)
+    iterations = single_arg(flags, 'iter', int, 10)
+    queries = single_arg(flags, 'queries', int, 100)
+    k = single_arg(flags, 'k', int, 10)
+    rerank = single_arg(flags, 'rerank', int, 100)
+    seed = single_arg(flags, 'seed', int, 0)
+    for name, value in (('sample', sample_rows), ('iter', iterations), ('queries', queries), ('k', k)):
+        if value <= 0:
+            raise ArgumentValueError(f'--{name} requires a positive int, got {value}')
+    if rerank < k:
+        raise ArgumentValueError(f'--rerank must be at least --k {k}, got {rerank}')
+
+    max_id = fetch_manager.max_id(table)
+    if max_id is None:
+        ClientConsole.warn(f'Table {table} is empty.')
+        return
+    snapshot = RowFilter(to_id=max_id)
+    rows = fetch_manager.count(table, snapshot)
+
+    started = time.perf_counter()
+    with ClientConsole.loading(message=f'Training {m} codebooks...'):
+        _, training = fetch_manager.sample_vectors(table, column, sample_rows, snapshot, seed, unit=True)
+        quantizer = ProductQuantizer.train(training, m, iterations, np.random.default_rng(seed))
+    trained = time.perf_counter() - started
+    started = time.perf_counter()
+    with ClientConsole.loading(message=f'Encoding {rows} rows...'):
+        ids, codes = fetch_manager.encode_pq(table, column, quantizer)
+    encoded = time.perf_counter() - started
+
+    with ClientConsole.loading(message='Comparing with exact search...'):
+        probe_ids, probe_vectors = fetch_manager.sample_vectors(table, column, queries, snapshot, seed + 1)
+        probe_ids, probe_vectors = probe_ids[:queries], probe_vectors[:queries]
+        # Build the float cache before timing, as a warm search would find it
+        vector_search_many(fetch_manager, table, probe_vectors[:1], column, 1)
+        exact, exact_qps = _timed(lambda v: vector_search_many(fetch_manager, table, v, column, k + 1), probe_ids, probe_vectors, k)
+        approximate, pq_qps = _timed(lambda v: pq_search_many(fetch_manager, table, v, column, k + 1), probe_ids, probe_vectors, k)
+        reranked, rerank_qps = _timed(
+            lambda v: pq_search_many(fetch_manager, table, v, column, k + 1, rerank + 1), probe_ids, probe_vectors, k
+        )
+    reconstruction = float(np.mean(np.sum((training - quantizer.decode(quantizer.encode(training))) ** 2, axis=1)))
+    ClientConsole.table(
+        ['Search', 'Bytes per vector', f'Recall@{k}', 'Queries/s'],
+        [
+            ['exact float32', dim * 4, '1.000', f'{exact_qps:,.1f}'],
+            ['PQ (ADC)', m, f'{_recall(exact, approximate):.3f}', f'{pq_qps:,.1f}'],
+            [f'PQ + exact rerank of {rerank}', m, f'{_recall(exact, reranked):.3f}', f'{rerank_qps:,.1f}'],
+        ],
+        title=f'{len(probe_ids)} stored {field} vectors as queries over {len(ids)} rows'
+    )
+    ClientConsole.done(
+        f'Trained {m}x{quantizer.codebooks.shape[1]} codebooks on {len(training)} rows in {trained:.2f}s '
+        f'(mean squared reconstruction error {reconstruction:.4f}) and encoded {len(ids)} rows in {encoded:.2f}s, '
+        f'{dim * 4 / m:.0f}x smaller than float32 ({codes.nbytes / 2 ** 20:.1f} MiB of codes).'
+    )
+
+# MARK: Helpers
+def _timed(search: Callable, ids: np.ndarray, vectors: np.ndarray, k: int):
+    """Each query's top-k ids without its own row, and single-query throughput."""
+    results = []
+    started = time.perf_counter()
+    for row_id, vector in zip(ids.tolist(), vectors):
+        hits = search(vector.reshape(1, -1))[0]
+        results.append([hit for hit, _ in hits if hit != row_id][:k])
+    return results, len(ids) / (time.perf_counter() - started)
+
+def _recall(exact: List[List[int]], approximate: List[List[int]]) -> float:
+    """Share of the exact top-k ids also returned by the approximate search."""
+    found = sum(len(set(truth) & set(guess)) for truth, guess in zip(exact, approximate))
+    total = sum(len(truth) for truth in exact)
+    return found / total if total else 1.0
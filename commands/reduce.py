@@ -0,0 +1,140 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# reduce.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, decode_vectors, VECTOR_FIELDS
+from models.config_model import *
+from models.filter_model import RowFilter
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.linear_map import CovarianceAccumulator
+from utils.const import SCAN_BLOCK_SIZE
+
+# Explained-variance targets reported with the dimension that reaches them
+VARIANCE_TARGETS = (0.8, 0.9, 0.95, 0.99)
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('reduce')
+def reduce(flags: Dict[FlagNameConfig, List[str]]):
+    """Fits PCA over a table's embeddings to store and search them in fewer dimensions.
+
+    One streamed pass accumulates the second moment XᵀX of the unit
+    prompt and answer vectors, and the principal axes are solved from it,
+    so memory is O(dim²) whatever the row count. The cumulative explained
+    variance, the share of the vectors' squared norm the coordinates keep,
+    is reported to help pick a dimension. With --dim or --variance
+    the projection is saved as a sidecar and every row's coordinates are
+    written to the `veci_reduced`/`veco_reduced` columns, which `search
+    --reduced` and `export --reduced` use. Unit vectors are projected
+    without subtracting the mean, so dot products of the coordinates
+    approximate the original cosines, exactly so at the full dim; axes of
+    the uncentred moment keep them best at any smaller dim. With
+    --auto, inserted rows are projected too; otherwise `--sync` fills in
+    rows added since.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('reduce')
+        return
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    if 'drop' in flags:
+        fetch_manager.set_reduction(table, None)
+        ClientConsole.done(f'Removed the PCA projection and reduced columns of {table}.')
+        return
+    if 'sync' in flags:
+        if fetch_manager.reduction(table) is None:
+            raise ArgumentValueError(f'Table {table} has no PCA projection, run reduce --dim first')
+        with ClientConsole.loading(message='Projecting rows without coordinates...'):
+            written = fetch_manager.write_reduced(table, missing_only=True)
+        ClientConsole.done(f'Projected {written} rows of {table}.')
+        return
+
+    dim = single_arg(flags, 'dim', int)
+    variance = single_arg(flags, 'variance', float)
+    if dim is not None and variance is not None:
+        raise ExcessiveFlagsError('--dim and --variance cannot be used together')
+    if variance is not None and not 0 < variance <= 1:
+        raise ArgumentValueError(f'--variance must be within (0, 1], got {variance}')
+    full_dim = fetch_manager.table_meta(table)['dim']
+    if dim is not None and not 0 < dim <= full_dim:
+        raise ArgumentValueError(f'--dim must be within [1, {full_dim}], got {dim}')
+    if 'auto' in flags and dim is None and variance is None:
+        raise MissingFlagError('--auto must be with --dim or --variance')
+
+    max_id = fetch_manager.max_id(table)
+    if max_id is None:
+        ClientConsole.warn(f'Table {table} is empty.')
+        return
+
+    started = time.perf_counter()
+    accumulators = {field: CovarianceAccumulator(full_dim) for field in VECTOR_FIELDS}
+    with ClientConsole.loading(message='Accumulating covariances...'):
+        for rows in fetch_manager.iter_rows(table, list(VECTOR_FIELDS), RowFilter(to_id=max_id), SCAN_BLOCK_SIZE):
+            _, vecis, vecos = zip(*rows)
+            accumulators['veci'].add(fetch_manager.unit_vectors(table, decode_vectors(vecis)))
+            accumulators['veco'].add(fetch_manager.unit_vectors(table, decode_vectors(vecos)))
+    if accumulators['veci'].rows < 2:
+        raise ArgumentValueError(f'PCA needs at least 2 rows, {table} has {accumulators["veci"].rows}')
+    fits = {field: accumulator.pca(centered=False) for field, accumulator in accumulators.items()}
+    ratios = {field: np.cumsum(variances) / max(variances.sum(), np.finfo(np.float32).tiny) for field, (_, _, variances) in fits.items()}
+    fitted = time.perf_counter() - started
+
+    if variance is not None:
+        dim = max(_dims_for(ratios[field], variance) for field in VECTOR_FIELDS)
+    _report(ratios, full_dim, dim)
+    if dim is None:
+        ClientConsole.done(
+            f'Fitted PCA on {accumulators["veci"].rows} rows in {fitted:.2f}s. '
+            f'Run reduce --dim N (or --variance F) to store {table} in N dimensions.'
+        )
+        return
+
+    projection = {'dim': dim, 'auto': 'auto' in flags}
+    for field, (_, components, variances) in fits.items():
+        projection.update({f'{field}_components': components[:dim], f'{field}_variances': variances})
+    path = fetch_manager.set_reduction(table, projection)
+    started = time.perf_counter()
+    with ClientConsole.loading(message=f'Writing {dim}-dim coordinates...'):
+        written = fetch_manager.write_reduced(table)
+    ClientConsole.done(
+        f'Reduced {written} rows of {table} from {full_dim} to {dim} dims in {time.perf_counter() - started:.2f}s '
+        f'(explained variance {ratios["veci"][dim - 1]:.1%} prompt, {ratios["veco"][dim - 1]:.1%} answer), '
+        f'projection saved to {path}{", new rows are projected on insert" if "auto" in flags else ""}.'
+    )
+
+# MARK: Helpers
+def _dims_for(ratios: np.ndarray, target: float) -> int:
+    """Fewest components whose cumulative explained variance reaches `target`."""
+    return min(int(np.searchsorted(ratios, target - 1e-6)) + 1, len(ratios))
+
+def _report(ratios: Dict[str, np.ndarray], full_dim: int, chosen: Optional[int] = None):
+    """Cumulative explained variance at powers of two, the chosen dim and each target."""
+    dims = sorted({2 ** p for p in range(3, full_dim.bit_length())} | {full_dim} | ({chosen} if chosen else set()))
+    ClientConsole.table(
+        ['Dims', 'Prompt variance', 'Answer variance'],
+        [[f'{d}{" *" if d == chosen else ""}', f'{ratios["veci"][d - 1]:.1%}', f'{ratios["veco"][d - 1]:.1%}'] for d in dims],
+        title='Cumulative explained variance'
+    )
+    ClientConsole.table(
+        ['Target', 'Prompt dims', 'Answer dims'],
+        [
+            [f'{target:.0%}'] + [_dims_for(ratios[field], target) for field in VECTOR_FIELDS]
+            for target in VARIANCE_TARGETS
+        ],
+        title='Dimensions needed'
+    )
@@ -0,0 +1,107 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# reembed.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import time
+from typing import Dict, List
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, SHADOW_SUFFIX
+from models.config_model import *
+from models.filter_model import RowFilter
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.embed import embed_batch, embedding_dim, embedding_model_id
+from utils.vectors import vector_problems
+from utils.const import IMPORT_BATCH_SIZE
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('reembed')
+def reembed(flags: Dict[FlagNameConfig, List[str]]):
+    """Re-embeds a table with the current model into shadow columns, then swaps them in.
+
+    Rows are streamed in id order and written to `veci_next`/`veco_next`
+    one transaction per batch together with a checkpoint, so the table stays
+    readable throughout and an interrupted run resumes after the last
+    committed id. Rows inserted meanwhile are caught up before the shadow
+    columns replace the old vectors in a single transaction.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('reembed')
+        return
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    if not fetch_manager.table_exists(table):
+        raise ArgumentValueError(f'Table {table} does not exist.')
+    batch = single_arg(flags, 'batch', int, IMPORT_BATCH_SIZE)
+    if batch <= 0:
+        raise ArgumentValueError(f'--batch requires a positive int, got {batch}')
+
+    dim = embedding_dim()
+    model_id = embedding_model_id()
+    job = f'reembed:{table}'
+    for column, declaration in fetch_manager.vector_columns(table).items():
+        fetch_manager.ensure_column(table, column + SHADOW_SUFFIX, declaration)
+
+    last_id, done = -1, 0
+    checkpoint = fetch_manager.get_checkpoint(job)
+    if checkpoint is not None and 'restart' not in flags and checkpoint[2] == model_id:
+        last_id, done, _ = checkpoint
+        ClientConsole.log(f'Resuming after id {last_id} ({done} rows re-embedded).')
+    elif checkpoint is not None:
+        ClientConsole.warn('Discarding the previous partial run, re-embedding from the start.')
+        with fetch_manager.transaction() as cursor:
+            cursor.execute(f'UPDATE {table} SET veci{SHADOW_SUFFIX} = NULL, veco{SHADOW_SUFFIX} = NULL')
+
+    total = fetch_manager.count(table)
+    started = time.perf_counter()
+    migrated = 0
+    with ClientConsole.loading(message=f'Re-embedding {table} with {model_id}...') as status:
+        try:
+            for rows in fetch_manager.iter_rows(table, ['prompt', 'answer'], RowFilter(from_id=last_id + 1), batch):
+                with fetch_manager.transaction():
+                    _write_shadow(table, rows, dim)
+                    fetch_manager.set_checkpoint(job, rows[-1][0], done + migrated + len(rows), model_id)
+                migrated += len(rows)
+                status.update(ClientConsole.progress(done + migrated, total, migrated / (time.perf_counter() - started)))
+        except KeyboardInterrupt:
+            ClientConsole.warn(f'Re-embedding interrupted after {done + migrated} rows, rerun the same command to resume.')
+            return
+
+    with ClientConsole.loading(message='Swapping in the new vectors...'):
+        with fetch_manager.transaction(immediate=True) as cursor:
+            # Catch up rows inserted since the stream passed them, under the write lock
+            cursor.execute(f'SELECT id, prompt, answer FROM {table} WHERE veci{SHADOW_SUFFIX} IS NULL ORDER BY id')
+            late = cursor.fetchall()
+            for i in range(0, len(late), batch):
+                _write_shadow(table, late[i:i + batch], dim)
+            fetch_manager.promote_shadow_vectors(table, SHADOW_SUFFIX, dim, model_id)
+            fetch_manager.clear_checkpoint(job)
+
+    elapsed = time.perf_counter() - started
+    ClientConsole.done(
+        f'Re-embedded {done + migrated + len(late)} rows of {table} with {model_id} (dim {dim}) '
+        f'in {elapsed:.2f}s. Refit any fit/cluster/reduce models of this table.'
+    )
+
+# MARK: Helpers
+def _write_shadow(table: str, rows: List[tuple], dim: int):
+    """Embeds prompts and answers of (id, prompt, answer) rows in one call and stores them as shadow vectors."""
+    ids = [row[0] for row in rows]
+    chunking = fetch_manager.table_meta(table)['options'].get('chunking')
+    vectors = embed_batch([row[1] for row in rows] + [row[2] for row in rows], chunking=chunking)
+    problems = vector_problems(vectors, dim)
+    if problems:
+        index, problem = problems[0]
+        raise VectorValidationError(f'Model produced an invalid vector for row {ids[index % len(ids)]}: {problem}')
+    fetch_manager.update_vectors(table, ids, vectors[:len(ids)], vectors[len(ids):], SHADOW_SUFFIX)
@@ -0,0 +1,179 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# search.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import json
+import os
+import time
+from functools import partial
+from itertools import islice
+from typing import Dict, Iterator, List
+from rich.markup import escape
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, TEXT_FIELDS, REDUCED_COLUMNS
+from models.config_model import *
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.embed import embed, embed_batch
+from utils.search import StageTimer, hybrid_search, pq_search_many, vector_search_many, FUSION_METHODS
+from utils.const import SEARCH_QUERY_BATCH
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('search')
+def search(flags: Dict[FlagNameConfig, List[str]]):
+    """Semantic search over stored embeddings, optionally fused with full-text ranking.
+
+    With --from, every line of a text file is a query. Queries are embedded
+    in batches and each batch is answered by one pass over the stored
+    vectors, scoring all its queries against every block; results are
+    streamed to --out as JSON lines.
+
+    With --pq, vectors are scored from the product-quantized codes trained
+    by `quantize` instead of the float vectors; --rerank rescores that many
+    candidates exactly before keeping the best --limit. With --reduced,
+    queries and rows are compared in the PCA space fitted by `reduce`.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('search')
+        return
+
+    query = single_arg(flags, 'query')
+    source = single_arg(flags, 'from')
+    if query is not None and source is not None:
+        raise ExcessiveFlagsError('--query and --from cannot be used together')
+    if query is None and source is None:
+        raise MissingFlagError('search command requires flag --query or --from.')
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    limit = single_arg(flags, 'limit', int, 10)
+    field = single_arg(flags, 'field', default='prompt')
+    if field not in TEXT_FIELDS:
+        raise ArgumentValueError(f'--field expects one of {", ".join(TEXT_FIELDS)}, got {field}')
+    column = TEXT_FIELDS[field]
+    to_space = lambda vectors: vectors
+    if 'reduced' in flags:
+        if 'pq' in flags:
+            raise ExcessiveFlagsError('--reduced cannot be used with --pq')
+        if fetch_manager.reduction(table) is None:
+            raise ArgumentValueError(f'Table {table} has no PCA projection, run reduce --dim first')
+        missing = fetch_manager.unreduced_count(table)
+        if missing:
+            ClientConsole.warn(f'{missing} rows of {table} have no reduced vectors and are not searched, run reduce --sync.')
+        to_space = partial(fetch_manager.project, table, column)
+        column = REDUCED_COLUMNS[column]
+    search_many = vector_search_many
+    if 'pq' in flags:
+        if 'hybrid' in flags:
+            raise ExcessiveFlagsError('--hybrid cannot be used with --pq')
+        if not fetch_manager.has_pq_index(table, column):
+            raise ArgumentValueError(f'Table {table} has no PQ codec for --field {field}, run quantize first')
+        rerank = single_arg(flags, 'rerank', int, 0)
+        if rerank < 0:
+            raise ArgumentValueError(f'--rerank requires a non-negative int, got {rerank}')
+        search_many = partial(pq_search_many, rerank=rerank)
+    elif 'rerank' in flags:
+        raise ExcessiveFlagsError('--rerank must be with --pq')
+    if source is not None:
+        if 'hybrid' in flags:
+            raise ExcessiveFlagsError('--hybrid cannot be used with --from')
+        if not os.path.isfile(source):
+            raise ArgumentValueError(f'--from {source} does not exist')
+        out = single_arg(flags, 'out')
+        if out is None:
+            raise MissingFlagError('search --from requires flag --out.')
+        batch = single_arg(flags, 'batch', int, SEARCH_QUERY_BATCH)
+        if batch <= 0:
+            raise ArgumentValueError(f'--batch requires a positive int, got {batch}')
+        _search_file(table, source, out, column, limit, batch, search_many, to_space)
+        return
+    pool = single_arg(flags, 'pool', int, 100)
+    fusion = single_arg(flags, 'fusion', default='rrf')
+    if fusion not in FUSION_METHODS:
+        raise ArgumentValueError(f'--fusion expects one of {", ".join(FUSION_METHODS)}, got {fusion}')
+    alpha = single_arg(flags, 'alpha', float, 0.5)
+    if not 0 <= alpha <= 1:
+        raise ArgumentValueError(f'--alpha must be within [0, 1], got {alpha}')
+
+    timer = StageTimer()
+    with timer.stage('embed'):
+        query_vector = to_space(embed(query, fetch_manager.table_meta(table)['options'].get('chunking')).reshape(1, -1))[0]
+    if 'hybrid' in flags:
+        hits = hybrid_search(
+            fetch_manager, table, query, query_vector, column,
+            k=limit, pool=pool, fusion=fusion, alpha=alpha, timer=timer
+        )
+    else:
+        with timer.stage('vector'):
+            hits = search_many(fetch_manager, table, query_vector.reshape(1, -1), column, limit)[0]
+
+    with timer.stage('load'):
+        rows = fetch_manager.rows_by_id(table, [row_id for row_id, _ in hits])
+
+    _print_hits(hits, rows)
+    ClientConsole.log(' | '.join(f'{stage} {ms:.1f} ms' for stage, ms in timer.timings.items()))
+
+# MARK: Helpers
+def _search_file(table: str, source: str, out: str, column: str, limit: int, batch: int,
+                 search_many=vector_search_many, to_space=lambda vectors: vectors):
+    """Answers every query line of `source`, writing one JSON line per query to `out`."""
+    chunking = fetch_manager.table_meta(table)['options'].get('chunking')
+    timer = StageTimer()
+    started = time.perf_counter()
+    answered = 0
+    try:
+        queries = open(source, encoding='utf-8')
+    except OSError as e:
+        raise ArgumentValueError(f'--from {source} cannot be read: {e.strerror}')
+    # Opened only once the queries can be read, so a bad --from leaves no empty --out behind
+    try:
+        results = open(out, 'w', encoding='utf-8')
+    except OSError as e:
+        queries.close()
+        raise ArgumentValueError(f'--out {out} cannot be written: {e.strerror}')
+    with queries, results:
+        with ClientConsole.loading(message=f'Searching {table} for queries in {source}...') as status:
+            for lines in _query_batches(queries, batch):
+                with timer.stage('embed'):
+                    vectors = to_space(embed_batch([text for _, text in lines], chunking=chunking))
+                with timer.stage('vector'):
+                    rankings = search_many(fetch_manager, table, vectors, column, limit)
+                with timer.stage('write'):
+                    for (line, text), hits in zip(lines, rankings):
+                        record = {'line': line, 'query': text, 'hits': [{'id': row_id, 'score': score} for row_id, score in hits]}
+                        results.write(json.dumps(record, ensure_ascii=False) + '\n')
+                answered += len(lines)
+                status.update(ClientConsole.progress(answered, 0, answered / (time.perf_counter() - started), unit='queries'))
+    ClientConsole.done(f'Answered {answered} queries against {table}, results written to {out}.')
+    ClientConsole.log(' | '.join(f'{stage} {ms:.1f} ms' for stage, ms in timer.timings.items()))
+
+def _query_batches(lines, size: int) -> Iterator[List[tuple]]:
+    """Batches of (line number, query) for the non-blank lines of a file."""
+    queries = ((number, line.strip()) for number, line in enumerate(lines, start=1) if line.strip())
+    while True:
+        chunk = list(islice(queries, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _print_hits(hits, rows):
+    ClientConsole.log(f'Total of {len(hits)} results.')
+    if len(hits) == 0:
+        ClientConsole.warn('No conversations found.')
+        return
+    for row_id, score in hits:
+        timestamp, prompt, answer = rows[row_id]
+        ClientConsole.print(
+f"""
+[#004499]({row_id}) [{timestamp}][/#004499] [grey50]score {score:.4f}[/grey50]
+[bold]PROMPT[/bold] {escape(prompt)}
+[bold]ANSWER[/bold] {escape(answer)}""")
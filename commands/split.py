@@ -0,0 +1,88 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# split.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager
+from models.config_model import *
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.hashing import grouping_key, stable_unit
+from utils.const import EXPORT_CHUNK_SIZE
+
+SPLIT_NAMES = ('train', 'val', 'test')
+SPLIT_KEYS = ('id', 'prompt')
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('split')
+def split(flags: Dict[FlagNameConfig, List[str]]):
+    """Assigns rows to train/val/test splits by a stable hash.
+
+    Membership is written to an indexed `split` column, so `export --split`
+    pulls one split with a single index range scan. Hashing the grouping key
+    of the prompt keeps prompts that differ only in case, spacing or
+    punctuation in the same split.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('split')
+        return
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    key = single_arg(flags, 'by', default='id')
+    if key not in SPLIT_KEYS:
+        raise ArgumentValueError(f'--by expects one of {", ".join(SPLIT_KEYS)}, got {key}')
+    seed = single_arg(flags, 'seed', int, 0)
+    ratios = flags.get('ratios', [0.8, 0.1, 0.1])
+    if not 1 < len(ratios) <= len(SPLIT_NAMES):
+        raise ArgumentValueError(f'--ratios accepts 2 to {len(SPLIT_NAMES)} values, got {len(ratios)}')
+    if any(isinstance(r, (bool, str)) or r < 0 for r in ratios) or sum(ratios) <= 0:
+        raise ArgumentValueError(f'--ratios requires non-negative numbers, got {ratios}')
+
+    # Cumulative boundaries over [0, 1); the last one is open-ended to absorb rounding
+    total = sum(ratios)
+    bounds = [b / total for b in accumulate(ratios)][:-1]
+    names = SPLIT_NAMES[:len(ratios)]
+
+    def assign(value) -> str:
+        text = str(value) if key == 'id' else grouping_key(value)
+        return names[bisect_right(bounds, stable_unit(text, seed))]
+
+    fetch_manager.ensure_column(table, 'split', 'TEXT', index='split, id')
+    fetch_manager.conn.create_function('emb2emb_split', 1, assign, deterministic=True)
+
+    rows = fetch_manager.count(table)
+    done = 0
+    started = time.perf_counter()
+    with ClientConsole.loading(message=f'Splitting {table} by {key}...') as status:
+        for low, high in fetch_manager.iter_id_ranges(table, EXPORT_CHUNK_SIZE):
+            with fetch_manager.transaction() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} SET split = emb2emb_split({key}) WHERE id > ? AND id <= ?',
+                    (low, high)
+                )
+                done += cursor.rowcount
+            status.update(ClientConsole.progress(done, rows, done / (time.perf_counter() - started)))
+
+    fetch_manager.cursor.execute(f'SELECT split, COUNT(*) FROM {table} GROUP BY split')
+    counts = dict(fetch_manager.cursor.fetchall())
+    ClientConsole.table(
+        ['Split', 'Rows', 'Share'],
+        [[name, counts.get(name, 0), f'{counts.get(name, 0) / max(done, 1):.1%}'] for name in names],
+        title=f'{table} split by {key} (seed {seed})'
+    )
+    ClientConsole.done(f'Assigned {done} rows in {time.perf_counter() - started:.2f}s.')
@@ -0,0 +1,70 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# verify.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import time
+from collections import Counter
+from typing import Dict, List
+from models.command_model import Command
+from utils.output import ClientConsole
+from models.dbmanip import fetch_manager, VECTOR_FIELDS
+from models.config_model import *
+from utils.exceptions import *
+from models.memglobalstore_model import global_manager
+from utils.performance import PerformanceMetrics
+from utils.vectors import text_vector_problems
+from utils.const import SCAN_BLOCK_SIZE
+
+# MARK: COMMANDS:
+@PerformanceMetrics.runtime_monitor
+@Command.register('verify')
+def verify(flags: Dict[FlagNameConfig, List[str]]):
+    """Scans a table in chunks and reports rows whose vectors are corrupt.
+
+    Every stored veci/veco must parse to exactly the table's recorded
+    dimension of finite float values.
+
+    Arguments:
+        flags (Dict[FlagNameConfig, List[str]]): Arguments
+    """
+    flags = flagconfiglist2dic(flags)
+
+    if 'help' in flags:
+        ClientConsole.help('verify')
+        return
+
+    table = single_arg(flags, 'table', default=global_manager.get('tablename'))
+    limit = single_arg(flags, 'limit', int, 20)
+    if not fetch_manager.table_exists(table):
+        raise ArgumentValueError(f'Table {table} does not exist.')
+    meta = fetch_manager.table_meta(table)
+    dim = meta['dim']
+
+    scanned = 0
+    counts = Counter()
+    shown = []
+    started = time.perf_counter()
+    with ClientConsole.loading(message=f'Verifying {table}...') as status:
+        for rows in fetch_manager.iter_rows(table, VECTOR_FIELDS, chunk_size=SCAN_BLOCK_SIZE):
+            columns = list(zip(*rows))
+            for position, field in enumerate(VECTOR_FIELDS, start=1):
+                for index, problem in text_vector_problems(columns[position], dim):
+                    counts[problem.split(',')[0] if problem.startswith('dim') else problem] += 1
+                    if len(shown) < limit:
+                        shown.append([rows[index][0], field, problem])
+            scanned += len(rows)
+            status.update(f'Verified {scanned} rows ({scanned / (time.perf_counter() - started):,.0f} rows/s)')
+
+    elapsed = time.perf_counter() - started
+    ClientConsole.log(
+        f'Verified {scanned} rows of {table} (dim {dim}, model {meta["model"] or "unknown"}) in {elapsed:.2f}s.'
+    )
+    if not counts:
+        ClientConsole.done('All vectors are valid.')
+        return
+    ClientConsole.table(['Problem', 'Vectors'], [[problem, count] for problem, count in counts.most_common()], title='Invalid vectors')
+    ClientConsole.table(['Id', 'Field', 'Problem'], shown, title=f'First {len(shown)} invalid vectors')
+    ClientConsole.warn(f'{sum(counts.values())} invalid vectors found.')
@@ -11,7 +11,8 @@ clear()
 from utils.output import ClientConsole
 ClientConsole.log('Loading app...')
 from rich.console import Console
-from utils.embed import embed
+from utils.embed import get_embedder
+get_embedder().load()
 from platform import system
 from models.command_model import Command
 from utils.load_config import COMMANDS
@@ -44,11 +45,11 @@ def repl():
                     continue
                 if f == 'exit':
                     raise ProgramTermination('EXIT')
-                if not f.split()[0] in COMMANDS.keys():
-                    raise CommandNotFoundError(f'{f.split()[0]} is not a valid command.')
-                print(f.split()[0])
-                flags = COMMANDS[f.split()[0]].flags.values();
-                cmd = Command.parse(f, flags);
+                name = f.split(maxsplit=1)[0]
+                if not name in COMMANDS:
+                    raise CommandNotFoundError(f'{name} is not a valid command.')
+                print(name)
+                cmd = Command.parse(f, COMMANDS[name]);
                 cmd.act()
         except ProgramTermination:
             break;
@@ -62,6 +63,8 @@ def repl():
             ClientConsole.error(f'Command: {e}')
         except ExcessiveArgsError as e:
             ClientConsole.error(f'ExcessiveArgsError: {e}')
+        except ExcessiveFlagsError as e:
+            ClientConsole.error(f'ExcessiveFlagsError: {e}')
         except MissingArgError as e:
             ClientConsole.error(f'MissingArgsError: {e}')
         except MissingFlagError as e:
@@ -6,8 +6,10 @@
 # PromptCraft, 2025. All rights reserved.
 
 import shlex
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 from models.config_model import *
+from utils.const import PARSE_CACHE_SIZE
 from utils.exceptions import ArgumentValueError
 
 class Command:
@@ -41,7 +43,7 @@ class Command:
         self.flags = flags
 
     @classmethod
-    def parse(cls, cmd_str: str, flag_map: List[FlagNameConfig]):
+    def parse(cls, cmd_str: str, flag_map: CommandConfig | Iterable[FlagNameConfig]):
         """Parse command string into structured Command object with type conversion.
 
         Handles quoted arguments and automatic type conversion of unquoted values using
@@ -52,9 +54,9 @@ class Command:
 
         Arguments:
             cmd_str (str): Raw command input to parse (e.g. "cmd -f 'value'")
-            flag_map (List[FlagNameConfig]): Supported flags configuration containing:
-                - short (str): Single-character flag identifier
-                - long (str): Full flag name
+            flag_map (CommandConfig | Iterable[FlagNameConfig]): Supported flags. A
+                loaded CommandConfig uses its precompiled lookup tables and the
+                parsed-command LRU; a plain flag list is compiled on the fly.
 
         Returns:
             Command: Structured representation with:
@@ -82,6 +84,17 @@ class Command:
             - Unquoted → bool/int/float autoconversion
             4. Group arguments under their corresponding flags
         """
+        if isinstance(flag_map, CommandConfig):
+            name, parsed = cls._parse_cached(cmd_str, flag_map)
+        else:
+            name, parsed = cls._parse(cmd_str, CommandConfig.from_flags(flag_map))
+
+        # Cached results are shared, hand out fresh argument lists
+        return cls(name, {flag: list(args) for flag, args in parsed})
+
+    @classmethod
+    def _parse(cls, cmd_str: str, config: CommandConfig) -> Tuple[str, Tuple[Tuple[FlagNameConfig, tuple], ...]]:
+        """Uncached parse returning an immutable (name, ((flag, args), ...)) pair"""
         try:
             tokens, quoted = cls._tokenize(cmd_str)
         except ValueError as e:
@@ -91,45 +104,43 @@ class Command:
             raise ValueError("Empty command")
 
         name = tokens[0]
-        flags = {FlagNameConfig('', 'ROOT'): []}
+        short_flags = config.flags
+        long_flags = config.long_flags
+        flags = {ROOT_FLAG: []}
+        current = flags[ROOT_FLAG]
         current_flag = None
 
         for i in range(1, len(tokens)):
             token = tokens[i]
-            is_quoted = quoted[i]
 
-            # Flag detection logic remains unchanged
             if token.startswith('--'):
-                long_flag = token[2:]
-                if long_flag not in [flag.long for flag in flag_map]:
+                current_flag = long_flags.get(token[2:])
+                if current_flag is None:
                     raise ValueError(f"Unknown long flag: {token}")
-                current_flag = find_flag(flag_map, long_flag)
-                flags[current_flag] = []
+                current = flags[current_flag] = []
             elif token.startswith('-'):
-                short_flag = token[1:]
-                if short_flag not in [flag.short for flag in flag_map]:
+                current_flag = short_flags.get(token[1:])
+                if current_flag is None:
                     raise ValueError(f"Unmapped short flag: {token}")
-                current_flag = find_flag(flag_map, short_flag)
-                flags[current_flag] = []
+                current = flags[current_flag] = []
             else:
                 try:
                     # Process value with quote awareness
-                    parsed = cls._parse_value(token, is_quoted)
+                    current.append(cls._parse_value(token, quoted[i]))
                 except ValueError as e:
                     flag_name = current_flag.long if current_flag else 'ROOT'
                     raise ArgumentValueError(f"{flag_name}: {str(e)}")
 
-                # Store parsed value
-                if current_flag:
-                    flags[current_flag].append(parsed)
-                else:
-                    flags[FlagNameConfig('', 'ROOT')].append(parsed)
-        
-        return cls(name, flags)
+        return name, tuple((flag, tuple(args)) for flag, args in flags.items())
 
     @staticmethod
     def _tokenize(s: str) -> tuple[list[str], list[bool]]:
         """Tokenize with quote preservation using shlex non-POSIX mode"""
+        if "'" not in s and '"' not in s:
+            # Fast path, shlex only differs from a whitespace split on quotes
+            tokens = s.split()
+            return tokens, [False] * len(tokens)
+
         lex = shlex.shlex(s, posix=False)
         lex.whitespace_split = True
         lex.commenters = ''
@@ -191,4 +202,7 @@ class Command:
                 - flags (List[str]): A list of long flags contained (eg. {'-n': ['a string here']})
         """
         return {'cmd': self.name, 'flags': self.flags}
-    
+
+# Parsed-command LRU keyed on (statement, CommandConfig identity); repeated
+# statements in scripts skip tokenizing and type conversion entirely.
+Command._parse_cached = staticmethod(lru_cache(maxsize=PARSE_CACHE_SIZE)(Command._parse))
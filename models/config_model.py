@@ -5,8 +5,9 @@
 # 
 # PromptCraft, 2025. All rights reserved.
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple
+from utils.exceptions import ArgumentValueError, ExcessiveArgsError, MissingArgError
 import json
 
 @dataclass(frozen=True)
@@ -15,9 +16,26 @@ class FlagNameConfig:
     short: str
     long: str
 
+    _interned: ClassVar[Dict[Tuple[str, str], 'FlagNameConfig']] = {}
+
+    @classmethod
+    def intern(cls, short: str, long: str) -> 'FlagNameConfig':
+        """Returns the canonical instance for a (short, long) pair.
+
+        Interned instances are shared between the compiled lookup tables and
+        parsed commands, so dict keys compare by identity before equality.
+        """
+        key = (short, long)
+        flag = cls._interned.get(key)
+        if flag is None:
+            flag = cls._interned[key] = cls(short=short, long=long)
+        return flag
+
     @classmethod
     def from_dict(cls, data: dict) -> 'FlagNameConfig':
-        return cls(short=data['short'], long=data['long'])
+        return cls.intern(data['short'], data['long'])
+
+ROOT_FLAG = FlagNameConfig.intern('', 'ROOT')
 
 @dataclass
 class FlagDocConfig:
@@ -42,11 +60,20 @@ class DocConfig:
             additions={item['flag']: item['add'] for item in data['additions']}
         )
 
-@dataclass
+@dataclass(eq=False)
 class CommandConfig:
-    """Complete command configuration with optional docs"""
+    """Complete command configuration with optional docs.
+
+    `flags` doubles as the short-name lookup table; `long_flags` is compiled
+    once at load so parsing never scans the flag list. Instances hash by
+    identity, which lets them key the parsed-command cache.
+    """
     flags: Dict[str, FlagNameConfig]
     doc: Optional[DocConfig] = None
+    long_flags: Dict[str, FlagNameConfig] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.long_flags = {flag.long: flag for flag in self.flags.values()}
 
     @classmethod
     def from_dict(cls, data: dict) -> 'CommandConfig':
@@ -55,6 +82,11 @@ class CommandConfig:
             doc=DocConfig.from_dict(data['docs']) if 'docs' in data else None
         )
 
+    @classmethod
+    def from_flags(cls, flags_list: Iterable[FlagNameConfig]) -> 'CommandConfig':
+        """Compiles an ad-hoc flag list (no docs) into lookup tables."""
+        return cls(flags={flag.short: flag for flag in flags_list})
+
 @dataclass
 class ShellLexicalConfig:
     """Top-level configuration container with safe loading"""
@@ -103,4 +135,37 @@ def flagconfiglist2dic(flags_list: Dict[FlagNameConfig, List[str]]) -> Dict[str,
         for flag_config, arguments in flags_list.items()
         if isinstance(flag_config, FlagNameConfig)  # Type safety check
     }
-    
\ No newline at end of file
+
+def single_arg(flags: Dict[str, List[Any]], name: str, kind: type = str, default: Any = None) -> Any:
+    """Reads the one argument of a long flag from a flagconfiglist2dic result.
+
+    Example:
+        >>> single_arg({'limit': [10]}, 'limit', int)
+        10
+        >>> single_arg({}, 'limit', int, 25)
+        25
+
+    Args:
+        flags (Dict[str, List[Any]]): Long flag name to arguments
+        name (str): Long flag name
+        kind (type): Expected argument type, ints are accepted for floats
+        default (Any): Returned when the flag is absent
+
+    Raises:
+        MissingArgError: Flag given without an argument
+        ExcessiveArgsError: Flag given more than one argument
+        ArgumentValueError: Argument is not of `kind`
+    """
+    if name not in flags:
+        return default
+    args = flags[name]
+    if len(args) == 0:
+        raise MissingArgError(f'--{name} requires 1 {kind.__name__} value, got 0')
+    if len(args) > 1:
+        raise ExcessiveArgsError(f'--{name} requires 1 {kind.__name__} value, got {len(args)}')
+    value = args[0]
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ArgumentValueError(f'--{name} required arg of type {kind.__name__}, got {type(value).__name__} ({value})')
+    return value
@@ -6,6 +6,7 @@
 # PromptCraft, 2025. All rights reserved.
 
 from utils.embed import embed
+import numpy as np
 from numpy import ndarray
 from datetime import datetime
 from typing import Optional, List
@@ -47,6 +48,10 @@ class Converse:
         Raises:
             ValueError: If embedding dimensions mismatch
         """
+        veci = np.asarray(veci, dtype=np.float32)
+        veco = np.asarray(veco, dtype=np.float32)
+        if veci.ndim != 1 or veci.shape != veco.shape:
+            raise ValueError(f'Embedding dimensions mismatch: veci {veci.shape}, veco {veco.shape}')
         self.prompt = prompt
         self.answer = answer
         self.veci = veci
@@ -5,15 +5,56 @@
 # 
 # PromptCraft, 2025. All rights reserved.
 
+import os
 import sqlite3
 import datetime
-from typing import Dict, List, Optional
+import dataclasses
+import json
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 import numpy as np
 from models.memglobalstore_model import global_manager
 from models.converse_model import Converse, StoredConverse, ConverseTable
-from utils.exceptions import TableExistsError
-from utils.const import DB_PATH
+from models.filter_model import RowFilter
+from utils.exceptions import TableExistsError, VectorValidationError
+from utils.const import DB_PATH, INTERNAL_TABLE_PREFIX
+from utils.embed import embedding_dim, embedding_model_id
+from utils.hashing import content_hash
+from utils.kmeans import assign
+from utils.linear_map import project
+from utils.pq import ProductQuantizer
+from utils.running_stats import Moments, EMPTY_MOMENTS, moments, merge_moments, remove_moments
+from utils.sidecar import load_matrix, load_sidecar, matrix_path, remove_matrix, remove_sidecar, save_sidecar, sidecar_path, write_matrix
+from utils.vectors import materialize, unit_rows, vector_problems
 from utils.performance import PerformanceMetrics
+from utils.sqlite_profile import connect
+
+CHECKPOINT_TABLE = f'{INTERNAL_TABLE_PREFIX}checkpoints'
+STATS_TABLE = f'{INTERNAL_TABLE_PREFIX}stats'
+TABLES_TABLE = f'{INTERNAL_TABLE_PREFIX}tables'
+STATS_METRICS = ('veci_norm', 'veco_norm', 'prompt_len', 'answer_len')
+SNIPPET_OPEN, SNIPPET_CLOSE = '\x02', '\x03'
+VECTOR_FIELDS = ('veci', 'veco')
+# Original magnitudes of the unit vectors stored by normalized tables
+NORM_COLUMNS = {'veci': 'veci_norm', 'veco': 'veco_norm'}
+# PCA coordinates written by `reduce`
+REDUCED_COLUMNS = {'veci': 'veci_reduced', 'veco': 'veco_reduced'}
+# Suffix of the columns `reembed` writes the new vectors to before the swap
+SHADOW_SUFFIX = '_next'
+TEXT_FIELDS = {'prompt': 'veci', 'answer': 'veco'}
+CONFLICT_POLICIES = ('skip', 'replace')
+CONFLICT_CLAUSES = {
+    'skip': 'ON CONFLICT (content_hash) DO NOTHING',
+    # Update in place so the id, FTS rowid and any tags stay stable
+    'replace': (
+        'ON CONFLICT (content_hash) DO UPDATE SET prompt = excluded.prompt, answer = excluded.answer, '
+        'veci = excluded.veci, veco = excluded.veco, timestamp = excluded.timestamp'
+    ),
+}
+# Spare rows allocated in matrix sidecars, so rows inserted later are appended in place
+MATRIX_HEADROOM = 0.125
 
 
 class DatabaseManager:
@@ -24,34 +65,1020 @@ class DatabaseManager:
     >>> db.insert('test', [0 for _ in range(0, 384)], [0 for _ in range(0, 384)])
     
     """
-    def __init__(self):
-        self.conn = sqlite3.connect(DB_PATH)
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DB_PATH
+        self.conn = connect(self.path)
         self.cursor = self.conn.cursor()
+        self._transaction_depth = 0
+        self._hashed_tables = set()
+        self._stats_ready = False
+        self._cluster_models = {}
+        self._reductions = {}
+        self._table_meta = {}
+        self.conn.create_function('emb2emb_content_hash', 2, content_hash, deterministic=True)
         """Initializes a DatabaseManager
         """
         pass
-    
+
+    @contextmanager
+    def transaction(self, immediate: bool = False):
+        """Groups statements into one commit; nested blocks join the outermost.
+
+        With `immediate`, the write lock is taken at BEGIN, so a block that
+        reads before it writes cannot fail with SQLITE_BUSY when another
+        connection wrote in between. It only applies to the outermost block.
+
+        Example:
+            >>> with db.transaction():
+            ...     db.insert_many('main', converses)
+            ...     db.set_checkpoint('import:main:data.jsonl', 4096, 10)
+        """
+        self._transaction_depth += 1
+        try:
+            if self._transaction_depth == 1 and not self.conn.in_transaction:
+                # sqlite3 only opens transactions implicitly before DML; an
+                # explicit BEGIN makes schema changes in the block atomic too
+                self.cursor.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            yield self.cursor
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.conn.commit()
+
     @PerformanceMetrics.runtime_monitor
-    def insert(self, converse: Converse):
+    def insert(self, converse: Converse, table: Optional[str] = None, on_conflict: str = 'skip') -> int:
         """Inserts a set of prompt & answer embedding arrays
 
         Args:
             converse (Converse): A peice of conversation between the model and the user, along with embedded vectors.
+            table (Optional[str]): Target table, defaults to the current tablename pointer
+            on_conflict (str): 'skip' keeps the stored row, 'replace' overwrites it in place
+
+        Returns:
+            int: 1 if the row was written, 0 if it was skipped as a duplicate
         """
-        # table = global_manager.get('tablename')
-        table = 'main'
-        self.cursor.execute(f'''
-                       INSERT INTO {table} (text, answer, veci, veco) values
-                       (?, ?, ?, ?)
-                       ''', (converse.prompt, converse.answer, ' '.join(map(str, converse.veci)), ' '.join(map(str, converse.veco))))
+        return self.insert_many(table or global_manager.get('tablename'), [converse], on_conflict)
+
+    @PerformanceMetrics.runtime_monitor
+    def insert_many(self, table: str, converses: Iterable[Converse], on_conflict: str = 'skip') -> int:
+        """Inserts many converses with a single prepared statement in one transaction.
+
+        Every row carries the `content_hash` of its normalized prompt and
+        answer, guarded by a UNIQUE index. A row whose pair is already stored
+        is either ignored ('skip') or updates that row's text and vectors in
+        place, keeping its id ('replace'). Tables clustered by `cluster` get
+        each new row's cluster id assigned against the saved centroids.
+        Normalized tables store unit vectors and their original norms. Tables
+        reduced by `reduce --auto` get each new row's PCA coordinates; without
+        --auto, replaced rows lose theirs until `reduce --sync`.
+
+        Args:
+            table (str): Target table name
+            converses (Iterable[Converse]): Conversations with embedded vectors
+            on_conflict (str): 'skip' or 'replace'
+
+        Raises:
+            VectorValidationError: When a vector does not have the table's
+                dimension or holds non-finite values; nothing is written
+
+        Returns:
+            int: Number of rows inserted or replaced
+        """
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"Invalid conflict policy: {on_conflict}")
+        self.ensure_content_hash(table)
+        # Collapse repeats within the batch and, for 'skip', drop stored pairs up
+        # front, so the statistics below only count rows that really change
+        batch: Dict[str, Converse] = {}
+        for c in converses:
+            key = content_hash(c.prompt, c.answer)
+            if on_conflict == 'replace' or key not in batch:
+                batch[key] = c
+        existing = self.existing_hashes(table, batch)
+        if on_conflict == 'skip':
+            for key in existing:
+                del batch[key]
+        if not batch:
+            return 0
+
+        converses = list(batch.values())
+        self.validate_vectors(table, converses)
+        vecis = np.stack([np.asarray(c.veci, dtype=np.float32).ravel() for c in converses])
+        vecos = np.stack([np.asarray(c.veco, dtype=np.float32).ravel() for c in converses])
+        veci_norms, veco_norms = np.linalg.norm(vecis, axis=1), np.linalg.norm(vecos, axis=1)
+        normalized = self.is_normalized(table)
+        # Set explicitly (same format as CURRENT_TIMESTAMP) so stats know the exact value
+        timestamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        columns = ['timestamp', 'prompt', 'answer', 'veci', 'veco', 'content_hash']
+        rows = [
+            (timestamp, c.prompt, c.answer, _encode_vector(veci), _encode_vector(veco), key)
+            for (key, c), veci, veco in zip(
+                batch.items(), *((unit_rows(vecis), unit_rows(vecos)) if normalized else (vecis, vecos))
+            )
+        ]
+        conflict = CONFLICT_CLAUSES[on_conflict]
+        if normalized:
+            columns.extend(NORM_COLUMNS.values())
+            rows = [row + (float(ni), float(no)) for row, ni, no in zip(rows, veci_norms, veco_norms)]
+            if on_conflict == 'replace':
+                conflict += ''.join(f', {column} = excluded.{column}' for column in NORM_COLUMNS.values())
+        clusters = self.cluster_model(table)
+        if clusters is not None:
+            field, centroids = clusters
+            labels, _ = assign(unit_rows(vecis if field == 'veci' else vecos), centroids)
+            columns.append('cluster')
+            rows = [row + (int(label),) for row, label in zip(rows, labels)]
+            if on_conflict == 'replace':
+                conflict += ', cluster = excluded.cluster'
+        reduction = self.reduction(table)
+        if reduction is not None and reduction['auto']:
+            columns.extend(REDUCED_COLUMNS.values())
+            reduced = [self.project(table, field, vectors) for field, vectors in (('veci', vecis), ('veco', vecos))]
+            rows = [row + (_encode_vector(ri), _encode_vector(ro)) for row, ri, ro in zip(rows, *reduced)]
+        if reduction is not None and on_conflict == 'replace':
+            conflict += ''.join(
+                f', {column} = {"excluded." + column if reduction["auto"] else "NULL"}' for column in REDUCED_COLUMNS.values()
+            )
+        if on_conflict == 'replace':
+            # A pending re-embed must not swap in vectors of the replaced text
+            existing_columns = self.columns(table)
+            conflict += ''.join(
+                f', {column}{SHADOW_SUFFIX} = NULL' for column in self.vector_columns(table)
+                if column + SHADOW_SUFFIX in existing_columns
+            )
+        added = _batch_moments([len(c.prompt) for c in converses], [len(c.answer) for c in converses], veci_norms, veco_norms)
+
+        with self.transaction() as cursor:
+            replaced = self._stored_moments(table, 'content_hash', existing) if existing else None
+            cursor.executemany(
+                f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))}) {conflict}',
+                rows
+            )
+            written = cursor.rowcount
+            self._update_stats(table, added=(added, timestamp, timestamp, vecis.shape[1]), removed=replaced)
+        return written
+
+    def ensure_content_hash(self, table: str):
+        """Adds the `content_hash` column and its UNIQUE index to a table if missing.
+
+        Tables created before the column existed are backfilled in SQL. If
+        they already hold duplicate pairs, only the oldest copy keeps its hash
+        (NULLs never collide in a UNIQUE index) and `dedup` can remove the rest.
+        """
+        if table in self._hashed_tables:
+            return
+        _check_table(table)
+        with self.transaction() as cursor:
+            if 'content_hash' not in self.columns(table):
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN content_hash TEXT')
+                cursor.execute(f'UPDATE {table} SET content_hash = emb2emb_content_hash(prompt, answer)')
+                cursor.execute(
+                    f'UPDATE {table} SET content_hash = NULL '
+                    f'WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY content_hash)'
+                )
+            cursor.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS {INTERNAL_TABLE_PREFIX}idx_{table}_content_hash '
+                f'ON {table} (content_hash)'
+            )
+        self._hashed_tables.add(table)
+
+    def validate_vectors(self, table: str, converses: Sequence[Converse]):
+        """Checks shape, dtype and finiteness of every vector against the table's dimension.
+
+        Raises:
+            VectorValidationError: Listing the first offending rows
+        """
+        dim = self.table_meta(table)['dim']
+        problems = [
+            (index, field, problem)
+            for field in VECTOR_FIELDS
+            for index, problem in vector_problems([getattr(c, field) for c in converses], dim)
+        ]
+        if problems:
+            problems.sort()
+            shown = ', '.join(f'row {index} {field} {problem}' for index, field, problem in problems[:5])
+            raise VectorValidationError(
+                f'{len(problems)} invalid vectors for table {table} (dim {dim}): {shown}'
+                + (', ...' if len(problems) > 5 else '')
+            )
+
+    def cluster_model(self, table: str) -> Optional[Tuple[str, np.ndarray]]:
+        """(vector field, centroids) saved by `cluster` for a table, None if unclustered."""
+        if table not in self._cluster_models:
+            sidecar = load_sidecar(table, 'centroids')
+            model = None
+            if sidecar is not None:
+                model = (str(sidecar['field']), sidecar['centroids'])
+                self.ensure_column(table, 'cluster', 'INTEGER', index='cluster, id')
+            self._cluster_models[table] = model
+        return self._cluster_models[table]
+
+    def set_cluster_model(self, table: str, field: Optional[str], centroids: Optional[np.ndarray] = None) -> Optional[str]:
+        """Saves (or with field None, removes) the centroids used to label new rows.
+
+        Returns:
+            Optional[str]: Sidecar path when saved
+        """
+        _check_table(table)
+        self._cluster_models.pop(table, None)
+        if field is None:
+            remove_sidecar(table, 'centroids')
+            return None
+        if field not in VECTOR_FIELDS:
+            raise ValueError(f"Invalid vector field: {field}")
+        self.ensure_column(table, 'cluster', 'INTEGER', index='cluster, id')
+        return save_sidecar(table, 'centroids', field=np.array(field), centroids=np.asarray(centroids, dtype=np.float32))
+
+    def reduction(self, table: str) -> Optional[dict]:
+        """PCA projection saved by `reduce` for a table, None if unreduced.
+
+        Returns:
+            Optional[dict]: dim, auto (project inserted rows), and per vector
+                field `<field>_components` and `<field>_variances`
+        """
+        if table not in self._reductions:
+            sidecar = load_sidecar(table, 'pca')
+            if sidecar is not None:
+                sidecar.update(dim=int(sidecar['dim']), auto=bool(sidecar['auto']))
+            self._reductions[table] = sidecar
+        return self._reductions[table]
+
+    def set_reduction(self, table: str, projection: Optional[dict]) -> Optional[str]:
+        """Saves a PCA projection (or with None, removes it and its columns).
+
+        Args:
+            table (str): Conversation table
+            projection (Optional[dict]): Arrays and flags as returned by `reduction`
+
+        Returns:
+            Optional[str]: Sidecar path when saved
+        """
+        _check_table(table)
+        self._reductions.pop(table, None)
+        self.drop_vector_cache(table)
+        if projection is None:
+            remove_sidecar(table, 'pca')
+            with self.transaction() as cursor:
+                for column in REDUCED_COLUMNS.values():
+                    if column in self.columns(table):
+                        cursor.execute(f'ALTER TABLE {table} DROP COLUMN {column}')
+            return None
+        for column in REDUCED_COLUMNS.values():
+            self.ensure_column(table, column, 'TEXT')
+        return save_sidecar(table, 'pca', **{key: np.asarray(value) for key, value in projection.items()})
+
+    def project(self, table: str, field: str, vectors: np.ndarray) -> np.ndarray:
+        """PCA coordinates of vectors in a table's reduced space, computed from their unit rows.
+
+        Coordinates are not renormalized: their dot product approximates the
+        cosine of the original vectors.
+
+        Raises:
+            ValueError: If the table has no projection
+        """
+        reduction = self.reduction(table)
+        if reduction is None:
+            raise ValueError(f'Table {table} has no PCA projection')
+        return project(unit_rows(vectors), reduction[f'{field}_components'])
+
+    @staticmethod
+    def is_reduced(field: str) -> bool:
+        """Whether a vector column holds PCA coordinates, scored by plain dot product."""
+        return field in REDUCED_COLUMNS.values()
+
+    def write_reduced(self, table: str, missing_only: bool = False, chunk_size: int = 4096) -> int:
+        """Projects stored vectors into REDUCED_COLUMNS with the saved PCA projection.
+
+        Args:
+            table (str): Conversation table
+            missing_only (bool): Only rows without coordinates, e.g. inserted before --auto
+            chunk_size (int): Rows per transaction
+
+        Returns:
+            int: Number of rows written
+        """
+        reduced_columns = list(REDUCED_COLUMNS.values())
+        snapshot = RowFilter(to_id=self.max_id(table) or 0)
+        written = 0
+        for rows in self.iter_rows(table, ['veci', 'veco', reduced_columns[0]], snapshot, chunk_size):
+            if missing_only:
+                rows = [row for row in rows if row[3] is None]
+                if not rows:
+                    continue
+            ids, vecis, vecos, _ = zip(*rows)
+            reduced = self.project(table, 'veci', decode_vectors(vecis)), self.project(table, 'veco', decode_vectors(vecos))
+            with self.transaction() as cursor:
+                cursor.executemany(
+                    f'UPDATE {table} SET {", ".join(f"{column} = ?" for column in reduced_columns)} WHERE id = ?',
+                    [(_encode_vector(ri), _encode_vector(ro), row_id) for row_id, ri, ro in zip(ids, *reduced)]
+                )
+            written += len(rows)
+        self.drop_vector_cache(table)
+        return written
+
+    def unreduced_count(self, table: str) -> int:
+        """Rows of a reduced table that have no PCA coordinates."""
+        _check_table(table)
+        self.cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE {REDUCED_COLUMNS["veci"]} IS NULL')
+        return self.cursor.fetchone()[0]
+
+    def existing_hashes(self, table: str, hashes: Iterable[str]) -> set:
+        """Subset of `hashes` already stored in a table.
+
+        Lets callers drop duplicate input before paying for its embeddings.
+        """
+        self.ensure_content_hash(table)
+        hashes = list(hashes)
+        found = set()
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(hashes), 500):
+            part = hashes[i:i + 500]
+            self.cursor.execute(
+                f'SELECT content_hash FROM {table} WHERE content_hash IN ({", ".join("?" * len(part))})',
+                part
+            )
+            found.update(row[0] for row in self.cursor.fetchall())
+        return found
+
+    def count(self, table: str, row_filter: Optional[RowFilter] = None) -> int:
+        """Counts rows matching a filter."""
+        _check_table(table)
+        where, params = (row_filter or RowFilter()).where()
+        self.cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE {where}', params)
+        return self.cursor.fetchone()[0]
+
+    def max_id(self, table: str) -> Optional[int]:
+        """Largest id in a table, used to pin a snapshot for long streaming reads."""
+        _check_table(table)
+        self.cursor.execute(f'SELECT MAX(id) FROM {table}')
+        return self.cursor.fetchone()[0]
+
+    def iter_rows(self, table: str, columns: Sequence[str], row_filter: Optional[RowFilter] = None,
+                  chunk_size: int = 4096) -> Iterator[List[tuple]]:
+        """Streams rows in id order, one chunk at a time.
+
+        Uses keyset pagination on the primary key, so every chunk is an index
+        range scan regardless of how far into the table it is and memory stays
+        bounded by `chunk_size`.
+
+        Args:
+            table (str): Table to read
+            columns (Sequence[str]): Columns to select, `id` is always prepended
+            row_filter (Optional[RowFilter]): Pushed-down row selection
+            chunk_size (int): Rows per chunk
+
+        Yields:
+            List[tuple]: Rows of (id, *columns)
+        """
+        _check_table(table)
+        where, params = (row_filter or RowFilter()).where()
+        query = (
+            f'SELECT id, {", ".join(columns)} FROM {table} '
+            f'WHERE id > ? AND {where} ORDER BY id LIMIT ?'
+        )
+        cursor = self.conn.cursor()
+        last_id = -1
+        while True:
+            cursor.execute(query, (last_id, *params, chunk_size))
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def iter_vectors(self, table: str, field: str = 'veci', row_filter: Optional[RowFilter] = None,
+                     chunk_size: int = 4096, unit: bool = False) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Streams one vector column as (ids, float32 matrix) blocks in id order.
+
+        A REDUCED_COLUMNS column skips rows that have no PCA coordinates yet.
+        With `unit`, blocks are passed through `unit_vectors`.
+        """
+        _check_vector_field(field)
+        for rows in self.iter_rows(table, [field], row_filter, chunk_size):
+            if field in REDUCED_COLUMNS.values():
+                rows = [row for row in rows if row[1] is not None]
+                if not rows:
+                    continue
+            ids, texts = zip(*rows)
+            vectors = decode_vectors(texts)
+            yield np.fromiter(ids, dtype=np.int64, count=len(ids)), self.unit_vectors(table, vectors) if unit else vectors
+
+    def sample_vectors(self, table: str, field: str, rows: int, row_filter: RowFilter, seed: int = 0,
+                       minimum: int = 1, unit: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """About `rows` vectors of a column, hash-sampled from the rows `row_filter` keeps.
+
+        The hash sample is only proportional on average: over few or sparse
+        ids it can pick far fewer rows, even none. When it picks fewer than
+        `minimum`, the first `rows` rows are taken instead. `unit` is passed
+        on to `iter_vectors`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (ids, (rows, dim) float32 matrix), in id order
+        """
+        total = self.count(table, row_filter)
+        sample = dataclasses.replace(row_filter, sample=min(1.0, rows / max(total, 1)), seed=seed)
+        blocks = list(self.iter_vectors(table, field, sample, unit=unit))
+        if sum(len(ids) for ids, _ in blocks) < minimum:
+            blocks, taken = [], 0
+            for ids, vectors in self.iter_vectors(table, field, row_filter, unit=unit):
+                blocks.append((ids[:rows - taken], vectors[:rows - taken]))
+                taken += len(blocks[-1][0])
+                if taken >= rows:
+                    break
+        if not blocks:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32)
+        ids, vectors = zip(*blocks)
+        return np.concatenate(ids), np.concatenate(vectors)
+
+    def vector_matrix(self, table: str, field: str = 'veci') -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and unit rows of a vector column as a read-only memmap.
+
+        The matrix is cached as a `.npy` sidecar, so searches read contiguous
+        float32 from the page cache instead of parsing TEXT vectors. When the
+        table's statistics show only inserts since it was built, the new rows
+        are appended into its spare capacity; after a delete or replace, or
+        once the spare rows run out, it is rebuilt with one streamed scan.
+
+        Works the same over the PCA coordinates of REDUCED_COLUMNS, which are
+        cached as stored rather than as unit rows (see `project`).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (ids, (rows, dim) float32 memmap), in id order
+        """
+        _check_vector_field(field)
+        kind = f'{field}_cache'
+        # Read before scanning, so a write during the build leaves the cache stale rather than wrong
+        signature = self._write_signature(table)
+        if field in REDUCED_COLUMNS.values():
+            unit, dim = False, self.reduction(table)['dim']
+        else:
+            unit, dim = True, self.table_meta(table)['dim']
+        index = load_sidecar(table, kind)
+        matrix = load_matrix(table, kind) if index is not None else None
+        if matrix is not None and len(matrix) >= len(index['ids']):
+            if np.array_equal(index['signature'], signature):
+                return index['ids'], matrix[:len(index['ids'])]
+            if self._only_inserted_since(table, index['signature']):
+                ids = self._append_rows(table, kind, field, index['ids'], unit)
+                if ids is not None:
+                    save_sidecar(table, kind, ids=ids, signature=signature)
+                    return ids, load_matrix(table, kind)[:len(ids)]
+
+        snapshot = RowFilter(to_id=self.max_id(table) or 0)
+        rows = self.count(table, snapshot)
+        blocks = self.iter_vectors(table, field, snapshot, unit=unit)
+        ids, _ = write_matrix(table, kind, lambda path: materialize(blocks, path, _capacity(rows), dim, normalize=False))
+        save_sidecar(table, kind, ids=ids, signature=signature)
+        return ids, load_matrix(table, kind)[:len(ids)]
+
+    def _only_inserted_since(self, table: str, signature: np.ndarray) -> bool:
+        """Whether every write after the one `signature` was taken at only inserted rows."""
+        stats = self.table_stats(table)
+        return stats is not None and stats['rewritten_at'] is not None and stats['rewritten_at'] <= signature[0]
+
+    def _append_rows(self, table: str, kind: str, field: str, ids: np.ndarray, unit: bool,
+                     encode: Callable[[np.ndarray], np.ndarray] = lambda vectors: vectors) -> Optional[np.ndarray]:
+        """Writes `encode(vectors)` of the rows inserted after `ids` into a matrix sidecar's spare rows.
+
+        Rows are read as `iter_vectors` with `unit`. Readers only see rows up
+        to the length of the ids saved with the matrix, so the new rows stay
+        invisible until the caller saves them.
+
+        Returns:
+            Optional[np.ndarray]: All ids, None when the new rows do not fit
+        """
+        snapshot = RowFilter(from_id=int(ids[-1]) + 1 if len(ids) else None, to_id=self.max_id(table) or 0)
+        matrix = np.load(matrix_path(table, kind), mmap_mode='r+')
+        offset = len(ids)
+        if offset + self.count(table, snapshot) > len(matrix):
+            return None
+        appended = [ids]
+        for block_ids, vectors in self.iter_vectors(table, field, snapshot, unit=unit):
+            matrix[offset:offset + len(block_ids)] = encode(vectors)
+            appended.append(block_ids)
+            offset += len(block_ids)
+        matrix.flush()
+        return np.concatenate(appended)
+
+    def drop_vector_cache(self, table: str):
+        """Deletes the cached matrices of `vector_matrix`; they are rebuilt on next use."""
+        for field in (*VECTOR_FIELDS, *REDUCED_COLUMNS.values()):
+            remove_sidecar(table, f'{field}_cache')
+            remove_matrix(table, f'{field}_cache')
+
+    def pq_index(self, table: str, field: str = 'veci') -> Optional[Tuple[ProductQuantizer, np.ndarray, np.ndarray]]:
+        """Product quantization codec saved by `quantize` for a vector column, with its codes.
+
+        Codes are kept in sync like `vector_matrix`, with the stored codebooks
+        and without retraining: rows inserted since are encoded into the spare
+        capacity, while a delete or replace re-encodes every row in one
+        streamed pass.
+
+        Returns:
+            Optional[Tuple[ProductQuantizer, np.ndarray, np.ndarray]]: (quantizer,
+                ids, (rows, m) uint8 codes memmap), None if the column has no codec
+        """
+        if field not in VECTOR_FIELDS:
+            raise ValueError(f"Invalid vector field: {field}")
+        index = load_sidecar(table, f'{field}_pq')
+        if index is None:
+            return None
+        kind = f'{field}_pq'
+        quantizer = ProductQuantizer(index['codebooks'])
+        signature = self._write_signature(table)
+        codes = load_matrix(table, kind)
+        if codes is None or len(codes) < len(index['ids']):
+            return (quantizer, *self.encode_pq(table, field, quantizer))
+        if np.array_equal(index['signature'], signature):
+            return quantizer, index['ids'], codes[:len(index['ids'])]
+        if self._only_inserted_since(table, index['signature']):
+            ids = self._append_rows(table, kind, field, index['ids'], True, quantizer.encode)
+            if ids is not None:
+                save_sidecar(table, kind, ids=ids, signature=signature, **quantizer.to_arrays())
+                return quantizer, ids, load_matrix(table, kind)[:len(ids)]
+        return (quantizer, *self.encode_pq(table, field, quantizer))
+
+    def encode_pq(self, table: str, field: str, quantizer: ProductQuantizer) -> Tuple[np.ndarray, np.ndarray]:
+        """Encodes every row of a vector column and saves codec and codes as sidecars.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (ids, (rows, m) uint8 codes memmap), in id order
+        """
+        if field not in VECTOR_FIELDS:
+            raise ValueError(f"Invalid vector field: {field}")
+        kind = f'{field}_pq'
+        signature = self._write_signature(table)
+        snapshot = RowFilter(to_id=self.max_id(table) or 0)
+        rows = self.count(table, snapshot)
+
+        def fill(path: str) -> np.ndarray:
+            codes = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(_capacity(rows), quantizer.m))
+            ids = np.empty(rows, dtype=np.int64)
+            offset = 0
+            for block_ids, vectors in self.iter_vectors(table, field, snapshot, unit=True):
+                end = offset + len(block_ids)
+                codes[offset:end] = quantizer.encode(vectors)
+                ids[offset:end] = block_ids
+                offset = end
+            codes.flush()
+            return ids[:offset]
+
+        ids = write_matrix(table, kind, fill)
+        save_sidecar(table, kind, ids=ids, signature=signature, **quantizer.to_arrays())
+        return ids, load_matrix(table, kind)[:len(ids)]
+
+    def has_pq_index(self, table: str, field: str = 'veci') -> bool:
+        """Whether `quantize` saved a codec for a vector column, without loading it."""
+        return os.path.isfile(sidecar_path(table, f'{field}_pq'))
+
+    def drop_pq_index(self, table: str) -> bool:
+        """Deletes the codecs and codes of `pq_index`, returns whether any existed."""
+        dropped = False
+        for field in VECTOR_FIELDS:
+            dropped |= remove_sidecar(table, f'{field}_pq')
+            dropped |= remove_matrix(table, f'{field}_pq')
+        return dropped
+
+    def _write_signature(self, table: str) -> np.ndarray:
+        """Changes with every write to a table, to validate derived sidecars."""
+        stats = self.table_stats(table) or self.recompute_stats(table)
+        return np.array([stats['updated_at'], stats['rows']], dtype=np.float64)
+
+    def vector_dim(self, table: str, field: str = 'veci') -> Optional[int]:
+        """Dimension of the first stored vector, None for empty tables."""
+        if field not in VECTOR_FIELDS:
+            raise ValueError(f"Invalid vector field: {field}")
+        _check_table(table)
+        self.cursor.execute(f'SELECT {field} FROM {table} ORDER BY id LIMIT 1')
+        row = self.cursor.fetchone()
+        return None if row is None else decode_vectors([row[0]]).shape[1]
+
+    def vectors_by_id(self, table: str, ids: Sequence[int], field: str = 'veci') -> np.ndarray:
+        """Stored float vectors of the given ids, in the order given.
+
+        Raises:
+            KeyError: If an id does not exist
+        """
+        if field not in VECTOR_FIELDS:
+            raise ValueError(f"Invalid vector field: {field}")
+        rows = self.rows_by_id(table, ids, (field,))
+        return decode_vectors([rows[row_id][0] for row_id in ids])
+
+    def rows_by_id(self, table: str, ids: Sequence[int], columns: Sequence[str] = ('timestamp', 'prompt', 'answer')) -> Dict[int, tuple]:
+        """Looks up rows by primary key, keyed by id."""
+        _check_table(table)
+        found = {}
+        ids = list(ids)
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(ids), 500):
+            part = ids[i:i + 500]
+            self.cursor.execute(
+                f'SELECT id, {", ".join(columns)} FROM {table} WHERE id IN ({", ".join("?" * len(part))})',
+                part
+            )
+            found.update((row[0], row[1:]) for row in self.cursor.fetchall())
+        return found
+
+    def iter_id_ranges(self, table: str, chunk_size: int = 4096) -> Iterator[Tuple[int, int]]:
+        """Splits a table into consecutive (low, high] id ranges of up to `chunk_size` rows.
+
+        Lets set-based UPDATEs run chunk by chunk, one short transaction each,
+        without pulling rows into Python.
+        """
+        _check_table(table)
+        cursor = self.conn.cursor()
+        low = -1
+        while True:
+            cursor.execute(
+                f'SELECT id FROM {table} WHERE id > ? ORDER BY id LIMIT 1 OFFSET ?',
+                (low, chunk_size - 1)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute(f'SELECT MAX(id) FROM {table} WHERE id > ?', (low,))
+                high = cursor.fetchone()[0]
+                if high is not None:
+                    yield low, high
+                return
+            yield low, row[0]
+            low = row[0]
+
+    def columns(self, table: str) -> List[str]:
+        """Column names of a table, in schema order."""
+        _check_table(table)
+        self.cursor.execute(f'PRAGMA table_info({table})')
+        return [row[1] for row in self.cursor.fetchall()]
+
+    def ensure_column(self, table: str, column: str, declaration: str, index: Optional[str] = None):
+        """Adds an optional column (and index) to a conversation table if missing.
+
+        Args:
+            table (str): Target table
+            column (str): Column name
+            declaration (str): SQL type and constraints, e.g. 'TEXT'
+            index (Optional[str]): Indexed column list, e.g. 'split, id'
+        """
+        if column not in self.columns(table):
+            self.cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+        if index is not None:
+            self.cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {INTERNAL_TABLE_PREFIX}idx_{table}_{column} ON {table} ({index})'
+            )
         self.conn.commit()
+
+    @PerformanceMetrics.runtime_monitor
+    def delete(self, table: str, ids: Sequence[int], batch_size: int = 1000) -> int:
+        """Deletes rows by id, one transaction per batch.
+
+        Returns:
+            int: Number of rows deleted
+        """
+        _check_table(table)
+        ids = list(ids)
+        deleted = 0
+        for i in range(0, len(ids), batch_size):
+            part = ids[i:i + batch_size]
+            with self.transaction() as cursor:
+                removed = self._stored_moments(table, 'id', part)
+                cursor.executemany(f'DELETE FROM {table} WHERE id = ?', [(row_id,) for row_id in part])
+                deleted += cursor.rowcount
+                self._update_stats(table, removed=removed)
+        return deleted
+
+    def table_exists(self, table: str) -> bool:
+        """Checks whether a table exists in the schema."""
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (table,)
+        )
+        return self.cursor.fetchone() is not None
+
+    # MARK: Table metadata
+    def _ensure_meta(self):
+        self.cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {TABLES_TABLE} (
+                name TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                model TEXT,
+                options TEXT NOT NULL DEFAULT '{{}}',
+                created_at REAL
+            )
+        ''')
+
+    def table_meta(self, table: str) -> dict:
+        """Vector dimension, embedding model id and options recorded for a table.
+
+        Tables created before this record existed are adopted on first use,
+        with the dimension of their first stored vector (the current model's
+        when empty) and an unknown (None) model.
+
+        Returns:
+            dict: name, dim, model, options (dict) and created_at
+        """
+        if table not in self._table_meta:
+            _check_table(table)
+            self._ensure_meta()
+            self.cursor.execute(f'SELECT name, dim, model, options, created_at FROM {TABLES_TABLE} WHERE name = ?', (table,))
+            row = self.cursor.fetchone()
+            if row is None:
+                meta = {'name': table, 'dim': self.vector_dim(table) or embedding_dim(), 'model': None, 'options': {}, 'created_at': None}
+                self.set_table_meta(table, meta)
+            else:
+                meta = dict(zip(('name', 'dim', 'model', 'options', 'created_at'), row))
+                meta['options'] = json.loads(meta['options'])
+            self._table_meta[table] = meta
+        return self._table_meta[table]
+
+    def is_normalized(self, table: str) -> bool:
+        """Whether a table stores unit vectors, with their original norms in NORM_COLUMNS.
+
+        Cosine similarity over such a table is a plain dot product.
+        """
+        return bool(self.table_meta(table)['options'].get('normalized'))
+
+    def unit_vectors(self, table: str, vectors: np.ndarray) -> np.ndarray:
+        """Unit rows of vectors read from a table, as is when `is_normalized` already stores them."""
+        return vectors if self.is_normalized(table) else unit_rows(vectors)
+
+    def vector_columns(self, table: str) -> Dict[str, str]:
+        """Column name to declaration of everything rewritten when a table is re-embedded."""
+        columns = {field: 'TEXT' for field in VECTOR_FIELDS}
+        if self.is_normalized(table):
+            columns.update((column, 'REAL') for column in NORM_COLUMNS.values())
+        return columns
+
+    def set_table_meta(self, table: str, meta: dict):
+        """Stores a table's metadata record, as returned by `table_meta`."""
+        with self.transaction() as cursor:
+            self._ensure_meta()
+            cursor.execute(
+                f'INSERT OR REPLACE INTO {TABLES_TABLE} (name, dim, model, options, created_at) VALUES (?, ?, ?, ?, ?)',
+                (table, meta['dim'], meta['model'], json.dumps(meta['options'], sort_keys=True), meta['created_at'])
+            )
+        self._table_meta[table] = {**meta, 'name': table}
+
+    def update_vectors(self, table: str, ids: Sequence[int], vecis: np.ndarray, vecos: np.ndarray, suffix: str = '') -> int:
+        """Overwrites the vectors (or the `<field><suffix>` shadow columns) of existing rows.
+
+        Normalized tables get unit vectors and their norms, like `insert_many`.
+
+        Returns:
+            int: Number of rows updated
+        """
+        _check_table(table)
+        vecis, vecos = np.asarray(vecis, dtype=np.float32), np.asarray(vecos, dtype=np.float32)
+        assignments = f'veci{suffix} = ?, veco{suffix} = ?'
+        if self.is_normalized(table):
+            norms = zip(np.linalg.norm(vecis, axis=1).tolist(), np.linalg.norm(vecos, axis=1).tolist())
+            vecis, vecos = unit_rows(vecis), unit_rows(vecos)
+            assignments += ''.join(f', {column}{suffix} = ?' for column in NORM_COLUMNS.values())
+        else:
+            norms = ((),) * len(ids)
+        with self.transaction() as cursor:
+            cursor.executemany(
+                f'UPDATE {table} SET {assignments} WHERE id = ?',
+                [
+                    (_encode_vector(veci), _encode_vector(veco), *norm, int(row_id))
+                    for row_id, veci, veco, norm in zip(ids, vecis, vecos, norms)
+                ]
+            )
+            return cursor.rowcount
+
+    def promote_shadow_vectors(self, table: str, suffix: str, dim: int, model: Optional[str]):
+        """Swaps `veci<suffix>`/`veco<suffix>` in as the table's vectors in one transaction.
+
+        Readers see either every old vector or every new one. The table is
+        rebuilt rather than altered column by column, so the vectors keep
+        their NOT NULL constraints and schema position, and its indexes,
+        triggers and id sequence are restored. The table's metadata is
+        switched to the new dim and model in the same commit; centroids,
+        PCA projections and PQ codecs fitted on the old vectors are dropped
+        and statistics rebuilt.
+        """
+        _check_table(table)
+        shadows = {column + suffix: column for column in self.vector_columns(table)}
+        rebuilt = f'{INTERNAL_TABLE_PREFIX}rebuild_{table}'
+        with self.transaction() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            autoincrement = 'AUTOINCREMENT' in cursor.fetchone()[0].upper()
+            cursor.execute(f'PRAGMA table_info({table})')
+            info = [row for row in cursor.fetchall() if row[1] not in shadows]
+            definitions = [
+                f'{name} {declaration}'
+                + (' PRIMARY KEY' + (' AUTOINCREMENT' if autoincrement else '') if primary else '')
+                + (' NOT NULL' if not_null else '')
+                + (f' DEFAULT {default}' if default is not None else '')
+                for _, name, declaration, not_null, default, primary in info
+            ]
+            cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+                (table,)
+            )
+            dependents = [row[0] for row in cursor.fetchall()]
+            cursor.execute(f'CREATE TABLE {rebuilt} ({", ".join(definitions)})')
+            names = [row[1] for row in info]
+            sources = {column: shadow for shadow, column in shadows.items()}
+            cursor.execute(
+                f'INSERT INTO {rebuilt} ({", ".join(names)}) '
+                f'SELECT {", ".join(sources.get(name, name) for name in names)} FROM {table}'
+            )
+            if autoincrement:
+                cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,))
+                sequence = cursor.fetchone()
+            cursor.execute(f'DROP TABLE {table}')
+            cursor.execute(f'ALTER TABLE {rebuilt} RENAME TO {table}')
+            for sql in dependents:
+                cursor.execute(sql)
+            if autoincrement and sequence is not None:
+                # Ids of deleted tail rows must not be handed out again
+                cursor.execute('DELETE FROM sqlite_sequence WHERE name = ?', (table,))
+                cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (table, sequence[0]))
+            self.set_table_meta(table, {**self.table_meta(table), 'dim': dim, 'model': model})
+        self.set_cluster_model(table, None)
+        self.set_reduction(table, None)
+        self.drop_pq_index(table)
+        self.recompute_stats(table)
+
+    # MARK: Statistics
+    def _ensure_stats(self):
+        if self._stats_ready:
+            return
+        metrics = ', '.join(f'{metric}_mean REAL, {metric}_m2 REAL' for metric in STATS_METRICS)
+        with self.transaction() as cursor:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+                    name TEXT PRIMARY KEY,
+                    rows INTEGER NOT NULL,
+                    first_ts TEXT,
+                    last_ts TEXT,
+                    dim INTEGER,
+                    {metrics},
+                    updated_at REAL,
+                    rewritten_at REAL
+                )
+            ''')
+            if 'rewritten_at' not in self.columns(STATS_TABLE):
+                # The last write may have been a rewrite, so sidecars older than it are rebuilt
+                cursor.execute(f'ALTER TABLE {STATS_TABLE} ADD COLUMN rewritten_at REAL')
+                cursor.execute(f'UPDATE {STATS_TABLE} SET rewritten_at = updated_at')
+        self._stats_ready = True
+
+    def table_stats(self, table: str) -> Optional[dict]:
+        """Reads a table's incrementally maintained statistics in O(1).
+
+        Returns:
+            Optional[dict]: rows, first_ts, last_ts, dim, updated_at (last
+                write), rewritten_at (last write that deleted or replaced rows)
+                and one (count, mean, M2) Moments per metric in STATS_METRICS,
+                or None for tables whose statistics were never computed
+        """
+        self._ensure_stats()
+        self.cursor.execute(f'SELECT * FROM {STATS_TABLE} WHERE name = ?', (table,))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        record = dict(zip((d[0] for d in self.cursor.description), row))
+        stats = {key: record[key] for key in ('rows', 'first_ts', 'last_ts', 'dim', 'updated_at', 'rewritten_at')}
+        for metric in STATS_METRICS:
+            stats[metric] = (record['rows'], record[f'{metric}_mean'] or 0.0, record[f'{metric}_m2'] or 0.0)
+        return stats
+
+    def _write_stats(self, table: str, stats: dict, rewritten: bool = False):
+        values = [table, stats['rows'], stats['first_ts'], stats['last_ts'], stats['dim']]
+        for metric in STATS_METRICS:
+            values.extend(stats[metric][1:])
+        now = time.time()
+        values.extend([now, now if rewritten else stats.get('rewritten_at')])
+        with self.transaction() as cursor:
+            self._ensure_stats()
+            cursor.execute(
+                f'INSERT OR REPLACE INTO {STATS_TABLE} VALUES ({", ".join("?" * len(values))})', values
+            )
+
+    @PerformanceMetrics.runtime_monitor
+    def recompute_stats(self, table: str, chunk_size: int = 4096) -> dict:
+        """Rebuilds a table's statistics with one streamed scan and stores them."""
+        stats = {'rows': 0, 'first_ts': None, 'last_ts': None, 'dim': None, 'updated_at': time.time()}
+        stats['rewritten_at'] = stats['updated_at']
+        stats.update((metric, EMPTY_MOMENTS) for metric in STATS_METRICS)
+        normalized = self.is_normalized(table)
+        columns = ['timestamp', 'length(prompt)', 'length(answer)', *self._norm_sources(table)]
+        for rows in self.iter_rows(table, columns, chunk_size=chunk_size):
+            _, timestamps, prompt_lens, answer_lens, vecis, vecos = zip(*rows)
+            dim = self.table_meta(table)['dim'] if normalized else decode_vectors(vecis).shape[1]
+            batch = _batch_moments(prompt_lens, answer_lens, _norms(vecis, normalized), _norms(vecos, normalized))
+            _merge_stats(stats, batch, min(timestamps), max(timestamps), dim)
+        self._write_stats(table, stats, rewritten=True)
+        return stats
+
+    def _stored_moments(self, table: str, column: str, keys: Iterable) -> Optional[tuple]:
+        """(moments, first_ts, last_ts) of the stored rows about to be deleted or replaced."""
+        keys = list(keys)
+        found = []
+        normalized = self.is_normalized(table)
+        for i in range(0, len(keys), 500):
+            part = keys[i:i + 500]
+            self.cursor.execute(
+                f'SELECT timestamp, length(prompt), length(answer), {", ".join(self._norm_sources(table))} FROM {table} '
+                f'WHERE {column} IN ({", ".join("?" * len(part))})',
+                part
+            )
+            found.extend(self.cursor.fetchall())
+        if not found:
+            return None
+        timestamps, prompt_lens, answer_lens, vecis, vecos = zip(*found)
+        return (
+            _batch_moments(prompt_lens, answer_lens, _norms(vecis, normalized), _norms(vecos, normalized)),
+            min(timestamps), max(timestamps)
+        )
+
+    def _norm_sources(self, table: str) -> List[str]:
+        """Columns to read veci/veco norms from: the stored norms, or the vectors themselves."""
+        return list(NORM_COLUMNS.values()) if self.is_normalized(table) else list(VECTOR_FIELDS)
+
+    def _update_stats(self, table: str, added: Optional[tuple] = None, removed: Optional[tuple] = None):
+        """Folds inserted rows in and deleted or replaced rows out of the stored statistics.
+
+        Tables without statistics are left alone; they are built on first read.
+        """
+        stats = self.table_stats(table)
+        if stats is None:
+            return
+        if removed is not None:
+            batch, first_ts, last_ts = removed
+            stats['rows'] -= batch['prompt_len'][0]
+            for metric in STATS_METRICS:
+                stats[metric] = remove_moments(stats[metric], batch[metric])
+            # Only an aggregate can find the next oldest/newest row after removing one
+            if stats['first_ts'] is not None and (first_ts <= stats['first_ts'] or last_ts >= stats['last_ts']):
+                self.cursor.execute(f'SELECT MIN(timestamp), MAX(timestamp) FROM {table}')
+                stats['first_ts'], stats['last_ts'] = self.cursor.fetchone()
+        if added is not None:
+            _merge_stats(stats, *added)
+        self._write_stats(table, stats, rewritten=removed is not None)
+
+    # MARK: Checkpoints
+    def _ensure_checkpoints(self):
+        self.cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+                job TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                rows INTEGER NOT NULL,
+                signature TEXT,
+                updated_at REAL
+            )
+        ''')
+
+    def get_checkpoint(self, job: str) -> Optional[Tuple[int, int, Optional[str]]]:
+        """Reads a resumable job checkpoint.
+
+        Args:
+            job (str): Job key, e.g. 'import:main:/data/chat.jsonl'
+
+        Returns:
+            Optional[Tuple[int, int, Optional[str]]]: (position, rows, signature) or None
+        """
+        self._ensure_checkpoints()
+        self.cursor.execute(
+            f'SELECT position, rows, signature FROM {CHECKPOINT_TABLE} WHERE job = ?', (job,)
+        )
+        return self.cursor.fetchone()
+
+    def set_checkpoint(self, job: str, position: int, rows: int, signature: Optional[str] = None):
+        """Records job progress. Call inside the same transaction as the data it covers."""
+        with self.transaction() as cursor:
+            self._ensure_checkpoints()
+            cursor.execute(
+                f'''INSERT OR REPLACE INTO {CHECKPOINT_TABLE}
+                (job, position, rows, signature, updated_at) VALUES (?, ?, ?, ?, ?)''',
+                (job, position, rows, signature, time.time())
+            )
+
+    def clear_checkpoint(self, job: str):
+        """Removes a finished job's checkpoint."""
+        with self.transaction() as cursor:
+            self._ensure_checkpoints()
+            cursor.execute(f'DELETE FROM {CHECKPOINT_TABLE} WHERE job = ?', (job,))
         
     @PerformanceMetrics.runtime_monitor
-    def create(self, table: str) -> sqlite3.Connection:
+    def create(self, table: str, dim: Optional[int] = None, model: Optional[str] = None,
+               options: Optional[dict] = None, normalize: bool = False, select: bool = True) -> sqlite3.Connection:
         """Creates a table in the database.
 
+        The vector dimension and embedding model are recorded with the table,
+        and every later insert is validated against them.
+
         Args:
             table (str): Name of table to create
+            dim (Optional[int]): Vector dimension, defaults to the loaded model's
+            model (Optional[str]): Embedding model id, defaults to EMBEDDING_MODEL_PATH
+            options (Optional[dict]): Embedding options, e.g. the long-text `chunking` policy
+            normalize (bool): Store unit vectors plus their original norms in
+                `veci_norm`/`veco_norm`, so cosine similarity is a dot product
+            select (bool): Record the table in the global store as the current one
 
         Raises:
             TableExistsError: When table of the same name already exists
@@ -59,7 +1086,7 @@ class DatabaseManager:
         Returns:
             sqlite3.Connection: A live connection with the database
         """
-        
+        _check_table(table)
         create_sql = f'''
             CREATE TABLE {table} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -67,7 +1094,8 @@ class DatabaseManager:
                 prompt TEXT NOT NULL,
                 answer TEXT NOT NULL,
                 veci TEXT NOT NULL,
-                veco TEXT NOT NULL
+                veco TEXT NOT NULL,
+                content_hash TEXT{', veci_norm REAL, veco_norm REAL' if normalize else ''}
             )
         '''
         
@@ -79,8 +1107,110 @@ class DatabaseManager:
             else:
                 raise
         self.conn.commit()
-        global_manager.set('table', table)
+        self.set_table_meta(table, {
+            'dim': dim or embedding_dim(),
+            'model': model or embedding_model_id(),
+            'options': {**(options or {}), **({'normalized': True} if normalize else {})},
+            'created_at': time.time(),
+        })
+        self.recompute_stats(table)
+        self.ensure_content_hash(table)
+        self.ensure_fts(table)
+        if select:
+            global_manager.set('table', table)
         return self.conn
+
+    # MARK: Full-text search
+    def ensure_fts(self, table: str) -> str:
+        """Creates the FTS5 shadow index of a conversation table if missing.
+
+        The index is an external-content FTS5 table over `prompt` and
+        `answer` that stores no copy of the text. Triggers keep it in sync
+        with inserts, updates and deletes; an index added to a table that
+        already has rows is built once from the existing content.
+
+        Returns:
+            str: Name of the FTS5 table
+        """
+        _check_table(table)
+        fts = f'{INTERNAL_TABLE_PREFIX}fts_{table}'
+        if self.table_exists(fts):
+            return fts
+        with self.transaction() as cursor:
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE {fts} USING fts5(
+                    prompt, answer,
+                    content='{table}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts} (rowid, prompt, answer) VALUES (new.id, new.prompt, new.answer);
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts} ({fts}, rowid, prompt, answer) VALUES ('delete', old.id, old.prompt, old.answer);
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER {fts}_au AFTER UPDATE OF prompt, answer ON {table} BEGIN
+                    INSERT INTO {fts} ({fts}, rowid, prompt, answer) VALUES ('delete', old.id, old.prompt, old.answer);
+                    INSERT INTO {fts} (rowid, prompt, answer) VALUES (new.id, new.prompt, new.answer);
+                END
+            ''')
+            cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        return fts
+
+    def text_rank(self, table: str, query: str, limit: int) -> List[Tuple[int, float]]:
+        """Ids of the best full-text matches with their bm25 score (lower is better)."""
+        fts = self.ensure_fts(table)
+        sql = f'SELECT rowid, bm25({fts}) FROM {fts} WHERE {fts} MATCH ? ORDER BY rank LIMIT ?'
+        try:
+            self.cursor.execute(sql, (query, limit))
+        except sqlite3.OperationalError as e:
+            if 'fts5' not in str(e):
+                raise
+            self.cursor.execute(sql, (_plain_terms(query), limit))
+        return self.cursor.fetchall()
+
+    @PerformanceMetrics.runtime_monitor
+    def text_search(self, table: str, query: str, limit: Optional[int] = 10,
+                    snippet_tokens: int = 16) -> List[tuple]:
+        """Ranked full-text search over prompts and answers.
+
+        Args:
+            table (str): Conversation table
+            query (str): FTS5 query (bare words, "phrases", AND/OR/NOT, prefix*).
+                Input that is not valid FTS5 syntax is retried as plain terms.
+            limit (Optional[int]): Max hits, None for all
+            snippet_tokens (int): Tokens of context per snippet
+
+        Returns:
+            List[tuple]: (id, timestamp, prompt snippet, answer snippet, bm25 score)
+                ordered best first. Matches in snippets are wrapped in
+                SNIPPET_OPEN/SNIPPET_CLOSE.
+        """
+        fts = self.ensure_fts(table)
+        sql = f'''
+            SELECT t.id, t.timestamp,
+                snippet({fts}, 0, ?, ?, '…', ?),
+                snippet({fts}, 1, ?, ?, '…', ?),
+                bm25({fts})
+            FROM {fts} JOIN {table} AS t ON t.id = {fts}.rowid
+            WHERE {fts} MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        '''
+        markers = (SNIPPET_OPEN, SNIPPET_CLOSE, snippet_tokens)
+        try:
+            self.cursor.execute(sql, (*markers, *markers, query, -1 if limit is None else limit))
+        except sqlite3.OperationalError as e:
+            if 'fts5' not in str(e):
+                raise
+            self.cursor.execute(sql, (*markers, *markers, _plain_terms(query), -1 if limit is None else limit))
+        return self.cursor.fetchall()
     
     @PerformanceMetrics.runtime_monitor
     def fetch(self, table: str, limit: Optional[int] = 10, 
@@ -106,8 +1236,7 @@ class DatabaseManager:
             True
         """
         # Parameter validation
-        if not isinstance(table, str) or not table.isidentifier():
-            raise ValueError(f"Invalid table name: {table}")
+        _check_table(table)
 
         # Query construction
         inner_order = "ASC" if old else "DESC"
@@ -129,9 +1258,41 @@ class DatabaseManager:
         
         return ConverseTable(
             name=table,
-            conversations=[self._row_to_converse(row) for row in rows]
+            conversations=[self._row_to_converse(row, self.table_meta(table)['dim']) for row in rows]
         )
 
+    def fetch_text(self, table: str, limit: Optional[int] = 10, old: bool = True, asc: bool = True,
+                   max_length: Optional[int] = None) -> List[tuple]:
+        """Conversation text for display, truncated inside SQLite.
+
+        Only the id, timestamp and text columns are read, and with
+        `max_length` each text is cut by `substr()` in SQL, so long answers
+        and the vector payloads never reach Python. `length()` still reports
+        the original sizes.
+
+        Args:
+            table (str): Conversation table
+            limit (Optional[int]): Max records, None for all
+            old (bool): True = select the oldest records, False = the newest
+            asc (bool): True = output in ascending id order
+            max_length (Optional[int]): Characters kept of each prompt and answer
+
+        Returns:
+            List[tuple]: (id, timestamp, prompt, answer, prompt length, answer length)
+        """
+        _check_table(table)
+        prompt, answer = ('substr(prompt, 1, :length)', 'substr(answer, 1, :length)') if max_length is not None else ('prompt', 'answer')
+        self.cursor.execute(f'''
+            SELECT id, timestamp, {prompt}, {answer}, length(prompt), length(answer)
+            FROM (
+                SELECT id, timestamp, prompt, answer FROM {table}
+                ORDER BY id {"ASC" if old else "DESC"}
+                LIMIT :limit
+            )
+            ORDER BY id {"ASC" if asc else "DESC"}
+        ''', {'limit': -1 if limit is None else limit, 'length': max_length})
+        return self.cursor.fetchall()
+
     @PerformanceMetrics.runtime_monitor
     def tables(self) -> List[ConverseTable]:
         """Retrieves all conversation tables with their metadata and contents.
@@ -146,15 +1307,9 @@ class DatabaseManager:
             >>> db.tables()
             [<ConverseTable name=main (15 convs)>, <ConverseTable name=chat_logs (203 convs)>]
         """
-        self.cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' 
-            AND name NOT LIKE 'sqlite_%'
-        """)
-        
         return [
             ConverseTable(
-                name=row[0],
+                name=name,
                 conversations=[
                     StoredConverse(
                         id=conv.id,
@@ -163,28 +1318,117 @@ class DatabaseManager:
                         answer=conv.answer,
                         veci=conv.veci,
                         veco=conv.veco
-                    ) for conv in self.fetch(table=row[0], limit=None).conversations
+                    ) for conv in self.fetch(table=name, limit=None).conversations
                 ]
-            ) for row in self.cursor.fetchall()
+            ) for name in self.table_names()
         ]
-        
+
+    def table_names(self) -> List[str]:
+        """Lists conversation table names, hiding sqlite and emb2emb bookkeeping tables."""
+        self.cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' 
+            AND name NOT LIKE 'sqlite_%'
+            AND name NOT LIKE ? ESCAPE '\\'
+        """, (INTERNAL_TABLE_PREFIX.replace('_', '\\_') + '%',))
+        return [row[0] for row in self.cursor.fetchall()]
+
     @PerformanceMetrics.runtime_monitor
-    def _row_to_converse(self, row: tuple) -> StoredConverse:
+    def _row_to_converse(self, row: tuple, dim: Optional[int] = None) -> StoredConverse:
         """Convert database row to StoredConverse instance.
         
+        Raises:
+            VectorValidationError: When a stored vector does not parse to `dim` finite values
         """
+        veci = np.fromstring(row[4], sep=' ', dtype=np.float32)
+        veco = np.fromstring(row[5], sep=' ', dtype=np.float32)
+        if dim is not None:
+            for field, vector in (('veci', veci), ('veco', veco)):
+                if vector.size != dim or not np.isfinite(vector).all():
+                    raise VectorValidationError(f'Row {row[0]} has a corrupt {field} (dim {vector.size}, expected {dim}), run verify.')
         conv = StoredConverse(
             id=row[0],
             timestamp=row[1],
             prompt=row[2], 
             answer=row[3],
-            veci=np.fromstring(row[4], sep=' ', dtype=np.float32),
-            veco=np.fromstring(row[5], sep=' ', dtype=np.float32)
+            veci=veci,
+            veco=veco
         )
         conv.id = row[0]
         conv.timestamp = row[1]
         return conv
 
 
+# MARK: Helpers
+def _check_table(table: str):
+    """Rejects names that cannot be safely interpolated into SQL."""
+    if not isinstance(table, str) or not table.isidentifier():
+        raise ValueError(f"Invalid table name: {table}")
+
+def _plain_terms(query: str) -> str:
+    """Quotes every whitespace separated term, turning free text into a valid FTS5 query."""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+@lru_cache(maxsize=8)
+def _vector_format(dim: int) -> str:
+    # 9 significant digits round-trip float32 exactly
+    return ' '.join(['%.9g'] * dim)
+
+def _encode_vector(vector) -> str:
+    """Serializes a vector to the space separated TEXT storage format."""
+    values = np.asarray(vector, dtype=np.float32).ravel().tolist()
+    return _vector_format(len(values)) % tuple(values)
+
+def _norms(values: Sequence, stored: bool) -> np.ndarray:
+    """Vector norms from stored norm values, or from TEXT vectors."""
+    if stored:
+        return np.asarray(values, dtype=np.float64)
+    return np.linalg.norm(decode_vectors(values), axis=1)
+
+def _batch_moments(prompt_lens, answer_lens, veci_norms: np.ndarray, veco_norms: np.ndarray) -> Dict[str, Moments]:
+    return {
+        'veci_norm': moments(veci_norms),
+        'veco_norm': moments(veco_norms),
+        'prompt_len': moments(prompt_lens),
+        'answer_len': moments(answer_lens),
+    }
+
+def _merge_stats(stats: dict, batch: Dict[str, Moments], first_ts: str, last_ts: str, dim: int):
+    stats['rows'] += batch['prompt_len'][0]
+    for metric in STATS_METRICS:
+        stats[metric] = merge_moments(stats[metric], batch[metric])
+    stats['first_ts'] = first_ts if stats['first_ts'] is None else min(stats['first_ts'], first_ts)
+    stats['last_ts'] = last_ts if stats['last_ts'] is None else max(stats['last_ts'], last_ts)
+    stats['dim'] = stats['dim'] or dim
+
+def _capacity(rows: int) -> int:
+    """Rows to allocate for a matrix sidecar of `rows` rows, see MATRIX_HEADROOM."""
+    return rows + max(int(rows * MATRIX_HEADROOM), 1024)
+
+def _check_vector_field(field: str):
+    if field not in VECTOR_FIELDS and field not in REDUCED_COLUMNS.values():
+        raise ValueError(f"Invalid vector field: {field}")
+
+def decode_vectors(texts: Sequence[str]) -> np.ndarray:
+    """Parses a chunk of TEXT vectors into one (n, dim) float32 matrix.
+
+    Uniformly formatted chunks are parsed in a single `np.fromstring` call;
+    anything else falls back to row-wise parsing.
+
+    Raises:
+        ValueError: When rows have different dimensions
+    """
+    if len(texts) == 0:
+        return np.empty((0, 0), dtype=np.float32)
+    if len({text.count(' ') for text in texts}) == 1:
+        flat = np.fromstring(' '.join(texts), sep=' ', dtype=np.float32)
+        if flat.size % len(texts) == 0:
+            return flat.reshape(len(texts), flat.size // len(texts))
+    rows = [np.fromstring(text, sep=' ', dtype=np.float32) for text in texts]
+    dims = sorted({row.size for row in rows})
+    if len(dims) != 1:
+        raise ValueError(f'Mixed vector dimensions in chunk: {dims}')
+    return np.stack(rows)
+
 # Managers
 fetch_manager = DatabaseManager()
\ No newline at end of file
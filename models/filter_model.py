@@ -0,0 +1,76 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# filter_model.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
+
+# Knuth multiplicative hash, keeps `id`-based sampling deterministic and
+# evaluable inside SQLite without a user-defined function.
+_SAMPLE_MULTIPLIER = 2654435761
+_SAMPLE_BUCKETS = 1_000_000
+
+@dataclass
+class RowFilter:
+    """Row selection pushed down to SQL for streaming reads.
+
+    Attributes:
+        from_id (Optional[int]): Inclusive lower id bound
+        to_id (Optional[int]): Inclusive upper id bound
+        since (Optional[str]): Inclusive lower timestamp ('YYYY-MM-DD[ HH:MM:SS]')
+        until (Optional[str]): Exclusive upper timestamp
+        sample (Optional[float]): Fraction of rows to keep, in (0, 1]
+        seed (int): Sampling seed, different seeds pick different subsets
+        split (Optional[str]): Split name assigned by the `split` command
+
+    Example:
+        >>> RowFilter(from_id=10, sample=0.5).where()
+        ('id >= ? AND (id * 2654435761 + ?) % 1000000 < ?', [10, 0, 500000])
+    """
+    from_id: Optional[int] = None
+    to_id: Optional[int] = None
+    since: Optional[str] = None
+    until: Optional[str] = None
+    sample: Optional[float] = None
+    seed: int = 0
+    split: Optional[str] = None
+
+    def __post_init__(self):
+        if self.sample is not None and not 0 < self.sample <= 1:
+            raise ValueError(f'sample must be in (0, 1], got {self.sample}')
+
+    def where(self) -> Tuple[str, List]:
+        """Builds the WHERE clause body and its parameters ('1' when unfiltered)."""
+        clauses, params = [], []
+        if self.from_id is not None:
+            clauses.append('id >= ?')
+            params.append(self.from_id)
+        if self.to_id is not None:
+            clauses.append('id <= ?')
+            params.append(self.to_id)
+        if self.since is not None:
+            clauses.append('timestamp >= ?')
+            params.append(self.since)
+        if self.until is not None:
+            clauses.append('timestamp < ?')
+            params.append(self.until)
+        if self.split is not None:
+            clauses.append('split = ?')
+            params.append(self.split)
+        if self.sample is not None and self.sample < 1:
+            clauses.append(f'(id * {_SAMPLE_MULTIPLIER} + ?) % {_SAMPLE_BUCKETS} < ?')
+            params.extend([self.seed, int(self.sample * _SAMPLE_BUCKETS)])
+        return (' AND '.join(clauses) or '1'), params
+
+def sample_mask(ids: np.ndarray, fraction: float, seed: int = 0) -> np.ndarray:
+    """Which ids `RowFilter(sample=fraction, seed=seed)` selects, evaluated in NumPy.
+
+    Lets one streamed pass split rows into the sample and its complement.
+    """
+    if fraction >= 1:
+        return np.ones(len(ids), dtype=bool)
+    return (np.asarray(ids, dtype=np.int64) * _SAMPLE_MULTIPLIER + seed) % _SAMPLE_BUCKETS < int(fraction * _SAMPLE_BUCKETS)
@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Any, Optional, Union
 import time
 import threading
+from utils.sqlite_profile import connect
 
 class MemGlobalStore:
     """A persistent in-memory key-value store using SQLite as backend.
@@ -53,7 +54,7 @@ class MemGlobalStore:
         
         # Reuse or create connection
         if thread_id not in self._conn_pool:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn = connect(self.db_path, check_same_thread=False)
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS mem_global_store (
                     key TEXT PRIMARY KEY,
@@ -21,4 +21,18 @@ from commands.cd import cd
 from commands.clear import clear
 from commands.set import set_env
 from commands.get import get_env
-from commands.help import help
\ No newline at end of file
+from commands.help import help
+from commands.import_data import import_data
+from commands.export import export
+from commands.split import split
+from commands.search import search
+from commands.dedup import dedup
+from commands.cluster import cluster
+from commands.fit import fit
+from commands.quantize import quantize
+from commands.reduce import reduce
+from commands.predict import predict
+from commands.describe import describe
+from commands.verify import verify
+from commands.reembed import reembed
+from commands.bench import bench
\ No newline at end of file
@@ -13,4 +13,31 @@ OLLAMA_ENPOINT = os.getenv('OLLAMA_ENDPOINT')
 OLLAMA_MODEL = os.getenv('OLLAMA_MODEL')
 DB_PATH = os.getenv('DB_PATH')
 CONFIG_PATH = os.getenv('CONFIG_PATH')
-EMBEDDING_MODEL_PATH = os.getenv('EMBEDDING_MODEL_PATH')
\ No newline at end of file
+EMBEDDING_MODEL_PATH = os.getenv('EMBEDDING_MODEL_PATH')
+
+# MARK: Embedding
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'sentence-transformers')  # See utils.embedders.EMBEDDERS
+EMBEDDING_DIM = int(os.getenv('EMBEDDING_DIM', 384))  # Output size of model-free backends such as hashing
+EMBEDDING_OPTIMIZE = os.getenv('EMBEDDING_OPTIMIZE', 'auto')  # onnx, int8, auto (first that agrees with fp32) or off
+EMBEDDING_MIN_AGREEMENT = float(os.getenv('EMBEDDING_MIN_AGREEMENT', 0.99))  # Worst calibration cosine an optimized variant must reach
+EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(DB_PATH or '.')), 'models'))  # ONNX exports and agreement scores
+CHUNK_WINDOW = int(os.getenv('CHUNK_WINDOW', 256))  # Tokens per chunk for backends without an input limit
+
+# MARK: Storage
+INTERNAL_TABLE_PREFIX = 'emb2emb_'
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'performance')
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 256 * 1024))
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 1 << 30))
+SQLITE_STATEMENT_CACHE = int(os.getenv('SQLITE_STATEMENT_CACHE', 256))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SCRATCH_DIR = os.getenv('SCRATCH_DIR')  # Temporary vector matrices, system temp dir when unset
+SIDECAR_DIR = os.getenv('SIDECAR_DIR', os.path.join(os.path.dirname(os.path.abspath(DB_PATH or '.')), 'sidecars'))  # Fitted models per table
+
+# MARK: Tuning
+PARSE_CACHE_SIZE = int(os.getenv('PARSE_CACHE_SIZE', 1024))
+EMBED_BATCH_SIZE = int(os.getenv('EMBED_BATCH_SIZE', 64))
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1024))
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 8192))
+SCAN_BLOCK_SIZE = int(os.getenv('SCAN_BLOCK_SIZE', 4096))
+SEARCH_THREADS = int(os.getenv('SEARCH_THREADS', os.cpu_count() or 1))
+SEARCH_QUERY_BATCH = int(os.getenv('SEARCH_QUERY_BATCH', 8192))  # Queries answered per pass by search --from
@@ -0,0 +1,233 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# dataset_io.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import Any, Dict, Iterator, Optional
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+IMPORT_FORMATS = ('jsonl', 'csv')
+EXPORT_FORMATS = ('npz', 'npy', 'parquet')
+PARQUET_AVAILABLE = pq is not None
+
+class RecordReader:
+    """Streams prompt/answer records out of a JSONL or CSV file.
+
+    Lines are read in binary mode so the reader always knows the byte offset
+    of the end of the last record it yielded. That offset is what import
+    checkpoints store, and passing it back as `start` resumes without
+    re-parsing the consumed part of the file.
+
+    Attributes:
+        path (str): Source file
+        fmt (str): One of IMPORT_FORMATS
+        position (int): Byte offset just past the last yielded record
+        size (int): File size in bytes, used for progress reporting
+
+    Example:
+        >>> reader = RecordReader('data.jsonl', 'jsonl')
+        >>> next(iter(reader))
+        {'prompt': 'Hi', 'answer': 'Hello!'}
+        >>> reader.position
+        37
+    """
+
+    def __init__(self, path: str, fmt: str, start: int = 0, encoding: str = 'utf-8'):
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f'Unsupported format {fmt}, expected one of {", ".join(IMPORT_FORMATS)}')
+        self.path = path
+        self.fmt = fmt
+        self.encoding = encoding
+        self.position = start
+        self.size = os.path.getsize(path)
+
+    def signature(self) -> str:
+        """Identifies the file version a checkpoint was taken against."""
+        stat = os.stat(self.path)
+        return f'{stat.st_size}:{int(stat.st_mtime)}'
+
+    def _lines(self, handle) -> Iterator[str]:
+        for raw in handle:
+            self.position += len(raw)
+            yield raw.decode(self.encoding)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, 'rb') as handle:
+            if self.fmt == 'jsonl':
+                handle.seek(self.position)
+                for line in self._lines(handle):
+                    if line.strip():
+                        yield json.loads(line)
+                return
+
+            header_line = handle.readline()
+            header = next(csv.reader([header_line.decode(self.encoding).lstrip('\ufeff')]))
+            self.position = max(self.position, len(header_line))
+            handle.seek(self.position)
+            for row in csv.reader(self._lines(handle)):
+                if row:
+                    yield dict(zip(header, row))
+
+def parse_vector(value: Any) -> Optional[np.ndarray]:
+    """Reads a precomputed vector cell.
+
+    Accepts JSON arrays as well as space or comma separated strings, with or
+    without surrounding brackets.
+
+    Returns:
+        Optional[np.ndarray]: float32 vector, or None for empty cells
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip().strip('[]').replace(',', ' ')
+        if not value:
+            return None
+        return np.array(value.split(), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+# MARK: Export writers
+class NpyExportWriter:
+    """Writes `ids`, `veci` and `veco` into preallocated `.npy` memmaps.
+
+    Produces `<base>.ids.npy` (int64) and `<base>.veci.npy` / `<base>.veco.npy`
+    (contiguous float32, rows x dim), which `np.load(..., mmap_mode='r')`
+    opens without reading them into memory. The memmaps are written under
+    a `.partial` suffix and only renamed into place by `close`, so an
+    interrupted export never leaves files that look complete.
+    """
+
+    needs_text = False
+
+    def __init__(self, base: str, rows: int, dim: int):
+        self.paths = {name: f'{base}.{name}.npy' for name in ('ids', 'veci', 'veco')}
+        self._partial = {name: f'{path}.partial' for name, path in self.paths.items()}
+        self.arrays = {
+            'ids': np.lib.format.open_memmap(self._partial['ids'], mode='w+', dtype=np.int64, shape=(rows,)),
+            'veci': np.lib.format.open_memmap(self._partial['veci'], mode='w+', dtype=np.float32, shape=(rows, dim)),
+            'veco': np.lib.format.open_memmap(self._partial['veco'], mode='w+', dtype=np.float32, shape=(rows, dim)),
+        }
+        self.offset = 0
+
+    def write(self, chunk: Dict[str, Any]):
+        """Appends one chunk of `ids`, `veci` and `veco` arrays."""
+        end = self.offset + len(chunk['ids'])
+        for name, array in self.arrays.items():
+            array[self.offset:end] = chunk[name]
+        self.offset = end
+
+    def close(self):
+        """Moves the files into place, trimmed to the rows actually written."""
+        for name, array in self.arrays.items():
+            array.flush()
+            if self.offset < len(array):
+                # Fewer rows than counted, e.g. some were deleted during the export
+                with open(f'{self._partial[name]}.trim', 'wb') as f:
+                    np.save(f, array[:self.offset])
+                os.replace(f'{self._partial[name]}.trim', self._partial[name])
+            os.replace(self._partial[name], self.paths[name])
+        self.arrays = {}
+
+    def abort(self):
+        """Deletes everything written so far, leaving no output behind."""
+        self.arrays = {}
+        for path in self._partial.values():
+            for leftover in (path, f'{path}.trim'):
+                if os.path.exists(leftover):
+                    os.unlink(leftover)
+
+class NpzExportWriter(NpyExportWriter):
+    """Streams into temporary `.npy` memmaps, then packs them into an uncompressed `.npz`."""
+
+    def __init__(self, path: str, rows: int, dim: int):
+        self.path = path
+        self._tmpdir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(path)))
+        super().__init__(os.path.join(self._tmpdir, 'export'), rows, dim)
+
+    def close(self):
+        try:
+            super().close()
+            packed = os.path.join(self._tmpdir, 'export.npz')
+            with zipfile.ZipFile(packed, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for name, member in self.paths.items():
+                    archive.write(member, arcname=f'{name}.npy')
+            os.replace(packed, self.path)
+        finally:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def abort(self):
+        self.arrays = {}
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+class ParquetExportWriter:
+    """Writes chunks as Parquet row groups with fixed-size float32 list vector columns."""
+
+    needs_text = True
+
+    def __init__(self, path: str, rows: int, dim: int):
+        if pq is None:
+            raise ImportError('Parquet export requires pyarrow, install it with `pip install pyarrow`')
+        vector = pa.list_(pa.float32(), dim)
+        self.dim = dim
+        self.schema = pa.schema([
+            ('id', pa.int64()), ('timestamp', pa.string()),
+            ('prompt', pa.string()), ('answer', pa.string()),
+            ('veci', vector), ('veco', vector),
+        ])
+        # Renamed into place by `close`, like the npy memmaps
+        self.path, self._partial = path, f'{path}.partial'
+        self.writer = pq.ParquetWriter(self._partial, self.schema)
+
+    def write(self, chunk: Dict[str, Any]):
+        """Appends one chunk as a row group."""
+        vectors = {
+            name: pa.FixedSizeListArray.from_arrays(pa.array(chunk[name].ravel(), pa.float32()), self.dim)
+            for name in ('veci', 'veco')
+        }
+        self.writer.write_table(pa.Table.from_arrays([
+            pa.array(chunk['ids'], pa.int64()),
+            pa.array(chunk['timestamps'], pa.string()),
+            pa.array(chunk['prompts'], pa.string()),
+            pa.array(chunk['answers'], pa.string()),
+            vectors['veci'], vectors['veco'],
+        ], schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+        os.replace(self._partial, self.path)
+
+    def abort(self):
+        self.writer.close()
+        if os.path.exists(self._partial):
+            os.unlink(self._partial)
+
+def open_export_writer(fmt: str, out: str, rows: int, dim: int):
+    """Creates the writer for an export format.
+
+    Args:
+        fmt (str): One of EXPORT_FORMATS
+        out (str): Output path (for npy, the base path of the three files)
+        rows (int): Exact number of rows that will be written
+        dim (int): Vector dimension
+    """
+    if fmt == 'npy':
+        return NpyExportWriter(out[:-4] if out.endswith('.npy') else out, rows, dim)
+    if fmt == 'npz':
+        return NpzExportWriter(out, rows, dim)
+    if fmt == 'parquet':
+        return ParquetExportWriter(out, rows, dim)
+    raise ValueError(f'Unsupported format {fmt}, expected one of {", ".join(EXPORT_FORMATS)}')
@@ -5,24 +5,110 @@
 # 
 # PromptCraft, 2025. All rights reserved.
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
 from numpy import ndarray
-from typing import Optional
+from typing import List, Optional
 from utils.output import ClientConsole
-from utils.const import EMBEDDING_MODEL_PATH
+from utils.const import (
+    EMBEDDING_BACKEND, EMBEDDING_CACHE_DIR, EMBEDDING_DIM, EMBEDDING_MIN_AGREEMENT, EMBEDDING_MODEL_PATH,
+    EMBEDDING_OPTIMIZE, EMBED_BATCH_SIZE, CHUNK_WINDOW
+)
+from utils.embedders import EMBEDDERS, Embedder
 from utils.performance import PerformanceMetrics
 
-ClientConsole.log('Loading BERT model...')
+embedder: Optional[Embedder] = None
 
-model = SentenceTransformer(EMBEDDING_MODEL_PATH)
-ClientConsole.done('Embedding model loaded.')
+def get_embedder() -> Embedder:
+    """Builds the embedder selected by EMBEDDING_BACKEND on first use.
+
+    Building is cheap and importing this module is free, so storage-only code
+    paths (benchmarks, export, verify) never pay for, or need, model weights.
+    """
+    global embedder
+    if embedder is None:
+        if EMBEDDING_BACKEND not in EMBEDDERS:
+            raise ValueError(
+                f'Unknown EMBEDDING_BACKEND {EMBEDDING_BACKEND}, expected one of {", ".join(EMBEDDERS)}'
+            )
+        embedder = EMBEDDERS[EMBEDDING_BACKEND](
+            path=EMBEDDING_MODEL_PATH, dim=EMBEDDING_DIM, optimize=EMBEDDING_OPTIMIZE,
+            min_agreement=EMBEDDING_MIN_AGREEMENT, cache_dir=EMBEDDING_CACHE_DIR
+        )
+    return embedder
+
+def embedding_model_id() -> str:
+    """Identifier of the configured backend and model, recorded per table."""
+    return get_embedder().model_id
+
+def embedding_dim() -> int:
+    """Dimension of the vectors the configured backend produces."""
+    return get_embedder().dim
+
+# MARK: Long texts
+POOLING_METHODS = ('mean', 'weighted')
+
+def chunking_policy(window: Optional[int] = None, overlap: int = 0, pooling: str = 'mean') -> dict:
+    """Resolves a long-text chunking policy to record with a table.
+
+    Args:
+        window: Tokens per chunk, at most and by default the backend's input limit (CHUNK_WINDOW when unlimited)
+        overlap: Tokens shared by consecutive chunks
+        pooling: `mean` of chunk vectors, or `weighted` by each chunk's token count
+
+    Raises:
+        ValueError: If the window, overlap or pooling method is invalid, or
+            the window exceeds what the backend embeds without truncation
+
+    Returns:
+        dict: Every parameter resolved, so vectors can be reproduced exactly later
+    """
+    max_tokens = get_embedder().max_tokens
+    if window is None:
+        window = max_tokens or CHUNK_WINDOW
+    if window <= 0:
+        raise ValueError(f'Chunk window must be a positive number of tokens, got {window}')
+    if max_tokens is not None and window > max_tokens:
+        # The model would silently truncate every chunk past its limit
+        raise ValueError(f'Chunk window must be at most the model input limit of {max_tokens} tokens, got {window}')
+    if not 0 <= overlap < window:
+        raise ValueError(f'Chunk overlap must be within [0, {window}), got {overlap}')
+    if pooling not in POOLING_METHODS:
+        raise ValueError(f'Pooling expects one of {", ".join(POOLING_METHODS)}, got {pooling}')
+    return {'window': window, 'overlap': overlap, 'pooling': pooling}
+
+def _embed_chunked(strings: List[str], batch_size: int, chunking: dict) -> ndarray:
+    """Splits texts into token windows, embeds every window in one call and pools them per text.
+
+    Texts within the window are embedded whole, so they get exactly the
+    vector of the unchunked path.
+    """
+    embedder = get_embedder()
+    window, overlap = chunking['window'], chunking['overlap']
+    chunks, weights, starts = [], [], []
+    for text, spans in zip(strings, embedder.token_spans(strings)):
+        starts.append(len(chunks))
+        if len(spans) <= window:
+            chunks.append(text)
+            weights.append(max(len(spans), 1))
+            continue
+        for start in range(0, len(spans) - overlap, window - overlap):
+            end = min(start + window, len(spans))
+            chunks.append(text[spans[start, 0]:spans[end - 1, 1]])
+            weights.append(end - start)
+    if not chunks:
+        return np.zeros((0, embedder.dim), dtype=np.float32)
+    vectors = np.asarray(embedder.encode(chunks, batch_size=batch_size), dtype=np.float32)
+    weights = np.asarray(weights, dtype=np.float32) if chunking['pooling'] == 'weighted' else np.ones(len(chunks), dtype=np.float32)
+    pooled = np.add.reduceat(vectors * weights[:, None], starts, axis=0)
+    return pooled / np.add.reduceat(weights, starts)[:, None]
 
 @PerformanceMetrics.runtime_monitor
-def embed(string: str) -> ndarray:
+def embed(string: str, chunking: Optional[dict] = None) -> ndarray:
     """Generate embeddings with model verification
     
     Args:
         string: Input text to embed
+        chunking: Table chunking policy from `chunking_policy`, None embeds the text whole
 
     Returns:
         ndarray: 768-dimensional float32 embedding vector
@@ -31,7 +117,29 @@ def embed(string: str) -> ndarray:
         RuntimeError: If model initialization failed
     """
     try:
-        return model.encode(string)
+        if chunking:
+            return _embed_chunked([string], EMBED_BATCH_SIZE, chunking)[0]
+        return get_embedder().encode([string])[0]
+    except Exception as e:
+        ClientConsole.error(f"Embedding failed: {str(e)}")
+        raise
+
+@PerformanceMetrics.runtime_monitor
+def embed_batch(strings: List[str], batch_size: int = EMBED_BATCH_SIZE, chunking: Optional[dict] = None) -> ndarray:
+    """Generate embeddings for many texts in a single model call
+
+    Args:
+        strings: Input texts to embed
+        batch_size: Texts per forward pass
+        chunking: Table chunking policy from `chunking_policy`, None embeds texts whole
+
+    Returns:
+        ndarray: (len(strings), dim) float32 embedding matrix
+    """
+    try:
+        if chunking:
+            return _embed_chunked(strings, batch_size, chunking)
+        return get_embedder().encode(strings, batch_size=batch_size)
     except Exception as e:
         ClientConsole.error(f"Embedding failed: {str(e)}")
-        raise
\ No newline at end of file
+        raise
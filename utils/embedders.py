@@ -0,0 +1,294 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# embedders.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from utils.linear_map import row_cosines
+from utils.output import ClientConsole
+
+EMBEDDERS: Dict[str, Callable[..., 'Embedder']] = {}
+
+# Whitespace-delimited words, the tokens of backends without a tokenizer
+WORD = re.compile(r'\S+')
+
+def register_embedder(name: str):
+    """Registers an Embedder class under a backend name for EMBEDDING_BACKEND.
+
+    Example:
+        >>> @register_embedder('hashing')
+        ... class HashingEmbedder(Embedder):
+        ...     ...
+    """
+    def decorator(cls):
+        EMBEDDERS[name] = cls
+        return cls
+    return decorator
+
+class Embedder(ABC):
+    """Interface of an embedding backend.
+
+    Constructing an embedder is cheap; anything expensive (weights, sessions)
+    happens in `load`, which `encode` calls on first use.
+
+    Attributes:
+        model_id (str): Identifier recorded with tables embedded by this backend
+    """
+
+    model_id: str
+
+    def load(self):
+        """Prepares the backend eagerly, e.g. at REPL startup."""
+
+    @property
+    @abstractmethod
+    def dim(self) -> int:
+        """Length of the vectors `encode` returns."""
+
+    @property
+    def max_tokens(self) -> Optional[int]:
+        """Longest input in tokens embedded without truncation, None when unlimited."""
+        return None
+
+    def token_spans(self, texts: List[str]) -> List[np.ndarray]:
+        """(tokens, 2) arrays of the character start and end of each text's tokens."""
+        return [np.array([m.span() for m in WORD.finditer(text)], dtype=np.int64).reshape(-1, 2) for text in texts]
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Embeds texts into a (len(texts), dim) float32 matrix."""
+
+# Optimized variants in the order `auto` tries them
+OPTIMIZED_VARIANTS = ('onnx', 'int8')
+
+# Texts embedded by both fp32 and an optimized variant to measure their agreement;
+# short, long, code and non-English on purpose
+CALIBRATION_SENTENCES = (
+    'hi',
+    'How do I reverse a list in Python?',
+    'Use slicing with a negative step, e.g. items[::-1], or call items.reverse() to do it in place.',
+    'What is the capital of Australia?',
+    'Canberra is the capital of Australia, not Sydney as many people assume.',
+    'SELECT id, prompt FROM conversations WHERE timestamp > ? ORDER BY id DESC LIMIT 10;',
+    'Explain the difference between a process and a thread in an operating system, with examples of '
+    'when you would prefer one over the other and how they share memory, file handles and scheduling.',
+    'Quelle est la meilleure façon d\'apprendre une nouvelle langue ?',
+    '如何在没有互联网的情况下使用这个模型？',
+    'Error: ModuleNotFoundError: No module named numpy',
+    'Write a haiku about autumn rain.',
+    'The mitochondria is the powerhouse of the cell.',
+    '12 + 30 = 42',
+    'Summarize the plot of Hamlet in two sentences.',
+    'ok thanks!!',
+    'Translate "good morning" into Japanese.',
+)
+
+def load_sentence_transformer(path: str, variant: str = 'fp32', cache_dir: Optional[str] = None):
+    """Loads a SentenceTransformer model as one of its CPU inference variants.
+
+    `fp32` is the plain PyTorch model. `onnx` runs the model in ONNX Runtime;
+    the first load exports it (needs `optimum[onnxruntime]`) and saves the
+    export under `cache_dir` so later loads skip the conversion. `int8`
+    applies PyTorch dynamic quantization to every Linear layer.
+
+    Raises:
+        ImportError: If the variant's runtime is not installed
+        ValueError: If the variant is unknown
+    """
+    # Imported here so other backends never need torch
+    from sentence_transformers import SentenceTransformer
+    if variant == 'fp32':
+        return SentenceTransformer(path)
+    if variant == 'onnx':
+        import onnxruntime  # noqa: F401, fail fast before the slow export
+        exported = os.path.join(cache_dir, re.sub(r'[^\w.-]+', '_', os.path.abspath(path)).strip('_'), 'onnx') if cache_dir else None
+        if exported and os.path.isdir(exported):
+            return SentenceTransformer(exported, backend='onnx')
+        model = SentenceTransformer(path, backend='onnx')
+        if exported:
+            model.save_pretrained(exported)
+        return model
+    if variant == 'int8':
+        import torch
+        return torch.quantization.quantize_dynamic(SentenceTransformer(path), {torch.nn.Linear}, dtype=torch.qint8)
+    raise ValueError(f'Unknown embedding variant {variant}, expected fp32 or one of {", ".join(OPTIMIZED_VARIANTS)}')
+
+def agreement(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Worst row cosine between two embeddings of the same texts."""
+    return float(row_cosines(reference, candidate).min())
+
+@register_embedder('sentence-transformers')
+class SentenceTransformerEmbedder(Embedder):
+    """A SentenceTransformer model loaded from a local path.
+
+    With `optimize` set to `onnx`, `int8` or `auto` (try both in that order)
+    an optimized CPU variant is used transparently, but only if its vectors
+    of CALIBRATION_SENTENCES agree with the fp32 model to at least
+    `min_agreement` cosine; otherwise it falls back to fp32. Measured
+    agreements are cached in `cache_dir`, so the fp32 reference is loaded
+    only the first time. The model id stays the model path for every
+    variant, since agreeing vectors are interchangeable in a table.
+
+    Attributes:
+        variant (str): Variant in use once loaded, fp32 until then
+    """
+
+    def __init__(self, path: Optional[str], optimize: str = 'off', min_agreement: float = 0.99,
+                 cache_dir: Optional[str] = None, **_):
+        self.path = path
+        self.model_id = path
+        self.model = None
+        self.variant = 'fp32'
+        self.optimize = optimize
+        self.min_agreement = min_agreement
+        self.cache_dir = cache_dir
+
+    def load(self):
+        if self.model is None:
+            ClientConsole.log('Loading BERT model...')
+            reference = None
+            for variant in self._candidates():
+                score = self._cached_agreement(variant)
+                # A variant known to disagree is not loaded (or exported) again
+                if score is None or score >= self.min_agreement:
+                    try:
+                        candidate = load_sentence_transformer(self.path, variant, self.cache_dir)
+                    except Exception as e:
+                        # Missing runtimes, an old sentence-transformers or a failed export all mean fp32
+                        if self.optimize != 'auto':
+                            ClientConsole.warn(f'Cannot use the {variant} embedding variant ({e}), using fp32.')
+                        continue
+                    if score is None:
+                        if reference is None:
+                            reference = load_sentence_transformer(self.path)
+                        score = agreement(
+                            reference.encode(list(CALIBRATION_SENTENCES), convert_to_numpy=True),
+                            candidate.encode(list(CALIBRATION_SENTENCES), convert_to_numpy=True)
+                        )
+                        self._store_agreement(variant, score)
+                    if score >= self.min_agreement:
+                        self.model, self.variant = candidate, variant
+                        break
+                ClientConsole.warn(
+                    f'The {variant} embedding variant agrees with fp32 only to cosine {score:.4f} '
+                    f'(< {self.min_agreement}), not using it.'
+                )
+            if self.model is None:
+                self.model = reference if reference is not None else load_sentence_transformer(self.path)
+            ClientConsole.done(f'Embedding model loaded ({self.variant}).')
+        return self.model
+
+    @property
+    def dim(self) -> int:
+        return self.load().get_sentence_embedding_dimension()
+
+    @property
+    def max_tokens(self) -> Optional[int]:
+        length = getattr(self.load(), 'max_seq_length', None)
+        # Room for the [CLS] and [SEP] tokens added around every input
+        return length - 2 if length else None
+
+    def token_spans(self, texts: List[str]) -> List[np.ndarray]:
+        tokenizer = getattr(self.load(), 'tokenizer', None)
+        if tokenizer is None or not getattr(tokenizer, 'is_fast', False):
+            return super().token_spans(texts)
+        offsets = tokenizer(texts, add_special_tokens=False, return_offsets_mapping=True, verbose=False)['offset_mapping']
+        return [np.array(spans, dtype=np.int64).reshape(-1, 2) for spans in offsets]
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        return self.load().encode(texts, batch_size=batch_size, convert_to_numpy=True)
+
+    def _candidates(self) -> tuple:
+        if self.optimize == 'auto':
+            return OPTIMIZED_VARIANTS
+        if self.optimize in OPTIMIZED_VARIANTS:
+            return (self.optimize,)
+        if self.optimize not in ('off', 'fp32'):
+            raise ValueError(f'Unknown EMBEDDING_OPTIMIZE {self.optimize}, expected auto, off or one of {", ".join(OPTIMIZED_VARIANTS)}')
+        return ()
+
+    def _agreement_file(self) -> Optional[str]:
+        return os.path.join(self.cache_dir, 'agreement.json') if self.cache_dir else None
+
+    def _cached_agreement(self, variant: str) -> Optional[float]:
+        path = self._agreement_file()
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f).get(f'{os.path.abspath(self.path)}:{variant}')
+
+    def _store_agreement(self, variant: str, score: float):
+        path = self._agreement_file()
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        scores = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                scores = json.load(f)
+        scores[f'{os.path.abspath(self.path)}:{variant}'] = score
+        with open(path + '.tmp', 'w') as f:
+            json.dump(scores, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+@register_embedder('hashing')
+class HashingEmbedder(Embedder):
+    """Deterministic, model-free embeddings from hashed character n-grams.
+
+    Every character n-gram of the casefolded UTF-8 text is hashed to one of
+    `dim` buckets with a ±1 sign (the hashing trick) and the counts are L2
+    normalized. Texts sharing many n-grams get high cosine similarity, so
+    search and dedup behave plausibly, and the same text always maps to the
+    same vector on every platform. The n-gram hashes of a whole batch are
+    computed with vectorized uint64 arithmetic and accumulated with a single
+    `np.bincount`, so throughput is far above any neural model.
+
+    Example:
+        >>> embedder = HashingEmbedder(dim=384)
+        >>> embedder.encode(['hello world', 'hello world!']).shape
+        (2, 384)
+    """
+
+    PRIME = np.uint64(1099511628211)
+    MIX = np.uint64(0x9E3779B97F4A7C15)
+
+    def __init__(self, dim: int = 384, ngrams: tuple = (3, 4, 5), **_):
+        self._dim = dim
+        self.ngrams = ngrams
+        self.model_id = f'hashing-{dim}-{"".join(map(str, ngrams))}'
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        encoded = [f' {text.casefold()} '.encode('utf-8') for text in texts]
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+        owners = np.repeat(np.arange(len(texts), dtype=np.int64), [len(e) for e in encoded])
+        slots, signs = [], []
+        for n in self.ngrams:
+            if len(data) < n:
+                continue
+            # Polynomial hash of every n-gram in the batch at once: h = Σ data[i+k] * PRIME^(n-1-k)
+            hashes = np.zeros(len(data) - n + 1, dtype=np.uint64)
+            for k in range(n):
+                hashes = hashes * self.PRIME + data[k:len(data) - n + 1 + k]
+            # Drop n-grams straddling two texts
+            inside = owners[:len(hashes)] == owners[n - 1:]
+            hashes = (hashes[inside] + np.uint64(n)) * self.MIX
+            buckets = ((hashes >> np.uint64(33)) % np.uint64(self._dim)).astype(np.int64)
+            slots.append(owners[:len(inside)][inside] * self._dim + buckets)
+            signs.append(np.where(hashes & np.uint64(1), 1.0, -1.0))
+        if not slots:
+            return np.zeros((len(texts), self._dim), dtype=np.float32)
+        matrix = np.bincount(np.concatenate(slots), weights=np.concatenate(signs), minlength=len(texts) * self._dim)
+        matrix = matrix.reshape(len(texts), self._dim).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=matrix, where=norms > 0)
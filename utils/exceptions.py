@@ -75,6 +75,13 @@ class TableExistsError(Exception):
     """
     ...
 
+class VectorValidationError(ValueError):
+    """Exception raised when vectors on the write path are malformed
+    
+    Usage: <count> invalid vectors for table <tablename> (dim <dim>): row <index> <field> <problem>, ...
+    """
+    ...
+
 # MARK: Other Exceptions
 
 class ProgramTermination(Exception):
@@ -0,0 +1,56 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# hashing.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import hashlib
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r'\s+')
+_NON_WORD = re.compile(r'[\W_]+')
+
+def normalize_text(text: str) -> str:
+    """Canonical form for hashing: NFKC, casefolded, whitespace collapsed.
+
+    Example:
+        >>> normalize_text('  Hello\\n  WORLD ')
+        'hello world'
+    """
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFKC', text).casefold()).strip()
+
+def grouping_key(text: str) -> str:
+    """Looser canonical form that also ignores punctuation.
+
+    Prompts that differ only in casing, spacing or punctuation share a key,
+    so grouping on it keeps such near-duplicates together.
+
+    Example:
+        >>> grouping_key('What is AI?') == grouping_key('what is ai')
+        True
+    """
+    return _NON_WORD.sub(' ', normalize_text(text)).strip()
+
+def stable_unit(key: str, seed: int = 0) -> float:
+    """Maps a key to a uniform float in [0, 1), stable across runs and platforms.
+
+    Unlike the builtin `hash`, the result does not depend on PYTHONHASHSEED.
+    """
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8, salt=seed.to_bytes(8, 'little', signed=True)).digest()
+    return int.from_bytes(digest, 'little') / 2 ** 64
+
+def content_hash(prompt: str, answer: str) -> str:
+    """Identity of a (prompt, answer) pair for exact-duplicate detection.
+
+    Both texts are normalized first, so pairs that differ only in casing,
+    Unicode form or whitespace hash the same.
+
+    Example:
+        >>> content_hash('Hi  there', 'Hello') == content_hash('hi there', 'HELLO')
+        True
+    """
+    # The unit separator cannot appear in normalized text, so ('a b', 'c') != ('a', 'b c')
+    key = normalize_text(prompt) + '\x1f' + normalize_text(answer)
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
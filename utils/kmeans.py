@@ -0,0 +1,75 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# kmeans.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+from typing import Tuple
+import numpy as np
+
+def assign(vectors: np.ndarray, centroids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Nearest centroid of each row by squared Euclidean distance.
+
+    ||x - c||² = ||x||² - 2 x·c + ||c||², so the argmin only needs one matrix
+    product and the centroid norms.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (labels, squared distances)
+    """
+    scores = vectors @ centroids.T
+    scores -= 0.5 * np.einsum('ij,ij->i', centroids, centroids)
+    labels = np.argmax(scores, axis=1)
+    distances = np.einsum('ij,ij->i', vectors, vectors) - 2 * scores[np.arange(len(vectors)), labels]
+    return labels, np.maximum(distances, 0)
+
+def kmeans_plus_plus(sample: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """Seeds k centroids from a sample with k-means++ (D² weighting)."""
+    if len(sample) < k:
+        raise ValueError(f'Need at least {k} rows to seed {k} clusters, got {len(sample)}')
+    centroids = np.empty((k, sample.shape[1]), dtype=np.float32)
+    centroids[0] = sample[rng.integers(len(sample))]
+    closest = np.einsum('ij,ij->i', sample - centroids[0], sample - centroids[0])
+    for i in range(1, k):
+        total = closest.sum()
+        pick = rng.choice(len(sample), p=closest / total) if total > 0 else rng.integers(len(sample))
+        centroids[i] = sample[pick]
+        delta = sample - centroids[i]
+        closest = np.minimum(closest, np.einsum('ij,ij->i', delta, delta))
+    return centroids
+
+class MiniBatchKMeans:
+    """Mini-batch k-means (Sculley, 2010) that learns from streamed chunks.
+
+    Each centroid moves towards the mean of its batch members with a
+    per-centroid learning rate of 1 / (points seen), so the model converges
+    without ever holding more than one batch in memory.
+
+    Example:
+        >>> model = MiniBatchKMeans(kmeans_plus_plus(sample, 8, rng))
+        >>> for ids, vectors in blocks:
+        ...     model.partial_fit(vectors)
+        >>> labels, _ = assign(vectors, model.centroids)
+    """
+
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = np.array(centroids, dtype=np.float32)
+        self.counts = np.zeros(len(self.centroids), dtype=np.int64)
+
+    def partial_fit(self, batch: np.ndarray) -> float:
+        """Updates centroids from one batch.
+
+        Returns:
+            float: Sum of squared distances of the batch to its centroids before the update
+        """
+        labels, distances = assign(batch, self.centroids)
+        members = np.bincount(labels, minlength=len(self.centroids))
+        sums = np.zeros_like(self.centroids)
+        np.add.at(sums, labels, batch)
+        touched = members > 0
+        self.counts += members
+        # Moving each centroid by rate * (batch mean - centroid) with rate = members / counts
+        rate = (members[touched] / self.counts[touched])[:, None].astype(np.float32)
+        means = sums[touched] / members[touched][:, None]
+        self.centroids[touched] += rate * (means - self.centroids[touched])
+        return float(distances.sum())
@@ -0,0 +1,121 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# linear_map.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+from typing import Tuple
+import numpy as np
+
+def row_cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Cosine similarity of matching rows of two matrices."""
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    return np.divide(np.einsum('ij,ij->i', a, b), norms, out=np.zeros(len(a)), where=norms > 0)
+
+class RidgeAccumulator:
+    """Streamed sufficient statistics for a ridge regression Y ≈ X W + b.
+
+    Only XᵀX, XᵀY and the column sums are kept, so memory is O(dim²)
+    whatever the number of rows, and one `solve` gives the closed form.
+
+    Example:
+        >>> acc = RidgeAccumulator(384, 384)
+        >>> for x, y in chunks:
+        ...     acc.add(x, y)
+        >>> weights, bias = acc.solve(ridge=1.0)
+    """
+
+    def __init__(self, in_dim: int, out_dim: int):
+        self.rows = 0
+        self.xtx = np.zeros((in_dim, in_dim), dtype=np.float64)
+        self.xty = np.zeros((in_dim, out_dim), dtype=np.float64)
+        self.x_sum = np.zeros(in_dim, dtype=np.float64)
+        self.y_sum = np.zeros(out_dim, dtype=np.float64)
+
+    def add(self, x: np.ndarray, y: np.ndarray):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.rows += len(x)
+        self.xtx += x.T @ x
+        self.xty += x.T @ y
+        self.x_sum += x.sum(axis=0)
+        self.y_sum += y.sum(axis=0)
+
+    def solve(self, ridge: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Minimizes ||Y - XW - b||² + ridge ||W||² with an unpenalized bias.
+
+        Centering is applied to the accumulated moments rather than the data:
+        XcᵀXc = XᵀX - n x̄x̄ᵀ and XcᵀYc = XᵀY - n x̄ȳᵀ.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: float32 (weights of shape (in_dim, out_dim), bias)
+        """
+        if self.rows == 0:
+            raise ValueError('No rows accumulated')
+        x_mean = self.x_sum / self.rows
+        y_mean = self.y_sum / self.rows
+        xtx = self.xtx - self.rows * np.outer(x_mean, x_mean)
+        xty = self.xty - self.rows * np.outer(x_mean, y_mean)
+        xtx[np.diag_indices_from(xtx)] += ridge
+        weights = np.linalg.solve(xtx, xty)
+        bias = y_mean - x_mean @ weights
+        return weights.astype(np.float32), bias.astype(np.float32)
+
+class CovarianceAccumulator:
+    """Streamed mean and covariance of row vectors, for PCA over a whole table.
+
+    Like RidgeAccumulator only XᵀX and the column sums are kept, so one pass
+    in chunks fits the principal axes with O(dim²) memory.
+
+    Example:
+        >>> acc = CovarianceAccumulator(384)
+        >>> for x in chunks:
+        ...     acc.add(x)
+        >>> mean, components, variances = acc.pca()
+    """
+
+    def __init__(self, dim: int):
+        self.rows = 0
+        self.xtx = np.zeros((dim, dim), dtype=np.float64)
+        self.x_sum = np.zeros(dim, dtype=np.float64)
+
+    def add(self, x: np.ndarray):
+        x = np.asarray(x, dtype=np.float64)
+        self.rows += len(x)
+        self.xtx += x.T @ x
+        self.x_sum += x.sum(axis=0)
+
+    def pca(self, centered: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Principal axes from the eigendecomposition of the sample covariance.
+
+        With `centered=False` the axes are those of the second moment XᵀX/n
+        instead, the ones that best keep dot products of vectors projected
+        without subtracting the mean (see `project`); the variances are then
+        the mean squared coordinate along each axis.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: float32 (mean, components
+                as rows, variance along each component), by decreasing variance
+        """
+        if self.rows < 2:
+            raise ValueError('Need at least 2 rows for a covariance')
+        mean = self.x_sum / self.rows
+        if centered:
+            covariance = (self.xtx - self.rows * np.outer(mean, mean)) / (self.rows - 1)
+        else:
+            covariance = self.xtx / self.rows
+        variances, vectors = np.linalg.eigh(covariance)
+        order = np.argsort(variances)[::-1]
+        return mean.astype(np.float32), vectors[:, order].T.astype(np.float32), np.maximum(variances[order], 0).astype(np.float32)
+
+def project(vectors: np.ndarray, components: np.ndarray) -> np.ndarray:
+    """Coordinates of vectors along PCA components, (rows, len(components)) float32.
+
+    The mean is not subtracted: components are orthonormal, so dot products
+    of projected vectors approximate those of the originals, and equal them
+    with every component kept. Centred coordinates would not. Fit the
+    components with `pca(centered=False)` for the best approximation at a
+    truncated dimension.
+    """
+    return (np.asarray(vectors, dtype=np.float32) @ components.T).astype(np.float32)
@@ -7,6 +7,7 @@
 
 from functools import wraps
 from contextlib import contextmanager
+from rich import box
 from rich.console import Console
 from rich.table import Table
 from datetime import datetime
@@ -153,7 +154,7 @@ class ClientConsole:
         
         tbl = Table(
             title=title,
-            box=box_style,
+            box=getattr(box, box_style.upper(), box.ROUNDED),
             header_style=header_style,
             row_styles=row_styles or [],
             expand=expand,
@@ -184,6 +185,28 @@ class ClientConsole:
                 ClientConsole.error(f"Operation failed: {str(e)}")
                 raise
     
+    @staticmethod
+    def progress(done: int, total: int, rate: float, unit: str = 'rows', width: int = 30) -> str:
+        """Format a one-line progress bar for `loading` status updates.
+
+        Args:
+            done (int): Units processed so far
+            total (int): Expected units, progress is shown as unknown when 0
+            rate (float): Throughput in `unit` per second
+            unit (str): Label for the throughput figure
+            width (int): Bar width in characters
+
+        Examples:
+            >>> with ClientConsole.loading(message='Importing...') as status:
+            ...     status.update(ClientConsole.progress(512, 2048, 830.4))
+        """
+        fraction = min(done / total, 1.0) if total else 0.0
+        filled = int(fraction * width)
+        return (
+            f'[#00AAAA]{"━" * filled}[/#00AAAA][grey30]{"━" * (width - filled)}[/grey30] '
+            f'{fraction * 100:5.1f}% [bold]{rate:,.0f}[/bold] {unit}/s'
+        )
+
     @staticmethod
     def help(cmd: str):
         """Display command help documentation
@@ -0,0 +1,117 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# pq.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+from typing import Dict, Tuple
+import numpy as np
+from utils.const import SCAN_BLOCK_SIZE, SEARCH_THREADS
+from utils.kmeans import assign, kmeans_plus_plus
+from utils.vectors import top_k_scan
+
+# Centroids per subspace, so every code fits one byte
+CODEBOOK_SIZE = 256
+
+class ProductQuantizer:
+    """Product quantization codec (Jégou et al., 2011) for unit vectors.
+
+    A vector is cut into `m` equal subvectors and each is replaced by the
+    index of its nearest centroid in that subspace's codebook, so a vector
+    costs `m` bytes instead of 4 * dim. Inner products with a query are
+    approximated by asymmetric distance computation (ADC): the query stays
+    exact, its products with every centroid are tabulated once per query,
+    and each stored vector's score is the sum of `m` table lookups.
+
+    Example:
+        >>> quantizer = ProductQuantizer.train(sample, m=32, rng=np.random.default_rng(0))
+        >>> codes = quantizer.encode(vectors)
+        >>> positions, scores = quantizer.search(codes, queries, k=10)
+    """
+
+    def __init__(self, codebooks: np.ndarray):
+        self.codebooks = np.ascontiguousarray(codebooks, dtype=np.float32)
+
+    @property
+    def m(self) -> int:
+        """Number of subspaces, also the bytes per encoded vector."""
+        return self.codebooks.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.codebooks.shape[0] * self.codebooks.shape[2]
+
+    @classmethod
+    def train(cls, sample: np.ndarray, m: int, iterations: int = 10,
+              rng: np.random.Generator = None) -> 'ProductQuantizer':
+        """Fits one k-means codebook per subspace on a sample of vectors.
+
+        Codebooks are seeded with k-means++ and refined by `iterations`
+        Lloyd steps; centroids left without members keep their position.
+
+        Raises:
+            ValueError: If `m` does not divide the dimension or the sample is empty
+        """
+        sample = np.asarray(sample, dtype=np.float32)
+        if m < 1 or sample.shape[1] % m:
+            raise ValueError(f'm must divide the vector dimension {sample.shape[1]}, got {m}')
+        if len(sample) == 0:
+            raise ValueError('Cannot train a product quantizer on an empty sample')
+        rng = rng or np.random.default_rng()
+        size = min(CODEBOOK_SIZE, len(sample))
+        codebooks = []
+        for part in np.split(sample, m, axis=1):
+            part = np.ascontiguousarray(part)
+            centroids = kmeans_plus_plus(part, size, rng)
+            for _ in range(iterations):
+                labels, _ = assign(part, centroids)
+                members = np.bincount(labels, minlength=size)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, part)
+                filled = members > 0
+                centroids[filled] = sums[filled] / members[filled, None]
+            codebooks.append(centroids)
+        return cls(np.stack(codebooks))
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """(rows, m) uint8 codes of the nearest centroid per subspace."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for j, part in enumerate(np.split(vectors, self.m, axis=1)):
+            codes[:, j], _ = assign(np.ascontiguousarray(part), self.codebooks[j])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstructs (rows, dim) vectors from their codes."""
+        return np.concatenate([self.codebooks[j][codes[:, j]] for j in range(self.m)], axis=1)
+
+    def tables(self, queries: np.ndarray) -> np.ndarray:
+        """(m, queries, codebook size) products of each query subvector with every centroid."""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        return np.stack([
+            part @ self.codebooks[j].T for j, part in enumerate(np.split(queries, self.m, axis=1))
+        ])
+
+    def search(self, codes: np.ndarray, queries: np.ndarray, k: int, block_size: int = SCAN_BLOCK_SIZE,
+               workers: int = SEARCH_THREADS) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k rows by ADC inner product, blocked like `blocked_top_k`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (row positions, approximate scores),
+                both (queries, min(k, rows)), best first
+        """
+        tables = self.tables(queries)
+
+        def score(block: slice, tile: slice) -> np.ndarray:
+            block_codes = np.asarray(codes[block])
+            scores = tables[0, tile][:, block_codes[:, 0]]
+            for j in range(1, self.m):
+                scores += tables[j, tile][:, block_codes[:, j]]
+            return scores
+
+        return top_k_scan(score, len(codes), tables.shape[1], k, block_size, workers)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays for `save_sidecar`; `ProductQuantizer(**arrays)` restores the codec."""
+        return {'codebooks': self.codebooks}
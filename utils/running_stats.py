@@ -0,0 +1,57 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# running_stats.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+from typing import Tuple
+import numpy as np
+
+# (count, mean, sum of squared deviations from the mean)
+Moments = Tuple[int, float, float]
+
+EMPTY_MOMENTS: Moments = (0, 0.0, 0.0)
+
+def moments(values) -> Moments:
+    """Count, mean and M2 of a batch of values."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return EMPTY_MOMENTS
+    mean = float(values.mean())
+    return values.size, mean, float(((values - mean) ** 2).sum())
+
+def merge_moments(total: Moments, part: Moments) -> Moments:
+    """Combines two disjoint batches (Chan et al. parallel Welford update).
+
+    Example:
+        >>> merge_moments(moments([1, 2]), moments([3, 4])) == moments([1, 2, 3, 4])
+        True
+    """
+    n_a, mean_a, m2_a = total
+    n_b, mean_b, m2_b = part
+    n = n_a + n_b
+    if n_b == 0:
+        return total
+    if n_a == 0:
+        return part
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+def remove_moments(total: Moments, part: Moments) -> Moments:
+    """Inverse of `merge_moments`: takes a batch that was merged in back out."""
+    n_a, mean_a, m2_a = total
+    n_b, mean_b, m2_b = part
+    n = n_a - n_b
+    if n_b == 0:
+        return total
+    if n <= 0:
+        return EMPTY_MOMENTS
+    mean = (n_a * mean_a - n_b * mean_b) / n
+    delta = mean_b - mean
+    # Floating point cancellation can push M2 slightly negative
+    return n, mean, max(0.0, m2_a - m2_b - delta * delta * n * n_b / n_a)
+
+def variance(m: Moments) -> float:
+    """Population variance, 0 for fewer than two values."""
+    return m[2] / m[0] if m[0] > 1 else 0.0
@@ -0,0 +1,156 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# search.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from utils.vectors import blocked_top_k, unit_rows
+
+FUSION_METHODS = ('rrf', 'weighted')
+RRF_K = 60
+
+Ranking = List[Tuple[int, float]]
+
+class StageTimer:
+    """Collects wall-clock milliseconds per named pipeline stage.
+
+    Example:
+        >>> timer = StageTimer()
+        >>> with timer.stage('vector'):
+        ...     scan()
+        >>> timer.timings
+        {'vector': 12.5}
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+def reciprocal_rank_fusion(rankings: Sequence[Ranking], weights: Optional[Sequence[float]] = None,
+                           k: int = RRF_K) -> Ranking:
+    """Fuses best-first rankings with (weighted) reciprocal rank fusion.
+
+    Each list contributes weight / (k + rank) for every id it contains, so
+    fusion only depends on positions, not on how scores are scaled.
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, (row_id, _) in enumerate(ranking, start=1):
+            fused[row_id] = fused.get(row_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: -item[1])
+
+def weighted_fusion(rankings: Sequence[Ranking], weights: Sequence[float]) -> Ranking:
+    """Fuses rankings by a weighted sum of min-max normalized scores.
+
+    Scores must be higher-is-better. An id missing from a list contributes 0
+    for that list.
+    """
+    fused: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        if not ranking:
+            continue
+        scores = np.array([score for _, score in ranking], dtype=np.float64)
+        span = scores.max() - scores.min()
+        normalized = (scores - scores.min()) / span if span > 0 else np.ones_like(scores)
+        for (row_id, _), score in zip(ranking, normalized):
+            fused[row_id] = fused.get(row_id, 0.0) + weight * float(score)
+    return sorted(fused.items(), key=lambda item: -item[1])
+
+def vector_search(db, table: str, query_vector: np.ndarray, field: str = 'veci', k: int = 10) -> Ranking:
+    """Exact cosine top-k over one stored vector column."""
+    return vector_search_many(db, table, np.asarray(query_vector).reshape(1, -1), field, k)[0]
+
+def vector_search_many(db, table: str, query_vectors: np.ndarray, field: str = 'veci', k: int = 10) -> List[Ranking]:
+    """Exact cosine top-k of many queries in one pass over the cached vector matrix.
+
+    Over PCA coordinates the queries are expected projected from unit rows
+    and are scored as given, approximating the cosine in the full space.
+    """
+    ids, matrix = db.vector_matrix(table, field)
+    queries = np.asarray(query_vectors, dtype=np.float32) if db.is_reduced(field) else unit_rows(query_vectors)
+    positions, scores = blocked_top_k(matrix, queries, k)
+    return [
+        [(int(ids[p]), float(s)) for p, s in zip(row_positions, row_scores)]
+        for row_positions, row_scores in zip(positions, scores)
+    ]
+
+def pq_search_many(db, table: str, query_vectors: np.ndarray, field: str = 'veci', k: int = 10,
+                   rerank: int = 0) -> List[Ranking]:
+    """Approximate cosine top-k of many queries from a column's product-quantized codes.
+
+    With `rerank`, each query's best `max(rerank, k)` ADC candidates are
+    rescored exactly against their stored float vectors, fetched by id in
+    one lookup for all queries, and the best `k` are kept.
+
+    Raises:
+        ValueError: If `quantize` has not trained a codec for the column
+    """
+    index = db.pq_index(table, field)
+    if index is None:
+        raise ValueError(f'Table {table} has no product quantization codec for {field}')
+    quantizer, ids, codes = index
+    queries = unit_rows(np.asarray(query_vectors).reshape(-1, quantizer.dim))
+    positions, scores = quantizer.search(codes, queries, max(rerank, k))
+    candidates = ids[positions]
+    if rerank and candidates.size:
+        unique = np.unique(candidates)
+        vectors = unit_rows(db.vectors_by_id(table, unique.tolist(), field))
+        scores = np.stack([vectors[np.searchsorted(unique, row)] @ query for row, query in zip(candidates, queries)])
+        order = np.lexsort((candidates, -scores), axis=1)[:, :k]
+        candidates, scores = np.take_along_axis(candidates, order, axis=1), np.take_along_axis(scores, order, axis=1)
+    return [
+        [(int(row_id), float(s)) for row_id, s in zip(row_ids[:k], row_scores[:k])]
+        for row_ids, row_scores in zip(candidates, scores)
+    ]
+
+def lexical_search(db, table: str, query: str, k: int = 10) -> Ranking:
+    """FTS top-k as higher-is-better (id, -bm25) pairs."""
+    return [(row_id, -score) for row_id, score in db.text_rank(table, query, k)]
+
+def hybrid_search(db, table: str, query: str, query_vector: np.ndarray, field: str = 'veci',
+                  k: int = 10, pool: int = 100, fusion: str = 'rrf', alpha: float = 0.5,
+                  timer: Optional[StageTimer] = None) -> Ranking:
+    """Lexical + vector retrieval fused into one ranking.
+
+    Both stages retrieve `pool` candidates; fusion keeps the best `k`.
+
+    Args:
+        db (DatabaseManager): Database to search
+        table (str): Conversation table
+        query (str): Text query for the FTS stage
+        query_vector (np.ndarray): Embedded query for the vector stage
+        field (str): Vector column, veci or veco
+        k (int): Results to return
+        pool (int): Candidates per stage
+        fusion (str): 'rrf' or 'weighted'
+        alpha (float): Weight of the vector stage, the lexical stage gets 1 - alpha
+        timer (Optional[StageTimer]): Receives 'lexical', 'vector' and 'fuse' timings
+    """
+    if fusion not in FUSION_METHODS:
+        raise ValueError(f'Unknown fusion {fusion}, expected one of {", ".join(FUSION_METHODS)}')
+    timer = timer or StageTimer()
+    pool = max(pool, k)
+    with timer.stage('lexical'):
+        lexical = lexical_search(db, table, query, pool)
+    with timer.stage('vector'):
+        semantic = vector_search(db, table, query_vector, field, pool)
+    with timer.stage('fuse'):
+        weights = [1 - alpha, alpha]
+        if fusion == 'rrf':
+            fused = reciprocal_rank_fusion([lexical, semantic], weights)
+        else:
+            fused = weighted_fusion([lexical, semantic], weights)
+    return fused[:k]
@@ -0,0 +1,91 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# sidecar.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import os
+import tempfile
+from typing import Callable, Dict, Optional, TypeVar
+import numpy as np
+from utils.const import SIDECAR_DIR
+
+T = TypeVar('T')
+
+def sidecar_path(table: str, kind: str) -> str:
+    """Location of a table's fitted model file, e.g. `<SIDECAR_DIR>/main.centroids.npz`."""
+    return os.path.join(SIDECAR_DIR, f'{table}.{kind}.npz')
+
+def save_sidecar(table: str, kind: str, **arrays) -> str:
+    """Atomically writes arrays (and scalars) to a table's sidecar file.
+
+    The file is written next to its destination and renamed into place, so
+    readers never see a half-written model.
+
+    Returns:
+        str: Path of the sidecar
+    """
+    path = sidecar_path(table, kind)
+    os.makedirs(SIDECAR_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=SIDECAR_DIR, suffix='.npz.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+def load_sidecar(table: str, kind: str) -> Optional[Dict[str, np.ndarray]]:
+    """Reads a table's sidecar into memory, None if it was never saved."""
+    path = sidecar_path(table, kind)
+    if not os.path.isfile(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+def remove_sidecar(table: str, kind: str) -> bool:
+    """Deletes a table's sidecar, returns whether one existed."""
+    try:
+        os.unlink(sidecar_path(table, kind))
+    except FileNotFoundError:
+        return False
+    return True
+
+def matrix_path(table: str, kind: str) -> str:
+    """Location of a table's memory-mappable matrix, e.g. `<SIDECAR_DIR>/main.veci_cache.npy`."""
+    return os.path.join(SIDECAR_DIR, f'{table}.{kind}.npy')
+
+def write_matrix(table: str, kind: str, fill: Callable[[str], T]) -> T:
+    """Builds a matrix sidecar with `fill(path)` at a temporary path and renames it into place.
+
+    Returns:
+        Whatever `fill` returns
+    """
+    os.makedirs(SIDECAR_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=SIDECAR_DIR, suffix='.npy')
+    os.close(fd)
+    try:
+        result = fill(tmp)
+        os.replace(tmp, matrix_path(table, kind))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return result
+
+def remove_matrix(table: str, kind: str) -> bool:
+    """Deletes a table's matrix sidecar, returns whether one existed."""
+    try:
+        os.unlink(matrix_path(table, kind))
+    except FileNotFoundError:
+        return False
+    return True
+
+def load_matrix(table: str, kind: str) -> Optional[np.ndarray]:
+    """Memory-maps a matrix sidecar read-only, None if it was never written."""
+    path = matrix_path(table, kind)
+    if not os.path.isfile(path):
+        return None
+    return np.load(path, mmap_mode='r')
@@ -1,10 +1,15 @@
 # Created by Sean L. on Mar 16
-# 
+#
 # emb2emb client
 # systemcalls.py
-# 
+#
 # PromptCraft, 2025. All rights reserved.
 
+import shutil
+import signal
+import sys
+import threading
+
 def clear():
     try:
         from colorama import init
@@ -14,9 +19,49 @@ def clear():
         import os
         os.system('cls||clear')
 
-def width():
-    import os
-    import subprocess
+class TerminalSize:
+    """Cached terminal geometry shared with the Rich console.
+
+    The size is measured once with `shutil.get_terminal_size` and pinned on
+    the Rich console, which then acts as the single source of truth. On POSIX
+    terminals a SIGWINCH handler re-measures on resize; piped or scripted runs
+    never install the handler and keep the first measurement.
+
+    Example:
+        >>> TerminalSize.columns()
+        120
+    """
+
+    _installed = False
+
+    @classmethod
+    def columns(cls) -> int:
+        """Current terminal width in characters (no syscall after the first call)."""
+        from utils.output import console
+        if not cls._installed:
+            cls.install()
+        return console.width
+
+    @classmethod
+    def refresh(cls, *_) -> None:
+        """Re-measures the terminal and pins the result on the Rich console.
+
+        Signature is compatible with `signal.signal` handlers.
+        """
+        from utils.output import console
+        console.size = shutil.get_terminal_size()
+
+    @classmethod
+    def install(cls) -> None:
+        """Takes the initial measurement and subscribes to SIGWINCH when possible."""
+        cls.refresh()
+        cls._installed = True
+        if (
+            hasattr(signal, 'SIGWINCH')
+            and sys.stdout.isatty()
+            and threading.current_thread() is threading.main_thread()
+        ):
+            signal.signal(signal.SIGWINCH, cls.refresh)
 
-    result = subprocess.run(['tput', 'cols'], stdout=subprocess.PIPE)
-    return int(result.stdout.decode().strip())
\ No newline at end of file
+def width() -> int:
+    return TerminalSize.columns()
@@ -0,0 +1,236 @@
+# Created by Sean L. on Oct 19
+#
+# emb2emb client
+# vectors.py
+#
+# PromptCraft, 2025. All rights reserved.
+
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+import numpy as np
+from utils.const import SCAN_BLOCK_SIZE, SEARCH_THREADS
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+# Largest (queries x rows) score tile a worker holds at once, in float32 elements
+SCORE_TILE = 1 << 22
+
+def unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalizes each row; all-zero rows stay zero.
+
+    Example:
+        >>> unit_rows(np.array([[3., 4.], [0., 0.]]))
+        array([[0.6, 0.8],
+               [0. , 0. ]])
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+def vector_problems(vectors: Sequence, dim: int) -> List[Tuple[int, str]]:
+    """Rows that are not finite float vectors of length `dim`, with the reason.
+
+    Shapes are checked per row, finiteness with one `np.isfinite` over all
+    well-shaped rows.
+
+    Example:
+        >>> vector_problems([[1, 2], [1, 2, 3], [np.nan, 0]], 2)
+        [(1, 'dim 3, expected 2'), (2, 'non-finite values')]
+    """
+    problems = []
+    shaped, positions = [], []
+    for index, vector in enumerate(vectors):
+        try:
+            array = np.asarray(vector, dtype=np.float32)
+        except (TypeError, ValueError):
+            problems.append((index, 'not numeric'))
+            continue
+        if array.ndim != 1 or array.size != dim:
+            problems.append((index, f'dim {array.size if array.ndim == 1 else array.shape}, expected {dim}'))
+            continue
+        shaped.append(array)
+        positions.append(index)
+    if shaped:
+        finite = np.isfinite(np.stack(shaped)).all(axis=1)
+        problems.extend((positions[i], 'non-finite values') for i in np.flatnonzero(~finite))
+    return sorted(problems)
+
+def text_vector_problems(texts: Sequence[str], dim: int) -> List[Tuple[int, str]]:
+    """Like `vector_problems` for the TEXT storage format, also catching unparsable values."""
+    problems = []
+    parsed, positions = [], []
+    for index, text in enumerate(texts):
+        if not isinstance(text, str):
+            problems.append((index, f'stored as {type(text).__name__}'))
+            continue
+        # Vectors are stored single-space separated, counting spaces avoids a split per row
+        tokens = text.count(' ') + 1 if text else 0
+        if tokens != dim:
+            problems.append((index, f'dim {tokens}, expected {dim}'))
+            continue
+        parsed.append(text)
+        positions.append(index)
+    if not parsed:
+        return sorted(problems)
+    with warnings.catch_warnings():
+        # fromstring warns (and stops) at the first token that is not a number
+        warnings.simplefilter('ignore', DeprecationWarning)
+        flat = np.fromstring(' '.join(parsed), sep=' ', dtype=np.float32)
+        if flat.size == len(parsed) * dim:
+            finite = np.isfinite(flat.reshape(len(parsed), dim)).all(axis=1)
+            problems.extend((positions[i], 'non-finite values') for i in np.flatnonzero(~finite))
+        else:
+            # Some token is not a number; find which rows row by row
+            for position, text in zip(positions, parsed):
+                row = np.fromstring(text, sep=' ', dtype=np.float32)
+                if row.size != dim:
+                    problems.append((position, 'unparsable values'))
+                elif not np.isfinite(row).all():
+                    problems.append((position, 'non-finite values'))
+    return sorted(problems)
+
+def blocked_top_k(matrix: np.ndarray, queries: np.ndarray, k: int, block_size: int = SCAN_BLOCK_SIZE,
+                  workers: int = SEARCH_THREADS) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact top-k rows of `matrix` by dot product, for every query at once.
+
+    The matrix (typically a read-only memmap) is cut into `block_size` row
+    blocks that are scored on a thread pool, since NumPy releases the GIL
+    inside matmul. Each worker scores a tile of queries against one block as
+    a single matrix-matrix product and folds it into its own running top-k
+    with `argpartition`. The per-worker candidates are merged at the end.
+    Peak memory is one SCORE_TILE per worker plus k candidates per query,
+    whatever the number of rows. BLAS is pinned to one thread meanwhile, so
+    the workers do not oversubscribe the cores.
+
+    Args:
+        matrix (np.ndarray): (rows, dim) vectors, unit rows for cosine scores
+        queries (np.ndarray): (queries, dim) or (dim,) query vectors
+        k (int): Results per query
+        block_size (int): Rows scored per block
+        workers (int): Threads
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (row positions, scores), both
+            (queries, min(k, rows)), best first with ties by position
+
+    Example:
+        >>> blocked_top_k(np.eye(3, dtype=np.float32), np.array([[0, 1, 0.5]]), 2)
+        (array([[1, 2]]), array([[1. , 0.5]], dtype=float32))
+    """
+    queries = np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, matrix.shape[1])
+    return top_k_scan(
+        lambda block, tile: queries[tile] @ np.asarray(matrix[block], dtype=np.float32).T,
+        len(matrix), len(queries), k, block_size, workers
+    )
+
+def top_k_scan(score: Callable[[slice, slice], np.ndarray], rows: int, queries: int, k: int,
+               block_size: int = SCAN_BLOCK_SIZE, workers: int = SEARCH_THREADS) -> Tuple[np.ndarray, np.ndarray]:
+    """The blocked, multi-threaded top-k of `blocked_top_k` for any block scorer.
+
+    Args:
+        score (Callable[[slice, slice], np.ndarray]): Maps a slice of rows and
+            a slice of queries to their (queries, rows) scores, higher is better
+        rows (int): Rows to scan
+        queries (int): Number of queries
+        k (int): Results per query
+        block_size (int): Rows scored per block
+        workers (int): Threads
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (row positions, scores), both
+            (queries, min(k, rows)), best first with ties by position
+    """
+    k = min(k, rows)
+    if k == 0 or queries == 0:
+        return np.empty((queries, 0), dtype=np.int64), np.empty((queries, 0), dtype=np.float32)
+    starts = range(0, rows, block_size)
+    workers = max(1, min(workers, len(starts)))
+    query_tile = max(1, SCORE_TILE // block_size)
+
+    def scan(worker: int) -> Tuple[np.ndarray, np.ndarray]:
+        best_scores = np.full((queries, k), -np.inf, dtype=np.float32)
+        best_index = np.full((queries, k), -1, dtype=np.int64)
+        for start in starts[worker::workers]:
+            block = slice(start, min(start + block_size, rows))
+            positions = np.arange(block.start, block.stop, dtype=np.int64)
+            for q in range(0, queries, query_tile):
+                tile = slice(q, q + query_tile)
+                scores = np.concatenate([best_scores[tile], score(block, tile)], axis=1)
+                index = np.concatenate([best_index[tile], np.broadcast_to(positions, (len(scores), len(positions)))], axis=1)
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                best_scores[tile] = np.take_along_axis(scores, keep, axis=1)
+                best_index[tile] = np.take_along_axis(index, keep, axis=1)
+        return best_scores, best_index
+
+    limits = threadpool_limits(limits=1, user_api='blas') if workers > 1 and threadpool_limits else nullcontext()
+    with limits:
+        if workers == 1:
+            partials = [scan(0)]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(scan, range(workers)))
+    scores = np.concatenate([part[0] for part in partials], axis=1)
+    index = np.concatenate([part[1] for part in partials], axis=1)
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores, index = np.take_along_axis(scores, keep, axis=1), np.take_along_axis(index, keep, axis=1)
+    order = np.lexsort((index, -scores), axis=1)
+    return np.take_along_axis(index, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+def materialize(blocks: Iterable[Tuple[np.ndarray, np.ndarray]], path: str, rows: int, dim: int,
+                normalize: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Writes streamed (ids, vectors) blocks into a float32 `.npy` memmap.
+
+    One pass over the source turns TEXT-encoded vectors into a contiguous
+    matrix that later passes can scan block by block from the page cache.
+
+    Args:
+        blocks: (ids, vectors) blocks, e.g. DatabaseManager.iter_vectors
+        path (str): Destination `.npy` file
+        rows (int): Upper bound on the number of rows
+        dim (int): Vector dimension
+        normalize (bool): Store unit-length rows
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (ids, matrix memmap), trimmed to the rows written
+    """
+    matrix = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(rows, dim))
+    ids = np.empty(rows, dtype=np.int64)
+    offset = 0
+    for block_ids, vectors in blocks:
+        end = offset + len(block_ids)
+        matrix[offset:end] = unit_rows(vectors) if normalize else vectors
+        ids[offset:end] = block_ids
+        offset = end
+    matrix.flush()
+    return ids[:offset], matrix[:offset]
+
+def similar_pairs(matrix: np.ndarray, threshold: float, block_size: int = 4096) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Finds all row pairs i < j with dot(matrix[i], matrix[j]) >= threshold.
+
+    The upper triangle of the Gram matrix is computed one block x block tile
+    at a time, so peak memory is one `block_size` x `block_size` score tile
+    regardless of the number of rows. For unit rows the dot product is the
+    cosine similarity.
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (row indices i, row indices j, scores)
+            for every tile, possibly empty, so callers can report progress
+    """
+    rows = len(matrix)
+    for start_i in range(0, rows, block_size):
+        left = np.asarray(matrix[start_i:start_i + block_size])
+        for start_j in range(start_i, rows, block_size):
+            right = left if start_j == start_i else np.asarray(matrix[start_j:start_j + block_size])
+            scores = left @ right.T
+            i, j = np.nonzero(scores >= threshold)
+            if start_j == start_i:
+                # Keep the strict upper triangle: no self pairs, no mirrored pairs
+                upper = i < j
+                i, j = i[upper], j[upper]
+            yield i + start_i, j + start_j, scores[i, j]